@@ -0,0 +1,11 @@
+# benchmarks/__init__.py - NEW FILE
+# Microbenchmarks for hot-path primitives (tracking, zones, drawing, serialization, encoding)
+#
+#   python -m benchmarks                         - run everything and print per-call timings
+#   python -m benchmarks -k tracker              - only cases whose name contains 'tracker'
+#   python -m benchmarks --save-baseline         - store results in benchmarks/baselines/<name>.json
+#   python -m benchmarks --compare               - fail (exit 1) on cases slower than the baseline
+
+from benchmarks.harness import BenchmarkCase, benchmark, registered_cases, run_cases
+
+__all__ = ['BenchmarkCase', 'benchmark', 'registered_cases', 'run_cases']
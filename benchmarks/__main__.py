@@ -0,0 +1,70 @@
+# benchmarks/__main__.py - NEW FILE
+# Command line: python -m benchmarks [-k PATTERN] [--save-baseline] [--compare] [--baseline NAME]
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import registered_cases, run_cases, save_baseline, load_baseline, compare
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Hot-path microbenchmarks')
+    parser.add_argument('-k', '--filter', default=None, help='Only cases whose name contains this (or a group name)')
+    parser.add_argument('--list', action='store_true', help='List cases and exit')
+    parser.add_argument('--baseline', default='default', help='Baseline name in benchmarks/baselines/ or a .json path')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='Compare with the baseline; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown before a case regresses')
+    parser.add_argument('--min-time', type=float, default=0.05, help='Minimum seconds per sample')
+    parser.add_argument('--samples', type=int, default=7, help='Samples per case')
+    parser.add_argument('--output', default=None, help='Also write the results document to this file')
+    args = parser.parse_args()
+
+    cases = registered_cases(args.filter)
+    if args.list:
+        for case in cases:
+            print(f"{case.group:<14} {case.full_name}")
+        return 0
+
+    def progress(name, result):
+        if 'error' in result:
+            print(f"  {name:<48} ERROR {result['error']}")
+        else:
+            print(f"  {name:<48} {result['median_us']:12.1f} us  (min {result['min_us']:.1f}, "
+                  f"{result['calls_per_sample']} calls/sample)")
+
+    print(f"Running {len(cases)} benchmark cases")
+    document = run_cases(cases, args.min_time, args.samples, progress)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    exit_code = 0
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline '{args.baseline}' - run with --save-baseline first")
+            return 2
+        print(f"\nCompared with baseline '{args.baseline}' ({baseline.get('created_at', '?')}):")
+        for row in compare(document, baseline, args.threshold):
+            if row['change'] is None:
+                print(f"  {row['case']:<48} {row['status']}")
+                continue
+            marker = {'regressed': '!!', 'improved': '++'}.get(row['status'], '  ')
+            print(f"{marker}{row['case']:<48} {row['baseline_us']:12.1f} -> {row['median_us']:12.1f} us "
+                  f"({row['change']:+.1%})")
+            if row['status'] == 'regressed':
+                exit_code = 1
+
+    if args.save_baseline:
+        print(f"\nBaseline written to {save_baseline(document, args.baseline)}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+# benchmarks/bench_drawing.py - NEW FILE
+# Annotation primitives at the resolutions cameras deliver
+
+from benchmarks.harness import benchmark
+from benchmarks.common import RESOLUTIONS, random_frame, zone_polygon
+
+SIZES = [{'resolution': f"{width}x{height}"} for width, height in RESOLUTIONS]
+
+
+def _frame(resolution):
+    width, height = (int(value) for value in resolution.split('x'))
+    return random_frame(width, height)
+
+
+@benchmark('draw_zone', params=SIZES)
+def draw_zone(resolution):
+    """Full-frame overlay copy + blend, so cost scales with resolution"""
+    from utils import _draw_zone
+    frame = _frame(resolution)
+    points = [tuple(point) for point in zone_polygon(8)]
+    return lambda: _draw_zone(frame, points, (0, 255, 0), 'Zone A')
+
+
+@benchmark('draw_text_with_background', params=SIZES)
+def draw_text_with_background(resolution):
+    from utils import draw_text_with_background
+    frame = _frame(resolution)
+    return lambda: draw_text_with_background(frame, 'People: 12 | Zone A', (20, 40))
@@ -0,0 +1,25 @@
+# benchmarks/bench_encoding.py - NEW FILE
+# JPEG encoding of event frames at the resolutions cameras deliver
+
+from benchmarks.harness import benchmark
+from benchmarks.common import RESOLUTIONS, random_frame
+
+CASES = [{'resolution': f"{width}x{height}", 'quality': quality}
+         for width, height in RESOLUTIONS for quality in (75, 90)]
+
+
+@benchmark('encode_jpeg', params=CASES)
+def encode_jpeg(resolution, quality):
+    from core.frame_preprocessor import encode_jpeg
+    width, height = (int(value) for value in resolution.split('x'))
+    frame = random_frame(width, height)
+    return lambda: encode_jpeg(frame, 0, quality)
+
+
+@benchmark('encode_jpeg_downscaled', params=[{'resolution': '1920x1080', 'max_width': 640}])
+def encode_jpeg_downscaled(resolution, max_width):
+    """Encode with the preview downscale applied first (EVENT_FRAME_MAX_WIDTH)"""
+    from core.frame_preprocessor import encode_jpeg
+    width, height = (int(value) for value in resolution.split('x'))
+    frame = random_frame(width, height)
+    return lambda: encode_jpeg(frame, max_width, 90)
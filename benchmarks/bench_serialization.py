@@ -0,0 +1,35 @@
+# benchmarks/bench_serialization.py - NEW FILE
+# Event payload conversion (_make_json_serializable) before DB writes
+
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+
+
+def _event(people: int):
+    """Shape of a typical event detection payload"""
+    rng = np.random.default_rng(0)
+    return {
+        'timestamp': datetime(2024, 1, 1, 12, 0, 0),
+        'camera_id': 'cam_001',
+        'event_type': 'people_counting',
+        'count': np.int64(people),
+        'detections': [{
+            'track_id': np.int32(index),
+            'bbox': rng.uniform(0, 1280, 4).astype(np.float32),
+            'confidence': np.float32(0.87),
+            'center': (np.float64(640.0), np.float64(360.0)),
+            'zone': 'Zone A'
+        } for index in range(people)],
+        'zone_counts': {'Zone A': np.int64(people), 'Zone B': np.int64(0)}
+    }
+
+
+@benchmark('make_json_serializable', params=[{'people': 1}, {'people': 20}, {'people': 100}])
+def make_json_serializable(people):
+    from core.flexible_multi_camera_processor import FlexibleMultiCameraProcessor
+    processor = object.__new__(FlexibleMultiCameraProcessor)  # the method needs no state
+    event = _event(people)
+    return lambda: processor._make_json_serializable(event)
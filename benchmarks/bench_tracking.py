@@ -0,0 +1,45 @@
+# benchmarks/bench_tracking.py - NEW FILE
+# Track association and DatacenterTracker.update at several crowd sizes
+
+import numpy as np
+
+from benchmarks.harness import benchmark
+from benchmarks.common import CROWD_SIZES, crowd_sequence
+
+CROWDS = [{'crowd': crowd} for crowd in CROWD_SIZES]
+
+
+@benchmark('associate_detections_to_tracks', params=CROWDS)
+def associate(crowd):
+    from camera_models.kalman_track import associate_detections_to_tracks
+    sequence = crowd_sequence(crowd, frames=2)
+    detections = sequence[1]
+    tracks = sequence[0][:, :4]
+    return lambda: associate_detections_to_tracks(detections, tracks, 0.3)
+
+
+@benchmark('tracker_update', params=CROWDS)
+def tracker_update(crowd):
+    """Steady state: a warm tracker fed a looping walk (tracks are matched, not recreated)"""
+    from camera_models.kalman_track import DatacenterTracker
+    sequence = crowd_sequence(crowd)
+    tracker = DatacenterTracker(max_age=30, min_hits=3, iou_threshold=0.3)
+    for detections in sequence:
+        tracker.update(detections)
+    state = {'index': 0}
+
+    def step():
+        index = state['index'] = (state['index'] + 1) % len(sequence)
+        if index == 0:
+            tracker.trackers = []  # the walk restarts; drop tracks rather than let them pile up
+        return tracker.update(sequence[index])
+    return step
+
+
+@benchmark('tracker_update_empty')
+def tracker_update_empty():
+    """Frames with nobody in view (the common case for most cameras)"""
+    from camera_models.kalman_track import DatacenterTracker
+    tracker = DatacenterTracker()
+    empty = np.empty((0, 5))
+    return lambda: tracker.update(empty)
@@ -0,0 +1,33 @@
+# benchmarks/bench_zones.py - NEW FILE
+# Point-in-zone tests and bbox/zone overlap
+
+from benchmarks.harness import benchmark
+from benchmarks.common import ModelStub, zone_polygon
+
+VERTICES = [{'vertices': 4}, {'vertices': 16}]
+
+
+@benchmark('is_in_zone', params=VERTICES)
+def is_in_zone(vertices):
+    from camera_models.camera_model_base import DatacenterCameraModelBase
+    zone = {'coordinates': zone_polygon(vertices)}
+    model = ModelStub()
+    return lambda: (DatacenterCameraModelBase.is_in_zone(model, (640, 360), zone),
+                    DatacenterCameraModelBase.is_in_zone(model, (20, 20), zone))
+
+
+@benchmark('is_point_in_polygon', params=VERTICES)
+def is_point_in_polygon(vertices):
+    from utils import is_point_in_polygon
+    polygon = zone_polygon(vertices)
+    return lambda: (is_point_in_polygon((640, 360), polygon), is_point_in_polygon((20, 20), polygon))
+
+
+@benchmark('calculate_zone_overlap', params=[{'box_height': 120}, {'box_height': 400}])
+def calculate_zone_overlap(box_height):
+    """Cost grows with the bbox area (masks are bbox-sized)"""
+    from camera_models.camera_model_base import DatacenterCameraModelBase
+    zone = {'coordinates': zone_polygon(8)}
+    model = ModelStub()
+    bbox = (500, 300, 500 + box_height // 2, 300 + box_height)
+    return lambda: DatacenterCameraModelBase.calculate_zone_overlap(model, bbox, zone)
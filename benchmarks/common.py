@@ -0,0 +1,48 @@
+# benchmarks/common.py - NEW FILE
+# Deterministic inputs shared by the benchmark cases
+
+import logging
+from typing import List
+
+import numpy as np
+
+CROWD_SIZES = (1, 5, 20, 50)
+RESOLUTIONS = ((640, 360), (1280, 720), (1920, 1080))
+
+
+def random_frame(width: int = 1280, height: int = 720, seed: int = 0) -> np.ndarray:
+    """Noisy BGR frame (JPEG cost depends on content, so not a flat image)"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 20, (height, width, 3)).astype(np.float32)
+    return np.clip(gradient + noise, 0, 255).astype(np.uint8)
+
+
+def crowd_sequence(crowd: int, frames: int = 64, seed: int = 0) -> List[np.ndarray]:
+    """
+    Detections of `crowd` people walking across a 1280x720 frame, one array per frame,
+    in the tracker's [x_center, y_center, aspect_ratio, height, confidence] format
+    """
+    rng = np.random.default_rng(seed)
+    start = rng.uniform((50, 100), (1230, 620), (crowd, 2))
+    velocity = rng.uniform(-6, 6, (crowd, 2))
+    heights = rng.uniform(120, 260, crowd)
+    sequence = []
+    for index in range(frames):
+        centers = start + velocity * index + rng.normal(0, 1.5, (crowd, 2))
+        detections = np.column_stack([centers, np.full(crowd, 0.45), heights, rng.uniform(0.5, 0.95, crowd)])
+        sequence.append(detections)
+    return sequence
+
+
+def zone_polygon(vertices: int = 8, center=(640, 360), radius: float = 250.0) -> List[List[int]]:
+    """Convex-ish polygon like a configured camera zone"""
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    return [[int(center[0] + radius * np.cos(a)), int(center[1] + radius * 0.7 * np.sin(a))] for a in angles]
+
+
+class ModelStub:
+    """Stands in for a camera model when calling its helpers unbound (they only touch self.logger)"""
+
+    def __init__(self):
+        self.logger = logging.getLogger('benchmarks')
@@ -0,0 +1,155 @@
+# benchmarks/harness.py - NEW FILE
+# Case registry, timing loop, baselines and regression comparison
+
+import os
+import json
+import time
+import platform
+import statistics
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Iterable
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+_CASES = []
+
+
+class BenchmarkCase:
+    """
+    One named measurement. setup(**params) builds the inputs once and returns a
+    zero-argument callable; the callable is what gets timed.
+    """
+
+    def __init__(self, name: str, setup: Callable[..., Callable[[], Any]], params: Optional[Dict[str, Any]] = None,
+                 group: str = ''):
+        self.name = name
+        self.setup = setup
+        self.params = params or {}
+        self.group = group
+
+    @property
+    def full_name(self) -> str:
+        if not self.params:
+            return self.name
+        return self.name + '[' + ','.join(f"{key}={value}" for key, value in self.params.items()) + ']'
+
+    def run(self, min_sample_time: float = 0.05, samples: int = 7) -> Dict[str, Any]:
+        """Per-call times (microseconds) over `samples` samples of at least min_sample_time each"""
+        func = self.setup(**self.params)
+        func()  # warmup (caches, lazy imports)
+
+        # Calibrate the number of calls per sample
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_sample_time or number >= 1 << 20:
+                break
+            number *= 2 if elapsed <= 0 else max(2, min(10, int(min_sample_time / elapsed) + 1))
+
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / number * 1e6)
+
+        return {
+            'median_us': statistics.median(timings),
+            'min_us': min(timings),
+            'mean_us': statistics.fmean(timings),
+            'stdev_us': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            'calls_per_sample': number,
+            'samples': samples
+        }
+
+
+def benchmark(name: str, params: Iterable[Dict[str, Any]] = ({},), group: str = ''):
+    """Register setup functions: @benchmark('tracker_update', params=[{'crowd': 5}, {'crowd': 50}])"""
+    def register(setup):
+        for case_params in params:
+            _CASES.append(BenchmarkCase(name, setup, dict(case_params), group or setup.__module__.split('.')[-1]))
+        return setup
+    return register
+
+
+def registered_cases(pattern: Optional[str] = None) -> List[BenchmarkCase]:
+    """All registered cases (importing the case modules first), optionally filtered by substring"""
+    from benchmarks import bench_tracking, bench_zones, bench_drawing, bench_serialization, bench_encoding  # noqa: F401
+    return [case for case in _CASES if not pattern or pattern in case.full_name or pattern == case.group]
+
+
+def run_cases(cases: List[BenchmarkCase], min_sample_time: float = 0.05, samples: int = 7,
+              progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Run cases and return a results document (the format baselines are stored in)"""
+    results = {}
+    for case in cases:
+        try:
+            result = case.run(min_sample_time, samples)
+        except Exception as e:
+            result = {'error': str(e)}
+        results[case.full_name] = result
+        if progress is not None:
+            progress(case.full_name, result)
+
+    import numpy
+    import cv2
+    return {
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': numpy.__version__,
+            'opencv': cv2.__version__
+        },
+        'results': results
+    }
+
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(document: Dict[str, Any], name: str = 'default') -> str:
+    """Write results as a baseline, merging into an existing one (other cases are kept)"""
+    path = baseline_path(name)
+    existing = load_baseline(name) or {'results': {}}
+    existing['results'].update({case: result for case, result in document['results'].items()
+                                if 'error' not in result})
+    existing['created_at'] = document['created_at']
+    existing['environment'] = document['environment']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(existing, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(name: str = 'default') -> Optional[Dict[str, Any]]:
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(document: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Median per-call time vs baseline for every case present in both.
+    A case regresses when it is more than `threshold` (fraction) slower.
+    """
+    rows = []
+    for case, result in document['results'].items():
+        before = baseline.get('results', {}).get(case)
+        if 'error' in result or not before or 'median_us' not in before:
+            rows.append({'case': case, 'status': 'error' if 'error' in result else 'new',
+                         'median_us': result.get('median_us'), 'baseline_us': None, 'change': None})
+            continue
+        change = result['median_us'] / before['median_us'] - 1.0 if before['median_us'] else 0.0
+        status = 'regressed' if change > threshold else 'improved' if change < -threshold else 'same'
+        rows.append({'case': case, 'status': status, 'median_us': result['median_us'],
+                     'baseline_us': before['median_us'], 'change': change})
+    return rows
@@ -9,6 +9,8 @@ import time
 import threading
 from datetime import datetime
 
+from core.metrics import RollingRates
+
 # Import with fallback for single camera setup
 try:
     from camera_models.kalman_track import Sort
@@ -16,11 +18,17 @@ except ImportError:
     from kalman_track import Sort
 
 try:
-    from logger import setup_datacenter_logger
+    from camera_models.frame_detections import FrameDetections
+except ImportError:
+    from frame_detections import FrameDetections
+
+try:
+    from logger import get_camera_model_logger
 except ImportError:
     import logging
-    def setup_datacenter_logger(name, filename):
-        return logging.getLogger(name)
+    def get_camera_model_logger(camera_id, use_case=None, datacenter_id=None):
+        return logging.LoggerAdapter(logging.getLogger('camera_models'),
+                                     {'camera_id': camera_id, 'use_case': use_case})
 
 try:
     from config import Config
@@ -47,9 +55,9 @@ class DatacenterCameraModelBase:
         """
         Initialize the datacenter camera model base class
         """
-        # Initialize logger
+        # Initialize logger (shared sink; camera and use case are record fields)
         try:
-            self.logger = setup_datacenter_logger(f'camera_model_{camera_id}', f'camera_model_{camera_id}.log')
+            self.logger = get_camera_model_logger(camera_id, (settings or {}).get('use_case') or self.__class__.__name__)
         except:
             import logging
             logging.basicConfig(level=logging.INFO)
@@ -88,6 +96,11 @@ class DatacenterCameraModelBase:
         # Tracking state
         self.tracked_objects = {}
         self.total_object_count = 0
+        self.last_frame_predicted = False  # True when the last frame had tracker-predicted boxes only
+        
+        # Optional FrameBufferPool for annotation copies (provided by the multi-camera processor)
+        self.frame_pool = self.settings.get('frame_pool')
+        self._frame_leases = []
         
         # Performance statistics
         self.stats = {
@@ -97,6 +110,8 @@ class DatacenterCameraModelBase:
             'start_time': time.time(),
             'last_processed_time': None
         }
+        self.rates = RollingRates()  # windowed fps instead of frames / uptime
+        self.frame_timestamp = None  # epoch seconds of the frame being processed (media time on replays)
         
         # Event recording settings
         self.auto_recording_enabled = getattr(Config, 'AUTO_RECORDING_ENABLED', True)
@@ -139,12 +154,21 @@ class DatacenterCameraModelBase:
         # Update statistics
         self.stats['frames_processed'] += 1
         self.stats['last_processed_time'] = timestamp
+        self.frame_timestamp = timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp
+        self.rates.record()
         
         # Perform custom processing in subclasses
         annotated_frame, detections = self._process_frame_impl(frame, timestamp, detection_result)
         
         return annotated_frame, detections
     
+    def event_time(self):
+        """
+        Epoch time of the current frame for dwell/interval rules - the media
+        timestamp when replaying recordings, otherwise (close to) now
+        """
+        return self.frame_timestamp if self.frame_timestamp is not None else time.time()
+    
     def _process_frame_impl(self, frame, timestamp, detection_result):
         """
         Implement frame processing in subclasses.
@@ -153,6 +177,40 @@ class DatacenterCameraModelBase:
         # Default implementation - should be overridden
         return frame, []
     
+    def copy_frame(self, frame):
+        """
+        Writable copy of a frame for annotation. Uses a pooled buffer when a frame
+        pool is configured; the caller returns it with release_frame_buffers().
+        """
+        if self.frame_pool is None:
+            return frame.copy()
+        lease = self.frame_pool.copy(frame)
+        self._frame_leases.append(lease)
+        return lease.array
+    
+    def release_frame_buffers(self):
+        """Return annotation buffers leased since the last call"""
+        leases, self._frame_leases = self._frame_leases, []
+        for lease in leases:
+            lease.release()
+    
+    def extract_people(self, detection_result, min_confidence=None):
+        """
+        Get person detections from the shared detection result.
+        Accepts ultralytics Results or FrameDetections; each dict carries a
+        'predicted' flag so rules can tell tracker predictions from detections.
+        The threshold defaults to the use case's 'confidence_threshold' rule.
+        """
+        if min_confidence is None:
+            min_confidence = self.rules.get('confidence_threshold', 0.3)
+        try:
+            detections = FrameDetections.coerce(detection_result)
+            self.last_frame_predicted = detections.predicted
+            return detections.to_people(min_confidence)
+        except Exception as e:
+            self.logger.error(f"Error parsing detection result: {e}")
+            return []
+    
     def update_tracker(self, detection_array):
         """Update object tracker with new detections"""
         try:
@@ -268,7 +326,7 @@ class DatacenterCameraModelBase:
         """Get statistics for this camera model"""
         uptime = time.time() - self.stats.get('start_time', time.time())
         frames_processed = self.stats.get('frames_processed', 0)
-        fps = frames_processed / max(1, uptime)
+        rates = self.rates.summary()
         
         stats = {
             'camera_id': self.camera_id,
@@ -279,7 +337,8 @@ class DatacenterCameraModelBase:
             'tracked_objects': len(self.tracked_objects),
             'total_object_count': self.total_object_count,
             'uptime_seconds': uptime,
-            'fps': fps,
+            'fps': rates['10s']['processed_fps'],
+            'rates': rates,
             'last_processed': self.stats.get('last_processed_time')
         }
         
@@ -0,0 +1,112 @@
+# camera_models/frame_detections.py - NEW FILE
+# Framework-neutral detections for one frame, shared by all camera models
+
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+
+class FrameDetections:
+    """
+    Detections for one frame as plain NumPy arrays.
+
+    xyxy: (N, 4) float boxes, conf: (N,) scores, cls: (N,) class ids,
+    names: {class_id: class_name}. predicted is True when the boxes come from
+    tracker prediction instead of a detector pass on this frame.
+    """
+
+    def __init__(self, xyxy=None, conf=None, cls=None, names: Optional[Dict[int, str]] = None,
+                 predicted: bool = False, track_ids=None):
+        self.xyxy = np.asarray(xyxy if xyxy is not None else np.empty((0, 4)), dtype=np.float32).reshape(-1, 4)
+        count = len(self.xyxy)
+        self.conf = np.asarray(conf if conf is not None else np.ones(count), dtype=np.float32).reshape(-1)
+        self.cls = np.asarray(cls if cls is not None else np.zeros(count), dtype=np.int32).reshape(-1)
+        self.names = dict(names or {0: 'person'})
+        self.predicted = predicted
+        self.track_ids = None if track_ids is None else np.asarray(track_ids, dtype=np.int64).reshape(-1)
+
+    def __len__(self) -> int:
+        return len(self.xyxy)
+
+    def __bool__(self) -> bool:
+        # An empty frame is still a valid result (models check "if detection_result")
+        return True
+
+    @classmethod
+    def empty(cls, names: Optional[Dict[int, str]] = None, predicted: bool = False) -> 'FrameDetections':
+        return cls(names=names, predicted=predicted)
+
+    @classmethod
+    def from_ultralytics(cls, results) -> 'FrameDetections':
+        """Convert ultralytics Results (or a list of them, first image only)"""
+        if isinstance(results, (list, tuple)):
+            if not results:
+                return cls.empty()
+            results = results[0]
+
+        names = dict(getattr(results, 'names', None) or {})
+        boxes = getattr(results, 'boxes', None)
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(names)
+
+        def to_numpy(value):
+            return value.cpu().numpy() if hasattr(value, 'cpu') else np.asarray(value)
+
+        return cls(to_numpy(boxes.xyxy), to_numpy(boxes.conf), to_numpy(boxes.cls).astype(np.int32), names)
+
+    @classmethod
+    def coerce(cls, detection_result) -> 'FrameDetections':
+        """Accept FrameDetections, ultralytics Results, a list of Results or None"""
+        if isinstance(detection_result, FrameDetections):
+            return detection_result
+        if detection_result is None:
+            return cls.empty()
+        return cls.from_ultralytics(detection_result)
+
+    @classmethod
+    def concatenate(cls, parts: List['FrameDetections'], names: Optional[Dict[int, str]] = None) -> 'FrameDetections':
+        """Join detections of several crops of one frame"""
+        if not parts:
+            return cls.empty(names)
+        return cls(np.concatenate([part.xyxy for part in parts]), np.concatenate([part.conf for part in parts]),
+                   np.concatenate([part.cls for part in parts]), names or parts[0].names,
+                   any(part.predicted for part in parts))
+
+    def offset(self, dx: float, dy: float) -> 'FrameDetections':
+        """Shift boxes, e.g. from crop to frame coordinates"""
+        return FrameDetections(self.xyxy + np.array([dx, dy, dx, dy], dtype=np.float32), self.conf, self.cls,
+                               self.names, self.predicted, self.track_ids)
+
+    def unletterbox(self, scale: float, pad_x: float, pad_y: float, shape=None) -> 'FrameDetections':
+        """Map boxes from a letterboxed detector input back to the original frame"""
+        xyxy = (self.xyxy - np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)) / scale
+        if shape is not None:
+            xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+            xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+        return FrameDetections(xyxy, self.conf, self.cls, self.names, self.predicted, self.track_ids)
+
+    def class_ids(self, class_name: str) -> List[int]:
+        return [class_id for class_id, name in self.names.items() if name == class_name]
+
+    def filter(self, class_name: Optional[str] = None, min_confidence: float = 0.0) -> 'FrameDetections':
+        """Subset by class name and/or confidence"""
+        mask = self.conf > min_confidence
+        if class_name is not None:
+            mask &= np.isin(self.cls, self.class_ids(class_name))
+        return FrameDetections(self.xyxy[mask], self.conf[mask], self.cls[mask], self.names, self.predicted,
+                               None if self.track_ids is None else self.track_ids[mask])
+
+    def to_people(self, min_confidence: float = 0.3) -> List[Dict[str, Any]]:
+        """Person boxes as the dicts used by the camera models"""
+        people = self.filter('person', min_confidence)
+        detections = []
+        for i, (x1, y1, x2, y2) in enumerate(people.xyxy.tolist()):
+            detection = {
+                'bbox': [x1, y1, x2, y2],
+                'center': ((x1 + x2) / 2, (y1 + y2) / 2),
+                'confidence': float(people.conf[i]),
+                'predicted': self.predicted
+            }
+            if people.track_ids is not None:
+                detection['predicted_track_id'] = int(people.track_ids[i])
+            detections.append(detection)
+        return detections
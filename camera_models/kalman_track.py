@@ -71,6 +71,9 @@ class DatacenterKalmanFilter:
         if self.debug:
             print(f"KalmanFilter.__init__() received measurement with shape: {measurement.shape}")
         
+        # Last detection confidence (reported with predicted boxes)
+        self.confidence = float(measurement[4]) if len(measurement) > 4 else 1.0
+        
         # Ensure measurement has correct format [x, y, aspect_ratio, height]
         if len(measurement) > 4:
             if self.debug:
@@ -271,6 +274,22 @@ class DatacenterKalmanFilter:
             # Return default state
             return np.array([0, 0, 1, 100])
     
+    def get_uncertainty(self) -> float:
+        """
+        Position uncertainty relative to object size
+        
+        Returns:
+            Standard deviation of the center position divided by box height
+        """
+        position_std = np.sqrt(max(self.covariance[0, 0] + self.covariance[1, 1], 0.0))
+        return float(position_std / max(self.mean[3], 1.0))
+    
+    def get_speed(self) -> float:
+        """
+        Center speed relative to object size (box heights per frame)
+        """
+        return float(np.hypot(self.mean[4], self.mean[5]) / max(self.mean[3], 1.0))
+    
     def get_tracking_info(self) -> Dict[str, Any]:
         """
         Get comprehensive tracking information for datacenter monitoring
@@ -494,6 +513,8 @@ class DatacenterTracker:
             try:
                 detection = detections[det_idx][:4]  # Only use position/size
                 self.trackers[trk_idx].update(detection)
+                if len(detections[det_idx]) > 4:
+                    self.trackers[trk_idx].confidence = float(detections[det_idx][4])
             except Exception as e:
                 if self.debug:
                     print(f"Error updating tracker {trk_idx}: {str(e)}")
@@ -557,6 +578,43 @@ class DatacenterTracker:
         
         return tracked_objects, len(self.confirmed_track_ids)
     
+    def predict_tracks(self) -> List[Dict[str, Any]]:
+        """
+        Advance every track one frame without a detection (detector skipped this frame)
+        
+        Returns:
+            Confirmed tracks with predicted state, class, confidence and uncertainty
+        """
+        predicted = []
+        tracks_to_remove = []
+        
+        for i, tracker in enumerate(self.trackers):
+            try:
+                state = tracker.predict()
+                if np.any(np.isnan(state)) or tracker.time_since_update > self.max_age:
+                    tracks_to_remove.append(i)
+                    self.confirmed_track_ids.discard(tracker.id)
+                    continue
+                
+                if tracker.id in self.confirmed_track_ids:
+                    predicted.append({
+                        'track_id': tracker.id,
+                        'state': state,
+                        'object_class': tracker.object_class,
+                        'confidence': tracker.confidence,
+                        'uncertainty': tracker.get_uncertainty(),
+                        'speed': tracker.get_speed()
+                    })
+            except Exception as e:
+                if self.debug:
+                    print(f"Error predicting track {i}: {str(e)}")
+                tracks_to_remove.append(i)
+        
+        for i in reversed(tracks_to_remove):
+            self.trackers.pop(i)
+        
+        return predicted
+    
     def get_track_info(self, track_id: int) -> Optional[Dict[str, Any]]:
         """
         Get detailed information about a specific track
@@ -130,41 +130,17 @@ class PeopleCountingMonitor(CameraModelBase):
         people_detections = []
         tracking_data = []
 
-        if detection_result:
-            try:
-                # Normalize detection_result → boxes
-                if hasattr(detection_result, "boxes"):
-                    boxes = detection_result.boxes
-                elif isinstance(detection_result, list) and len(detection_result) > 0 and hasattr(detection_result[0], "boxes"):
-                    boxes = detection_result[0].boxes
-                else:
-                    boxes = []
+        for person in self.extract_people(detection_result):
+            x1, y1, x2, y2 = person['bbox']
+            center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
+            height = y2 - y1
+            aspect_ratio = (x2 - x1) / height if height > 0 else 1.0
 
-                for box in boxes:
-                    class_id = int(box.cls[0]) if box.cls.numel() > 0 else -1
-                    class_name = detection_result.names[class_id] if hasattr(detection_result, "names") and class_id in detection_result.names else "unknown"
+            person['center'] = (center_x, center_y)
+            people_detections.append(person)
+            tracking_data.append([center_x, center_y, aspect_ratio, int(height), person['confidence']])
 
-                    if class_name == 'person':
-                        confidence = float(box.conf[0]) if box.conf.numel() > 0 else 0
-                        
-                        # LOWERED THRESHOLD FOR TESTING
-                        if confidence > 0.3:  # Was 0.5, now 0.3
-                            x1, y1, x2, y2 = map(float, box.xyxy[0])
-                            center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
-                            height = y2 - y1
-                            aspect_ratio = (x2 - x1) / height if height > 0 else 1.0
-
-                            person_detection = {
-                                'bbox': [x1, y1, x2, y2],
-                                'center': (center_x, center_y),
-                                'confidence': confidence
-                            }
-                            people_detections.append(person_detection)
-                            tracking_data.append([center_x, center_y, aspect_ratio, int(height), confidence])
-            except Exception as e:
-                self.logger.error(f"Error parsing detection result: {e}", exc_info=True)
-
-        annotated_frame = frame.copy()
+        annotated_frame = self.copy_frame(frame)
         annotated_frame = self._draw_zones(annotated_frame)
 
         tracked_objects = self.update_tracker(np.array(tracking_data) if tracking_data else np.empty((0, 5)))
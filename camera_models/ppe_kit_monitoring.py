@@ -78,30 +78,12 @@ class PPEDetector(CameraModelBase):
         # Extract people from shared YOLO detection
         people_detections = []
         
-        if detection_result:
-            try:
-                for result in detection_result:
-                    if hasattr(result, 'boxes') and result.boxes is not None:
-                        for box in result.boxes:
-                            class_id = int(box.cls[0]) if box.cls.numel() > 0 else -1
-                            confidence = float(box.conf[0]) if box.conf.numel() > 0 else 0
-                            class_name = result.names.get(class_id, f"class_{class_id}")
-                            
-                            if class_name == 'person' and confidence > 0.3:
-                                x1, y1, x2, y2 = map(float, box.xyxy[0])
-                                
-                                person_detection = {
-                                    'bbox': [x1, y1, x2, y2],
-                                    'confidence': confidence,
-                                    'track_id': f"ppe_{len(people_detections) + 1}"  # Simple ID
-                                }
-                                people_detections.append(person_detection)
-                                
-            except Exception as e:
-                self.logger.error(f"Error parsing detection result: {e}")
+        for person in self.extract_people(detection_result):
+            person['track_id'] = f"ppe_{len(people_detections) + 1}"
+            people_detections.append(person)
 
         # Create annotated frame
-        annotated_frame = frame.copy()
+        annotated_frame = self.copy_frame(frame)
         
         people_count = len(people_detections)
         self.current_people_count = people_count
@@ -2,7 +2,6 @@
 
 import cv2
 import numpy as np
-import time
 from collections import deque
 from utils import _draw_zone
 
@@ -115,36 +114,15 @@ class TailgatingZoneMonitor(CameraModelBase):
         FIXED: Guaranteed tailgating detection when 2+ people present
         """
         people_detections = []
-        current_time = time.time()
+        current_time = self.event_time()
         
         # Extract people from shared detection
-        if detection_result:
-            try:
-                for result in detection_result:
-                    if hasattr(result, 'boxes') and result.boxes is not None:
-                        for box in result.boxes:
-                            class_id = int(box.cls[0]) if box.cls.numel() > 0 else -1
-                            confidence = float(box.conf[0]) if box.conf.numel() > 0 else 0
-                            class_name = result.names.get(class_id, f"class_{class_id}")
-                            
-                            if class_name == 'person' and confidence > 0.3:
-                                x1, y1, x2, y2 = map(float, box.xyxy[0])
-                                center_x = (x1 + x2) / 2
-                                center_y = (y1 + y2) / 2
-                                
-                                person_detection = {
-                                    'bbox': [x1, y1, x2, y2],
-                                    'center': (center_x, center_y),
-                                    'confidence': confidence,
-                                    'track_id': f"person_{len(people_detections) + 1}"
-                                }
-                                people_detections.append(person_detection)
-                                
-            except Exception as e:
-                self.logger.error(f"Error parsing detection result: {e}")
+        for person in self.extract_people(detection_result):
+            person['track_id'] = f"person_{len(people_detections) + 1}"
+            people_detections.append(person)
 
         # Create annotated frame with zones
-        annotated_frame = frame.copy()
+        annotated_frame = self.copy_frame(frame)
         annotated_frame = self._draw_zones(annotated_frame)
 
         people_count = len(people_detections)
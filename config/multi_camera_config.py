@@ -15,7 +15,93 @@ class MultiCameraConfig(Config):
     # Processing settings per camera
     FRAMES_PER_CAMERA_PER_SECOND = int(os.getenv('FRAMES_PER_CAMERA_PER_SECOND', '5'))
     MAX_PROCESSING_THREADS = int(os.getenv('MAX_PROCESSING_THREADS', '10'))
-    EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+    
+    # Run a camera's enabled use-case models concurrently on a shared thread pool
+    PARALLEL_USE_CASE_MODELS = os.getenv('PARALLEL_USE_CASE_MODELS', 'false').lower() == 'true'
+    USE_CASE_WORKER_THREADS = int(os.getenv('USE_CASE_WORKER_THREADS', '8'))
+    EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '100'))  # per non-critical severity lane
+    EVENT_QUEUE_DROP_OLDEST = os.getenv('EVENT_QUEUE_DROP_OLDEST', 'false').lower() == 'true'  # else a full lane blocks the camera
+    EVENT_STARVATION_TIMEOUT = float(os.getenv('EVENT_STARVATION_TIMEOUT', '5.0'))  # seconds before low priority jumps ahead
+    
+    # Process sharding - run camera groups in separate worker processes (1 = single process)
+    PROCESS_WORKERS = int(os.getenv('PROCESS_WORKERS', '1'))
+    WORKER_STATS_INTERVAL = float(os.getenv('WORKER_STATS_INTERVAL', '5.0'))
+    WORKER_RESTART_DELAY = float(os.getenv('WORKER_RESTART_DELAY', '5.0'))
+    WORKER_COMMAND_TIMEOUT = float(os.getenv('WORKER_COMMAND_TIMEOUT', '10.0'))  # seconds to wait for a shard to apply enable/disable
+    
+    # Decode each camera in its own process, handing frames over through shared memory
+    DECODER_PROCESSES = os.getenv('DECODER_PROCESSES', 'false').lower() == 'true'
+    FRAME_RING_SLOTS = int(os.getenv('FRAME_RING_SLOTS', '4'))
+    FRAME_RING_MAX_WIDTH = int(os.getenv('FRAME_RING_MAX_WIDTH', '1920'))
+    FRAME_RING_MAX_HEIGHT = int(os.getenv('FRAME_RING_MAX_HEIGHT', '1080'))
+    
+    # Logical cameras pointing at the same stream URL share one capture and one YOLO pass
+    SHARE_IDENTICAL_STREAMS = os.getenv('SHARE_IDENTICAL_STREAMS', 'true').lower() == 'true'
+    
+    # Detector scheduling - 'every_frame', 'fixed' (every DETECTION_INTERVAL frames) or 'adaptive'
+    # Per camera: 'detection_mode', 'detection_interval', 'max_detection_interval' in the camera config
+    DETECTION_MODE = os.getenv('DETECTION_MODE', 'every_frame')
+    DETECTION_INTERVAL = int(os.getenv('DETECTION_INTERVAL', '3'))
+    MAX_DETECTION_INTERVAL = int(os.getenv('MAX_DETECTION_INTERVAL', '5'))
+    PREDICTION_UNCERTAINTY_THRESHOLD = float(os.getenv('PREDICTION_UNCERTAINTY_THRESHOLD', '0.25'))
+    SCENE_ACTIVITY_THRESHOLD = float(os.getenv('SCENE_ACTIVITY_THRESHOLD', '8.0'))
+    
+    # Zone-ROI inference - detect only on padded crops around the enabled use cases' zones
+    # Per camera: 'roi_inference' in the camera config. Use cases without zones keep the full frame.
+    ROI_INFERENCE = os.getenv('ROI_INFERENCE', 'false').lower() == 'true'
+    ROI_PADDING = int(os.getenv('ROI_PADDING', '32'))
+    
+    # Inference backend - 'pytorch', or an export built once and cached in EXPORTED_MODEL_DIR
+    # ('onnx' = ONNX Runtime, 'openvino'); INT8 variants are calibrated from FRAMES_OUTPUT_DIR
+    INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'pytorch')
+    INFERENCE_INT8 = os.getenv('INFERENCE_INT8', 'false').lower() == 'true'
+    EXPORTED_MODEL_DIR = os.getenv('EXPORTED_MODEL_DIR', 'models/exported')
+    
+    # Prometheus-format stage latency endpoint (0 = disabled); shard workers use METRICS_PORT + 1 + shard
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    
+    # Event snapshots - encoded once per frame; 0 keeps full resolution
+    EVENT_FRAME_MAX_WIDTH = int(os.getenv('EVENT_FRAME_MAX_WIDTH', '0'))
+    EVENT_JPEG_QUALITY = int(os.getenv('EVENT_JPEG_QUALITY', '90'))
+    
+    # Event sinks - 'remote' (MySQL + GCS), 'local' (SQLite + files, no network), 'sqlite', 'memory', 'null'
+    EVENT_SINK = os.getenv('EVENT_SINK', 'remote')
+    LOCAL_EVENT_DB = os.getenv('LOCAL_EVENT_DB', 'outputs/events.db')
+    LOCAL_EVENT_DIR = os.getenv('LOCAL_EVENT_DIR', Config.FRAMES_OUTPUT_DIR)
+    
+    # Detection recording - per camera .npz chunks under RECORD_DETECTIONS_DIR/<camera_id> ('' = off),
+    # replayed without a model through detections:///path stream URLs
+    RECORD_DETECTIONS_DIR = os.getenv('RECORD_DETECTIONS_DIR', '')
+    RECORD_DETECTIONS_CHUNK = int(os.getenv('RECORD_DETECTIONS_CHUNK', '1024'))  # frames per chunk file
+    
+    # Inference service - camera threads queue model calls; each replica has its own worker thread
+    INFERENCE_REPLICAS = int(os.getenv('INFERENCE_REPLICAS', '1'))
+    INFERENCE_QUEUE_SIZE = int(os.getenv('INFERENCE_QUEUE_SIZE', '0'))  # 0 = unbounded
+    
+    # Detector cascade - small model first, DETECTION_MODEL_PATH only on uncertain/new boxes
+    # Per camera: 'cascade' in the camera config
+    CASCADE_MODE = os.getenv('CASCADE_MODE', 'false').lower() == 'true'
+    CASCADE_SMALL_MODEL_PATH = os.getenv('CASCADE_SMALL_MODEL_PATH', 'models/yolo11n.pt')
+    CASCADE_CANDIDATE_CONFIDENCE = float(os.getenv('CASCADE_CANDIDATE_CONFIDENCE', '0.15'))
+    CASCADE_ACCEPT_CONFIDENCE = float(os.getenv('CASCADE_ACCEPT_CONFIDENCE', '0.6'))
+    CASCADE_CALIBRATION_INTERVAL = int(os.getenv('CASCADE_CALIBRATION_INTERVAL', '100'))  # full large pass every N
+    
+    # Inference profiles - per camera 'inference_profile' is a name from here or a dict of
+    # weights/imgsz/confidence/iou (optionally extending 'profile'). Each weight file is loaded once.
+    INFERENCE_PROFILES = {
+        'default': {'weights': Config.DETECTION_MODEL_PATH},
+        'low_priority': {'weights': os.getenv('LOW_PRIORITY_MODEL_PATH', 'models/yolo11n.pt'), 'imgsz': 480},
+        'ppe_detail': {'weights': Config.DETECTION_MODEL_PATH, 'imgsz': 1280},
+    }
+    
+    # Multi-node coordinator mode - nodes claim cameras through camera_leases rows
+    LEASE_STORE_URL = os.getenv('LEASE_STORE_URL', 'mysql')  # 'mysql' or 'sqlite:///path/leases.db'
+    NODE_ID = os.getenv('NODE_ID', '')  # defaults to <hostname>-<pid>
+    LEASE_TTL = float(os.getenv('LEASE_TTL', '15.0'))  # seconds without heartbeat before failover
+    LEASE_HEARTBEAT_INTERVAL = float(os.getenv('LEASE_HEARTBEAT_INTERVAL', '5.0'))
+    LEASE_REBALANCE_SLACK = float(os.getenv('LEASE_REBALANCE_SLACK', '0.2'))  # tolerated imbalance vs fair share
+    DEFAULT_CAMERA_COST = float(os.getenv('DEFAULT_CAMERA_COST', '100.0'))  # ms/s per use case until measured
     
     # Camera connection settings
     CAMERA_CONNECTION_TIMEOUT = int(os.getenv('CAMERA_CONNECTION_TIMEOUT', '10'))
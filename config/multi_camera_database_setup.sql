@@ -68,6 +68,28 @@ CREATE TABLE IF NOT EXISTS camera_use_cases (
     UNIQUE KEY unique_camera_use_case (camera_id, use_case)
 );
 
+-- Create camera_leases table (multi-node camera assignment)
+-- camera_id is not a foreign key: flexible configurations also use string ids like 'cam_001'
+CREATE TABLE IF NOT EXISTS camera_leases (
+    camera_id VARCHAR(64) NOT NULL PRIMARY KEY,
+    node_id VARCHAR(128) DEFAULT NULL,
+    lease_expires DOUBLE NOT NULL DEFAULT 0,
+    cost DOUBLE NOT NULL DEFAULT 0,
+    lease_version INT NOT NULL DEFAULT 0,
+    claimed_at DOUBLE DEFAULT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_node (node_id)
+);
+
+CREATE TABLE IF NOT EXISTS coordinator_nodes (
+    node_id VARCHAR(128) NOT NULL PRIMARY KEY,
+    hostname VARCHAR(255) DEFAULT NULL,
+    pid INT DEFAULT NULL,
+    heartbeat_at DOUBLE NOT NULL DEFAULT 0,
+    camera_count INT NOT NULL DEFAULT 0,
+    total_cost DOUBLE NOT NULL DEFAULT 0
+);
+
 -- Create camera_health table
 CREATE TABLE IF NOT EXISTS camera_health (
     health_id INT AUTO_INCREMENT PRIMARY KEY,
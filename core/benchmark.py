@@ -0,0 +1,340 @@
+# core/benchmark.py - NEW FILE
+# End-to-end throughput benchmark without real cameras, MySQL or GCS
+#
+# Drives FlexibleMultiCameraProcessor with N synthetic:// or file:// streams,
+# a real YOLO model or ReplayDetector (recorded/synthesized boxes), and
+# in-memory event sinks (or any other EVENT_SINK). The JSON report (per-camera fps, stage latency
+# percentiles, CPU and RSS) is written with sorted keys so runs of two
+# releases can be diffed directly.
+
+import os
+import sys
+import json
+import time
+import copy
+import logging
+import platform
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from core.event_sinks import create_event_sinks
+from core.detection_recording import DetectionRecording, is_detection_recording
+
+REPORT_VERSION = 1
+DEFAULT_CAMERA_TEMPLATE = 'config/flexible_camera_configurations.json'
+ALL_USE_CASES = ['people_counting', 'ppe_detection', 'tailgating', 'intrusion', 'loitering']
+BENCHMARK_STOP_TIMEOUT = 30.0  # seconds to wait for queued events to be saved at the end of a run
+
+logger = logging.getLogger('benchmark')
+
+
+class _ReplayBoxes:
+    __slots__ = ('xyxy', 'conf', 'cls')
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+
+    def __len__(self) -> int:
+        return len(self.xyxy)
+
+
+class _ReplayResult:
+    __slots__ = ('names', 'boxes')
+
+    def __init__(self, names, boxes):
+        self.names = names
+        self.boxes = boxes
+
+
+class ReplayDetector:
+    """
+    Stand-in for a YOLO model with the same call signature and result shape.
+    Replays a JSON-lines recording ({"boxes": [[x1, y1, x2, y2, conf, cls], ...]}
+    per frame, coordinates normalized to the input image), a detection recording
+    directory (core/detection_recording.py) or, without one,
+    synthesizes a few people walking across the image. latency_ms simulates
+    model compute time.
+    """
+
+    def __init__(self, recording: Optional[str] = None, names: Optional[Dict[int, str]] = None,
+                 latency_ms: float = 0.0, people: int = 3, seed: int = 0):
+        if names is None and recording and is_detection_recording(recording):
+            names = DetectionRecording(recording).names or None
+        self.names = dict(names or {0: 'person'})
+        self.latency_ms = latency_ms
+        self.frames = self._load_recording(recording) if recording else None
+        rng = np.random.default_rng(seed)
+        self.people = [(rng.uniform(0, 0.8), rng.uniform(0.1, 0.6), rng.uniform(-0.01, 0.01)) for _ in range(people)]
+        self.calls = 0
+
+    @staticmethod
+    def _load_recording(path: str) -> List[np.ndarray]:
+        if is_detection_recording(path):
+            frames = DetectionRecording(path).normalized_boxes()
+            if not frames:
+                raise ValueError(f"Detection recording {path} has no frames")
+            return frames
+        frames = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    boxes = json.loads(line).get('boxes', [])
+                    frames.append(np.asarray(boxes, dtype=np.float32).reshape(-1, 6))
+        if not frames:
+            raise ValueError(f"Detection recording {path} has no frames")
+        return frames
+
+    def _normalized_boxes(self, index: int) -> np.ndarray:
+        if self.frames is not None:
+            return self.frames[index % len(self.frames)]
+        boxes = []
+        for x, y, speed in self.people:
+            left = (x + speed * index) % 0.85
+            boxes.append((left, y, left + 0.12, y + 0.35, 0.8, 0))
+        return np.asarray(boxes, dtype=np.float32).reshape(-1, 6)
+
+    def __call__(self, source, classes=None, conf: float = 0.25, **kwargs):
+        images = source if isinstance(source, (list, tuple)) else [source]
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+        results = []
+        for image in images:
+            boxes = self._normalized_boxes(self.calls)
+            self.calls += 1
+            height, width = image.shape[:2]
+            keep = boxes[:, 4] >= (conf or 0.0)
+            if classes is not None:
+                keep &= np.isin(boxes[:, 5].astype(np.int32), classes)
+            boxes = boxes[keep]
+            xyxy = boxes[:, :4] * np.array([width, height, width, height], dtype=np.float32)
+            results.append(_ReplayResult(self.names, _ReplayBoxes(xyxy, boxes[:, 4], boxes[:, 5])))
+        return results
+
+
+class ResourceSampler:
+    """Samples process CPU% and RSS on a background thread"""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.samples = []  # [(cpu_percent, rss_bytes)]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name='benchmark-resources')
+        self._thread.start()
+
+    def _run(self):
+        last_wall, last_cpu = time.perf_counter(), time.process_time()
+        while not self._stop.wait(self.interval):
+            wall, cpu = time.perf_counter(), time.process_time()
+            self.samples.append((100.0 * (cpu - last_cpu) / max(1e-6, wall - last_wall), current_rss_bytes()))
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self) -> Dict[str, float]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+        if not self.samples:
+            return {}
+        cpu = [sample[0] for sample in self.samples]
+        rss = [sample[1] / (1024 * 1024) for sample in self.samples if sample[1]]
+        return {
+            'cpu_percent_avg': float(np.mean(cpu)),
+            'cpu_percent_max': float(np.max(cpu)),
+            'cpu_count': os.cpu_count(),
+            'rss_mb_avg': float(np.mean(rss)) if rss else None,
+            'rss_mb_max': float(np.max(rss)) if rss else None,
+            'samples': len(self.samples)
+        }
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (psutil, /proc, or None)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+
+def benchmark_stream_urls(count: int, source: str = 'synthetic', video: Optional[str] = None,
+                          resolution: str = '1280x720', fps: Optional[float] = None, objects: int = 4,
+                          share_streams: bool = False) -> List[str]:
+    """
+    One stream URL per camera (distinct unless share_streams, so each camera decodes its own).
+    fps None means 15 for synthetic streams and the file's own rate for videos.
+    """
+    urls = []
+    for index in range(count):
+        tag = 0 if share_streams else index
+        if source == 'file':
+            if not video:
+                raise ValueError("--video is required with --source file")
+            urls.append(f"file://{os.path.abspath(video)}?fps={fps}&camera={tag}" if fps else
+                        f"file://{os.path.abspath(video)}?camera={tag}")
+        else:
+            urls.append(f"synthetic://{resolution}@{fps or 15}?objects={objects}&seed={tag}")
+    return urls
+
+
+def benchmark_camera_configs(stream_urls: List[str], use_cases: Optional[List[str]] = None,
+                             template_path: str = DEFAULT_CAMERA_TEMPLATE) -> List[Dict[str, Any]]:
+    """Camera configs using the zones/rules of the first configured camera as a template"""
+    template = {'zones': {}, 'rules': {}}
+    if template_path and os.path.exists(template_path):
+        try:
+            with open(template_path) as f:
+                configured = json.load(f)
+            if configured:
+                template = configured[0]
+        except Exception as e:
+            logger.error(f"Could not read camera template {template_path}: {e}")
+
+    use_cases = use_cases or ALL_USE_CASES
+    configs = []
+    for index, url in enumerate(stream_urls):
+        configs.append({
+            'camera_id': f"bench{index + 1}",
+            'name': f"benchmark camera {index + 1}",
+            'stream_url': url,
+            'available_use_cases': list(use_cases),
+            'enabled_use_cases': list(use_cases),
+            'zones': copy.deepcopy({uc: template.get('zones', {}).get(uc, {}) for uc in use_cases}),
+            'rules': copy.deepcopy({uc: template.get('rules', {}).get(uc, {}) for uc in use_cases}),
+            'inference_profile': template.get('inference_profile', 'default'),
+            'status': 'active'
+        })
+    return configs
+
+
+def run_benchmark(config, cameras: int = 4, duration: float = 60.0, warmup: float = 10.0,
+                  source: str = 'synthetic', video: Optional[str] = None, resolution: str = '1280x720',
+                  fps: Optional[float] = None, detector: str = 'stub', recording: Optional[str] = None,
+                  stub_latency_ms: float = 0.0, use_cases: Optional[List[str]] = None,
+                  share_streams: bool = False, sink: str = 'memory', report_path: Optional[str] = None,
+                  progress=None) -> Dict[str, Any]:
+    """Run the processor against synthetic cameras and return (and optionally write) the report"""
+    from core.flexible_multi_camera_processor import FlexibleMultiCameraProcessor
+
+    parameters = {
+        'cameras': cameras, 'duration': duration, 'warmup': warmup, 'source': source,
+        'video': video, 'resolution': resolution, 'fps': fps, 'detector': detector,
+        'recording': recording, 'stub_latency_ms': stub_latency_ms,
+        'use_cases': use_cases or ALL_USE_CASES, 'share_streams': share_streams, 'sink': sink,
+        'inference_backend': getattr(config, 'INFERENCE_BACKEND', 'pytorch'),
+        'inference_replicas': getattr(config, 'INFERENCE_REPLICAS', 1),
+        'parallel_use_cases': getattr(config, 'PARALLEL_USE_CASE_MODELS', False)
+    }
+
+    # No metrics endpoint during a benchmark; events go to the chosen sink (in memory by default)
+    bench_config = type('BenchmarkConfig', (config,), {'METRICS_PORT': 0, 'EVENT_SINK': sink})
+    db_handler, uploader = create_event_sinks(bench_config, sink)
+    model_factory = None
+    if detector == 'stub':
+        model_factory = lambda weights: ReplayDetector(recording, latency_ms=stub_latency_ms)
+
+    processor = FlexibleMultiCameraProcessor(bench_config, db_handler=db_handler, gcp_uploader=uploader,
+                                             model_factory=model_factory)
+    urls = benchmark_stream_urls(cameras, source, video, resolution, fps, share_streams=share_streams)
+    processor.load_camera_configurations(benchmark_camera_configs(urls, use_cases))
+
+    started_at = datetime.now()
+    processor.start_workers()
+    sampler = ResourceSampler()
+    try:
+        time.sleep(warmup)
+
+        # Measure from a clean slate: counters and sink rows are diffed, histograms are reset
+        baseline = processor.counters.snapshot()
+        baseline_rows = getattr(db_handler, 'events_saved', None)
+        baseline_uploads = uploader.get_upload_stats()['total_uploads']
+        processor.metrics.reset()
+        sampler.start()
+        measure_start = time.time()
+        while time.time() - measure_start < duration:
+            time.sleep(min(5.0, max(0.0, duration - (time.time() - measure_start))))
+            if progress is not None:
+                progress(time.time() - measure_start, processor.get_global_stats())
+        elapsed = time.time() - measure_start
+        final = processor.counters.snapshot()
+        # Rolling rates only over the measured seconds, never the warmup
+        camera_rates = {camera_id: stream.rates.window(max(1, min(int(elapsed), stream.rates.horizon)))
+                        for camera_id, stream in processor.camera_streams.items()}
+        latency = processor.metrics.summary_by_stage()
+        models = processor.model_registry.get_stats()
+    finally:
+        resources = sampler.stop()
+        processor.stop(event_timeout=BENCHMARK_STOP_TIMEOUT)
+        saved_rows = getattr(db_handler, 'events_saved', None)
+        uploads = uploader.get_upload_stats()['total_uploads']
+
+    camera_results = {}
+    for camera_id in sorted(processor.camera_streams):
+        frames = final.get('frames', camera_id) - baseline.get('frames', camera_id)
+        rates = camera_rates.get(camera_id, {})
+        camera_results[camera_id] = {
+            'frames': frames,
+            'fps': frames / elapsed if elapsed else 0.0,
+            'source_fps': rates.get('source_fps', 0.0),
+            'drop_rate': rates.get('drop_rate', 0.0),
+            'avg_lag_ms': rates.get('avg_lag_ms', 0.0),
+            'events': final.get('events', camera_id) - baseline.get('events', camera_id)
+        }
+
+    per_camera_fps = [result['fps'] for result in camera_results.values()] or [0.0]
+    total_frames = sum(result['frames'] for result in camera_results.values())
+    report = {
+        'report_version': REPORT_VERSION,
+        'started_at': started_at.isoformat(),
+        'parameters': parameters,
+        'environment': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'git_commit': _git_commit()
+        },
+        'totals': {
+            'measured_seconds': elapsed,
+            'frames': total_frames,
+            'fps': total_frames / elapsed if elapsed else 0.0,
+            'fps_per_camera_avg': float(np.mean(per_camera_fps)),
+            'fps_per_camera_min': float(np.min(per_camera_fps)),
+            'events': sum(result['events'] for result in camera_results.values()),
+            'db_rows': saved_rows - baseline_rows if saved_rows is not None and baseline_rows is not None else None,
+            'uploads': uploads - baseline_uploads
+        },
+        'cameras': camera_results,
+        'latency_ms': latency,
+        'resources': resources,
+        'inference': models
+    }
+
+    if report_path:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True, default=str)
+        logger.info(f"Benchmark report written to {report_path}")
+    return report
@@ -0,0 +1,364 @@
+# core/camera_lease_coordinator.py - NEW FILE
+# Multi-node camera assignment through DB-backed leases
+#
+# Every node runs a CameraLeaseCoordinator next to its FlexibleMultiCameraProcessor.
+# Cameras are claimed with a conditional UPDATE on camera_leases (only succeeds if
+# the row is free, expired or already ours), kept alive by heartbeats and picked up
+# by another node when the owner stops renewing. Each node aims for an equal share
+# of the total measured camera cost, so adding a node moves cameras onto it.
+
+import os
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional
+
+LEASE_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS camera_leases (
+        camera_id VARCHAR(64) NOT NULL PRIMARY KEY,
+        node_id VARCHAR(128) DEFAULT NULL,
+        lease_expires DOUBLE NOT NULL DEFAULT 0,
+        cost DOUBLE NOT NULL DEFAULT 0,
+        lease_version INT NOT NULL DEFAULT 0,
+        claimed_at DOUBLE DEFAULT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coordinator_nodes (
+        node_id VARCHAR(128) NOT NULL PRIMARY KEY,
+        hostname VARCHAR(255) DEFAULT NULL,
+        pid INT DEFAULT NULL,
+        heartbeat_at DOUBLE NOT NULL DEFAULT 0,
+        camera_count INT NOT NULL DEFAULT 0,
+        total_cost DOUBLE NOT NULL DEFAULT 0
+    )
+    """
+]
+
+
+class LeaseStore(ABC):
+    """Lease table access shared by the MySQL and SQLite backends"""
+
+    placeholder = '%s'
+    insert_ignore = 'INSERT IGNORE'
+
+    @abstractmethod
+    def _execute(self, query: str, params: tuple = ()) -> int:
+        """Run a write statement and return the number of affected rows"""
+
+    @abstractmethod
+    def _fetch(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a SELECT and return its rows as dicts"""
+
+    def _sql(self, query: str) -> str:
+        return query.replace('%s', self.placeholder)
+
+    def create_tables(self):
+        for statement in LEASE_TABLES_SQL:
+            self._execute(statement)
+
+    def register_cameras(self, camera_ids: List[str]):
+        """Make sure every known camera has a lease row"""
+        for camera_id in camera_ids:
+            self._execute(self._sql(f"{self.insert_ignore} INTO camera_leases (camera_id) VALUES (%s)"),
+                          (camera_id,))
+
+    def list_leases(self) -> List[Dict[str, Any]]:
+        return self._fetch("SELECT camera_id, node_id, lease_expires, cost, lease_version FROM camera_leases")
+
+    def try_claim(self, camera_id: str, node_id: str, now: float, ttl: float) -> bool:
+        """Atomically claim a camera whose lease is free, expired or already ours"""
+        rows = self._execute(self._sql("""
+            UPDATE camera_leases
+            SET node_id = %s, lease_expires = %s, claimed_at = %s, lease_version = lease_version + 1
+            WHERE camera_id = %s AND (node_id IS NULL OR lease_expires < %s OR node_id = %s)
+        """), (node_id, now + ttl, now, camera_id, now, node_id))
+        return rows == 1
+
+    def renew(self, camera_id: str, node_id: str, now: float, ttl: float, cost: Optional[float]) -> bool:
+        """Extend our lease (and publish measured cost); False means the lease was lost"""
+        if cost is None:
+            rows = self._execute(self._sql("""
+                UPDATE camera_leases SET lease_expires = %s
+                WHERE camera_id = %s AND node_id = %s
+            """), (now + ttl, camera_id, node_id))
+        else:
+            rows = self._execute(self._sql("""
+                UPDATE camera_leases SET lease_expires = %s, cost = %s
+                WHERE camera_id = %s AND node_id = %s
+            """), (now + ttl, cost, camera_id, node_id))
+        return rows == 1
+
+    def release(self, camera_id: str, node_id: str):
+        self._execute(self._sql("""
+            UPDATE camera_leases SET node_id = NULL, lease_expires = 0
+            WHERE camera_id = %s AND node_id = %s
+        """), (camera_id, node_id))
+
+    def heartbeat_node(self, node_id: str, now: float, camera_count: int, total_cost: float):
+        rows = self._execute(self._sql("""
+            UPDATE coordinator_nodes SET heartbeat_at = %s, camera_count = %s, total_cost = %s
+            WHERE node_id = %s
+        """), (now, camera_count, total_cost, node_id))
+        if rows == 0:
+            self._execute(self._sql(f"""
+                {self.insert_ignore} INTO coordinator_nodes (node_id, hostname, pid, heartbeat_at, camera_count, total_cost)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """), (node_id, socket.gethostname(), os.getpid(), now, camera_count, total_cost))
+
+    def live_nodes(self, now: float, ttl: float) -> List[str]:
+        rows = self._fetch(self._sql("SELECT node_id FROM coordinator_nodes WHERE heartbeat_at >= %s"),
+                           (now - ttl,))
+        return [row['node_id'] for row in rows]
+
+    def remove_node(self, node_id: str):
+        self._execute(self._sql("DELETE FROM coordinator_nodes WHERE node_id = %s"), (node_id,))
+
+
+class MySQLLeaseStore(LeaseStore):
+    """Lease store on the existing MySQL database (through a DatabaseHandler)"""
+
+    def __init__(self, db_handler):
+        self.db_handler = db_handler
+
+    def _execute(self, query: str, params: tuple = ()) -> int:
+        result = self.db_handler.execute_query(query, params or None)
+        if not result:
+            return 0
+        return result[0].get('affected_rows', 0)
+
+    def _fetch(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        return self.db_handler.execute_query(query, params or None) or []
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Lease store on a local SQLite file (several local processes can share it)"""
+
+    placeholder = '?'
+    insert_ignore = 'INSERT OR IGNORE'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False,
+                                          isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.create_tables()
+
+    def _execute(self, query: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self.connection.execute(query, params).rowcount
+
+    def _fetch(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(query, params).fetchall()]
+
+
+def create_lease_store(url: str, db_handler=None) -> LeaseStore:
+    """Create a lease store from 'mysql' or 'sqlite:///path/to/file.db'"""
+    if url.startswith('sqlite:///'):
+        return SQLiteLeaseStore(url[len('sqlite:///'):])
+    if url == 'mysql':
+        if db_handler is None:
+            raise ValueError("MySQL lease store needs a DatabaseHandler")
+        return MySQLLeaseStore(db_handler)
+    raise ValueError(f"Unsupported lease store: {url}")
+
+
+class CameraLeaseCoordinator:
+    """
+    Claims cameras for one node and keeps its processor in sync with its leases.
+    Cost is the processing time a camera uses per second (ms/s) as measured by
+    the processor; cameras without measurements use default_camera_cost per
+    enabled use case.
+    """
+
+    def __init__(self, store: LeaseStore, processor, camera_configs: List[Dict[str, Any]],
+                 node_id: Optional[str] = None, lease_ttl: float = 15.0,
+                 heartbeat_interval: float = 5.0, rebalance_slack: float = 0.2,
+                 default_camera_cost: float = 100.0):
+        self.store = store
+        self.processor = processor
+        self.camera_configs = {config['camera_id']: config for config in camera_configs}
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.rebalance_slack = rebalance_slack
+        self.default_camera_cost = default_camera_cost
+
+        self.owned = set()  # camera ids this node holds leases for
+        self.released_at = {}  # {camera_id: time} - do not reclaim right after shedding
+        
+        # Claimed cameras are initialized/connected on their own threads so a slow or
+        # unreachable stream never delays lease renewal; only the heartbeat thread
+        # touches the lease store
+        self.starting = set()  # claimed, add_camera() still running
+        self.failed_starts = set()  # add_camera() failed - lease released on the next beat
+        self._lock = threading.Lock()  # owned / starting / failed_starts
+
+        self.running = False
+        self.thread = None
+        self.logger = logging.getLogger(__name__)
+
+        self.stats = {
+            'claims': 0,
+            'claim_conflicts': 0,
+            'leases_lost': 0,
+            'shed': 0,
+            'last_fair_share': 0.0,
+            'live_nodes': 0
+        }
+
+    def _default_cost(self, camera_id: str) -> float:
+        config = self.camera_configs.get(camera_id, {})
+        return self.default_camera_cost * max(1, len(config.get('enabled_use_cases', [])))
+
+    def _measured_cost(self, camera_id: str) -> Optional[float]:
+        """ms of frame processing per second, or None until the camera has processed frames"""
+        status = self.processor.get_camera_status(camera_id)
+        if not status or not status.get('frames_processed'):
+            return None
+        return status.get('current_fps', 0.0) * status.get('avg_frame_ms', 0.0)
+
+    def _lease_cost(self, lease: Dict[str, Any]) -> float:
+        return lease['cost'] if lease.get('cost') else self._default_cost(lease['camera_id'])
+
+    def run_once(self):
+        """One heartbeat: renew leases, then claim or shed cameras toward a fair share"""
+        now = time.time()
+
+        # 0. Give back leases of cameras that failed to start
+        with self._lock:
+            failed, self.failed_starts = self.failed_starts, set()
+        for camera_id in failed:
+            self.store.release(camera_id, self.node_id)
+
+        # 1. Renew our leases (starting cameras included); stop cameras another node took over
+        with self._lock:
+            owned = list(self.owned)
+        for camera_id in owned:
+            if not self.store.renew(camera_id, self.node_id, now, self.lease_ttl, self._measured_cost(camera_id)):
+                self.logger.warning(f"Lease for camera {camera_id} lost, stopping it")
+                with self._lock:
+                    self.owned.discard(camera_id)
+                    starting = camera_id in self.starting
+                if not starting:  # a starting camera is removed by its start thread
+                    self.processor.remove_camera(camera_id)
+                self.stats['leases_lost'] += 1
+
+        # 2. Work out the fair share of total camera cost across live nodes
+        leases = [lease for lease in self.store.list_leases() if lease['camera_id'] in self.camera_configs]
+        costs = {lease['camera_id']: self._lease_cost(lease) for lease in leases}
+        my_load = sum(costs.get(camera_id, 0.0) for camera_id in self.owned)
+
+        self.store.heartbeat_node(self.node_id, now, len(self.owned), my_load)
+        live_nodes = set(self.store.live_nodes(now, self.lease_ttl)) | {self.node_id}
+        fair_share = sum(costs.values()) / len(live_nodes)
+        limit = fair_share * (1 + self.rebalance_slack)
+        self.stats['last_fair_share'] = fair_share
+        self.stats['live_nodes'] = len(live_nodes)
+
+        # 3. Claim free or expired cameras, most expensive first, up to our share
+        free = [lease for lease in leases
+                if lease['camera_id'] not in self.owned
+                and (lease['node_id'] is None or lease['lease_expires'] < now)
+                and now - self.released_at.get(lease['camera_id'], 0) > 2 * self.heartbeat_interval]
+        for lease in sorted(free, key=lambda l: costs[l['camera_id']], reverse=True):
+            camera_id = lease['camera_id']
+            cost = costs[camera_id]
+            if my_load > 0 and my_load + cost > limit:
+                continue
+            if not self.store.try_claim(camera_id, self.node_id, now, self.lease_ttl):
+                self.stats['claim_conflicts'] += 1
+                continue
+
+            # initialize()/connect() can block for a long time - never on the heartbeat thread
+            with self._lock:
+                self.owned.add(camera_id)
+                self.starting.add(camera_id)
+            my_load += cost
+            self.stats['claims'] += 1
+            self.logger.info(f"Claimed camera {camera_id} (cost {cost:.0f}, load {my_load:.0f}/{fair_share:.0f})")
+            threading.Thread(target=self._start_camera, args=(camera_id,), daemon=True,
+                             name=f'lease_start_{camera_id}').start()
+
+        # 4. Shed one camera per heartbeat while clearly above our share
+        with self._lock:
+            running = self.owned - self.starting
+        if len(live_nodes) > 1 and my_load > limit and len(running) > 1:
+            candidates = sorted(running, key=lambda camera_id: costs.get(camera_id, 0.0))
+            for camera_id in candidates:
+                if my_load - costs.get(camera_id, 0.0) >= fair_share * (1 - self.rebalance_slack):
+                    self.logger.info(f"Shedding camera {camera_id} to rebalance (load {my_load:.0f} > {limit:.0f})")
+                    self.processor.remove_camera(camera_id)
+                    self.store.release(camera_id, self.node_id)
+                    with self._lock:
+                        self.owned.discard(camera_id)
+                    self.released_at[camera_id] = now
+                    self.stats['shed'] += 1
+                    break
+
+    def _start_camera(self, camera_id: str):
+        """Add a claimed camera to the processor (own thread; the heartbeat keeps renewing meanwhile)"""
+        try:
+            started = self.processor.add_camera(self.camera_configs[camera_id])
+        except Exception as e:
+            self.logger.error(f"Error starting claimed camera {camera_id}: {e}")
+            started = False
+
+        with self._lock:
+            self.starting.discard(camera_id)
+            still_owned = camera_id in self.owned
+            if not started and still_owned:
+                self.owned.discard(camera_id)
+                self.failed_starts.add(camera_id)
+
+        if started and not still_owned:
+            # Lease lost (or coordinator stopped) while connecting
+            self.logger.warning(f"Camera {camera_id} started after its lease was lost, stopping it")
+            self.processor.remove_camera(camera_id)
+        elif not started:
+            self.logger.error(f"Claimed camera {camera_id} failed to start, releasing its lease")
+
+    def _run(self):
+        while self.running:
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Lease coordination error: {e}")
+            time.sleep(self.heartbeat_interval)
+
+    def start(self):
+        """Register cameras and start the heartbeat thread"""
+        self.store.register_cameras(list(self.camera_configs.keys()))
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='camera_lease_coordinator', daemon=True)
+        self.thread.start()
+        self.logger.info(f"Lease coordinator started as node {self.node_id}")
+
+    def stop(self):
+        """Stop heartbeating and hand our cameras back immediately"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=self.heartbeat_interval + 5.0)
+
+        with self._lock:
+            owned, self.owned = self.owned | self.failed_starts, set()
+            self.failed_starts = set()
+        for camera_id in owned:
+            self.store.release(camera_id, self.node_id)
+        self.store.remove_node(self.node_id)
+        self.logger.info(f"Lease coordinator for node {self.node_id} stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'node_id': self.node_id,
+            'owned_cameras': sorted(self.owned),
+            'starting_cameras': sorted(self.starting),
+            **self.stats
+        }
@@ -0,0 +1,161 @@
+# core/cascade_detector.py - NEW FILE
+# Two-stage detector cascade: a small model on every detector pass, the large model on demand
+#
+# The small model runs first with a lowered candidate threshold. Its boxes are
+#   confident  (conf >= accept_confidence) - accepted as they are
+#   uncertain  (candidate <= conf < accept) - re-checked by the large model
+# Confident boxes that match nothing from the previous pass (new tracks) are
+# re-checked as well. The large model only sees padded crops around the boxes
+# to re-check (or the full frame when those cover most of it), and every
+# `calibration_interval` passes it runs on the full frame to catch small-model
+# misses and keep the time-saved estimate honest.
+#
+# CascadeDetector has the same detect(frame, request) interface as YOLODetector,
+# so streams and use-case models are unaware of the cascade.
+
+import time
+import logging
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from camera_models.frame_detections import FrameDetections
+from core.detectors import YOLODetector, DetectionRequest
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) xyxy boxes"""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-6)
+
+
+class CascadeDetector:
+    """Small detector first, large detector only where the small one is unsure"""
+
+    def __init__(self, small: YOLODetector, large: YOLODetector, candidate_confidence: float = 0.15,
+                 accept_confidence: float = 0.6, confirm_new_tracks: bool = True,
+                 calibration_interval: int = 100, match_iou: float = 0.3):
+        self.small = small
+        self.large = large
+        self.candidate_confidence = candidate_confidence
+        self.accept_confidence = accept_confidence
+        self.confirm_new_tracks = confirm_new_tracks
+        self.calibration_interval = max(0, calibration_interval)
+        self.match_iou = match_iou
+
+        # Both stages crop to the same zones (see set_roi_inference)
+        self.large.roi_planner = self.small.roi_planner
+        self.profile = large.profile
+
+        self.previous_boxes = np.empty((0, 4), dtype=np.float32)
+        self.large_full_ms = None  # EMA of a full-frame large pass, for the time-saved estimate
+
+        self.stats = {
+            'passes': 0,
+            'small_only': 0,
+            'large_regions': 0,
+            'large_full_frame': 0,
+            'uncertain_boxes': 0,
+            'unconfirmed_tracks': 0,
+            'small_ms_total': 0.0,
+            'large_ms_total': 0.0,
+            'time_saved_ms': 0.0
+        }
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def roi_planner(self):
+        return self.small.roi_planner
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return self.large.names
+
+    def detect(self, frame, request: Optional[DetectionRequest] = None) -> FrameDetections:
+        """Same contract as YOLODetector.detect"""
+        if request is None:
+            request = DetectionRequest(self.large.names.values())
+        if request.is_empty:
+            return FrameDetections.empty(self.names)
+
+        self.stats['passes'] += 1
+        calibrate = self.calibration_interval and (self.stats['passes'] - 1) % self.calibration_interval == 0
+
+        start = time.perf_counter()
+        candidate_request = DetectionRequest(request.class_names, min(self.candidate_confidence,
+                                                                      request.min_confidence),
+                                             request.zone_polygons)
+        candidates = self.small.detect(frame, candidate_request)
+        small_ms = (time.perf_counter() - start) * 1000
+        self.stats['small_ms_total'] += small_ms
+
+        confident = candidates.conf >= self.accept_confidence
+        recheck = ~confident
+        self.stats['uncertain_boxes'] += int(recheck.sum())
+        if self.confirm_new_tracks and len(candidates):
+            matched = box_iou(candidates.xyxy, self.previous_boxes).max(axis=1, initial=0.0) >= self.match_iou
+            unconfirmed = confident & ~matched
+            self.stats['unconfirmed_tracks'] += int(unconfirmed.sum())
+            recheck |= unconfirmed
+
+        if calibrate:
+            result, large_ms = self._run_large(frame, request, request.zone_polygons)
+            self.stats['large_full_frame'] += 1
+            self.large_full_ms = large_ms if self.large_full_ms is None else 0.8 * self.large_full_ms + 0.2 * large_ms
+        elif not recheck.any():
+            result = self._subset(candidates, candidates.conf >= request.min_confidence)
+            large_ms = 0.0
+            self.stats['small_only'] += 1
+        else:
+            # Large model on crops around the boxes to re-check; confident matched boxes stay
+            regions = [[[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+                       for x1, y1, x2, y2 in candidates.xyxy[recheck].tolist()]
+            verified, large_ms = self._run_large(frame, request, regions)
+            self.stats['large_regions'] += 1
+
+            kept = confident & ~recheck
+            kept_boxes = self._subset(candidates, kept)
+            if len(verified) and len(kept_boxes):
+                duplicate = box_iou(kept_boxes.xyxy, verified.xyxy).max(axis=1) >= 0.5
+                kept_boxes = self._subset(kept_boxes, ~duplicate)
+            result = FrameDetections.concatenate([kept_boxes, verified], self.names)
+
+        self.stats['large_ms_total'] += large_ms
+        if self.large_full_ms is not None:
+            self.stats['time_saved_ms'] += self.large_full_ms - (small_ms + large_ms)
+
+        self.previous_boxes = result.xyxy
+        return result
+
+    def _run_large(self, frame, request: DetectionRequest, zone_polygons):
+        start = time.perf_counter()
+        result = self.large.detect(frame, DetectionRequest(request.class_names, request.min_confidence,
+                                                           zone_polygons))
+        return result, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _subset(detections: FrameDetections, mask) -> FrameDetections:
+        return FrameDetections(detections.xyxy[mask], detections.conf[mask], detections.cls[mask],
+                               detections.names, detections.predicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        passes = self.stats['passes']
+        return {
+            'mode': 'cascade',
+            'small_hit_rate': self.stats['small_only'] / passes if passes else 0.0,
+            'large_region_rate': self.stats['large_regions'] / passes if passes else 0.0,
+            'avg_small_ms': self.stats['small_ms_total'] / passes if passes else 0.0,
+            'avg_large_ms': self.stats['large_ms_total'] / passes if passes else 0.0,
+            'large_full_frame_ms': self.large_full_ms,
+            'small': self.small.get_stats(),
+            'large': self.large.get_stats(),
+            **self.stats
+        }
@@ -0,0 +1,125 @@
+# core/counters.py - NEW FILE
+# Lock-free event counters: one shard per writer thread, merged on read
+#
+# Every camera worker increments its own CounterShard, so the hot path is a
+# plain dict update with no lock and no lost updates (one writer per shard).
+# Readers merge all shards into an immutable CountersSnapshot on demand;
+# snapshots can be reused for max_age seconds so frequent status polling
+# stays cheap. Gauges (camera counts) are set from control paths only.
+
+import time
+import threading
+from types import MappingProxyType
+from typing import Dict, Hashable, Optional
+
+
+class CounterShard:
+    """Counters written by exactly one thread"""
+
+    __slots__ = ('counts',)
+
+    def __init__(self):
+        self.counts = {}  # {(name, label): int}
+
+    def add(self, name: str, amount: int = 1, label: Hashable = None):
+        key = (name, label)
+        self.counts[key] = self.counts.get(key, 0) + amount
+
+
+class CountersSnapshot:
+    """Immutable merged view of all shards at one point in time"""
+
+    def __init__(self, counts: Dict[tuple, int], gauges: Dict[str, int], taken_at: float):
+        self.counts = MappingProxyType(counts)
+        self.gauges = MappingProxyType(gauges)
+        self.taken_at = taken_at
+
+    def get(self, name: str, label: Hashable = None) -> int:
+        return self.counts.get((name, label), 0)
+
+    def total(self, name: str) -> int:
+        """Sum of a counter over all labels"""
+        return sum(count for (counter, _), count in self.counts.items() if counter == name)
+
+    def by_label(self, name: str, prefix: Hashable = None) -> Dict[Hashable, int]:
+        """
+        {label: count} of one counter. For tuple labels, prefix selects those whose
+        first element matches and keys the result by the second element.
+        """
+        result = {}
+        for (counter, label), count in self.counts.items():
+            if counter != name:
+                continue
+            if prefix is not None:
+                if not isinstance(label, tuple) or label[0] != prefix:
+                    continue
+                label = label[1]
+            result[label] = result.get(label, 0) + count
+        return result
+
+    def gauge(self, name: str) -> int:
+        return self.gauges.get(name, 0)
+
+
+class ShardedCounters:
+    """Registry of per-thread shards plus gauges"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}  # counts folded in from shards of finished threads
+        self._gauges = {}
+        self._lock = threading.Lock()  # shard registration, retirement, gauges and snapshot cache
+        self._snapshot = None
+
+    def shard(self) -> CounterShard:
+        """This thread's shard (registered on first use); hold on to it in hot loops"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = CounterShard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def add(self, name: str, amount: int = 1, label: Hashable = None):
+        self.shard().add(name, amount, label)
+
+    def retire(self, shard: CounterShard):
+        """Fold the shard of a thread that is exiting into the retired totals"""
+        with self._lock:
+            if shard not in self._shards:
+                return
+            self._shards.remove(shard)
+            for key, count in dict(shard.counts).items():
+                self._retired[key] = self._retired.get(key, 0) + count
+        if getattr(self._local, 'shard', None) is shard:
+            self._local.shard = None
+
+    def set_gauge(self, name: str, value: int):
+        with self._lock:
+            self._gauges[name] = value
+
+    def adjust_gauge(self, name: str, delta: int, minimum: Optional[int] = 0):
+        with self._lock:
+            value = self._gauges.get(name, 0) + delta
+            self._gauges[name] = value if minimum is None else max(minimum, value)
+
+    def snapshot(self, max_age: float = 0.0) -> CountersSnapshot:
+        """Merged counters; a snapshot younger than max_age seconds is reused"""
+        now = time.time()
+        with self._lock:
+            cached = self._snapshot
+            if cached is not None and max_age > 0 and now - cached.taken_at < max_age:
+                return cached
+            counts = dict(self._retired)
+            shards = list(self._shards)
+            gauges = dict(self._gauges)
+        for shard in shards:
+            # dict() copies atomically under the GIL even while the owner keeps writing
+            for key, count in dict(shard.counts).items():
+                counts[key] = counts.get(key, 0) + count
+        snapshot = CountersSnapshot(counts, gauges, now)
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
@@ -8,6 +8,8 @@ from datetime import datetime
 import logging
 from typing import Optional, Dict, Any, List
 
+from core.event_priority import get_event_severity
+
 class DatabaseHandler:
     """Simple database handler for single camera testing"""
     
@@ -90,15 +92,7 @@ class DatabaseHandler:
         event_id = str(uuid.uuid4())
         
         # Determine severity based on event type
-        severity_map = {
-            'people_counting': 'info',
-            'ppe_detection': 'warning', 
-            'tailgating': 'warning',
-            'intrusion': 'critical',
-            'loitering': 'warning'
-        }
-        
-        severity = severity_map.get(event_type, 'info')
+        severity = get_event_severity(event_type)
         
         query = """
             INSERT INTO events (
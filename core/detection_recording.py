@@ -0,0 +1,255 @@
+# core/detection_recording.py - NEW FILE
+# Compact on-disk record of per-frame detections, and a capture that replays it
+#
+# A recording is a directory:
+#   meta.json        - format version, camera_id, class names, frame shape, chunk list
+#   chunk_00000.npz  - up to chunk_frames frames as columns:
+#                        frame (int64), timestamp (float64), predicted (bool),
+#                        offsets (int64, frames + 1) into the box columns
+#                        xyxy (float32, N x 4), conf (float32), cls (int16)
+# Boxes are in frame pixel coordinates, exactly what the use-case models received
+# (tracker-predicted frames included), so replaying gives the same events.
+#
+# Recording: RECORD_DETECTIONS_DIR (or 'record_detections' in a camera config)
+# writes <dir>/<camera_id>/; an existing recording there is appended to (camera
+# re-added, process restarted), never overwritten. Replaying: stream_url detections:///path/to/recording
+# feeds the camera blank frames plus the recorded detections, with no model call.
+
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from camera_models.frame_detections import FrameDetections
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+
+
+def is_detection_recording(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+class DetectionRecorder:
+    """Buffers one camera's detections and writes them chunk by chunk (single writer thread)"""
+
+    def __init__(self, directory: str, camera_id: Optional[str] = None, chunk_frames: int = 1024):
+        self.directory = directory
+        self.camera_id = camera_id
+        self.chunk_frames = chunk_frames
+        self.names = None
+        self.frame_shape = None
+        self.chunks = []
+        self.frames_recorded = 0
+        self.boxes_recorded = 0
+        self._reset_buffer()
+        self.logger = logging.getLogger('detection_recording')
+        os.makedirs(directory, exist_ok=True)
+        if is_detection_recording(directory):
+            self._resume()
+
+    def _resume(self):
+        """Continue an existing recording: keep its chunks, number new chunks and frames after them"""
+        try:
+            recording = DetectionRecording(self.directory)
+        except Exception as e:
+            # Unreadable or newer format - leave it alone and record into a fresh subdirectory
+            self.directory = os.path.join(self.directory, time.strftime('session_%Y%m%d_%H%M%S'))
+            os.makedirs(self.directory, exist_ok=True)
+            self.logger.error(f"Cannot append to detection recording ({e}), recording to {self.directory}")
+            return
+        self.chunks = list(recording.meta.get('chunks', []))
+        self.names = recording.names or None
+        self.frame_shape = recording.frame_shape
+        self.frames_recorded = len(recording)
+        self.boxes_recorded = sum(chunk.get('boxes', 0) for chunk in self.chunks)
+        self.logger.info(f"Appending to detection recording {self.directory} "
+                         f"({len(self.chunks)} chunks, {self.frames_recorded} frames)")
+
+    def _reset_buffer(self):
+        self._frames, self._timestamps, self._predicted, self._counts = [], [], [], []
+        self._xyxy, self._conf, self._cls = [], [], []
+
+    def record(self, timestamp: float, detections, frame_shape: Optional[Tuple[int, ...]] = None):
+        """Append one frame's detections (FrameDetections or anything FrameDetections.coerce takes)"""
+        detections = FrameDetections.coerce(detections)
+        if self.names is None or (detections.names and detections.names != self.names):
+            self.names = dict(detections.names)
+        if frame_shape is not None:
+            frame_shape = tuple(int(value) for value in frame_shape)
+            if self.frame_shape is not None and frame_shape != self.frame_shape and self.chunks:
+                self.logger.warning(f"Detection recording {self.directory} frame shape changed "
+                                    f"{self.frame_shape} -> {frame_shape}; earlier boxes keep their pixel scale")
+            self.frame_shape = frame_shape
+
+        self._frames.append(self.frames_recorded)
+        self._timestamps.append(timestamp)
+        self._predicted.append(detections.predicted)
+        self._counts.append(len(detections))
+        if len(detections):
+            self._xyxy.append(detections.xyxy)
+            self._conf.append(detections.conf)
+            self._cls.append(detections.cls)
+        self.frames_recorded += 1
+        self.boxes_recorded += len(detections)
+
+        if len(self._frames) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Write buffered frames as the next chunk and update meta.json"""
+        if not self._frames:
+            return
+        filename = f"chunk_{len(self.chunks):05d}.npz"
+        try:
+            np.savez_compressed(
+                os.path.join(self.directory, filename),
+                frame=np.asarray(self._frames, dtype=np.int64),
+                timestamp=np.asarray(self._timestamps, dtype=np.float64),
+                predicted=np.asarray(self._predicted, dtype=bool),
+                offsets=np.concatenate([[0], np.cumsum(self._counts)]).astype(np.int64),
+                xyxy=np.concatenate(self._xyxy).astype(np.float32) if self._xyxy else np.empty((0, 4), np.float32),
+                conf=np.concatenate(self._conf).astype(np.float32) if self._conf else np.empty(0, np.float32),
+                cls=np.concatenate(self._cls).astype(np.int16) if self._cls else np.empty(0, np.int16)
+            )
+            self.chunks.append({'file': filename, 'first_frame': self._frames[0], 'frames': len(self._frames),
+                                'boxes': int(sum(self._counts))})
+            self._write_meta()
+        except Exception as e:
+            self.logger.error(f"Error writing detection chunk {filename}: {e}")
+        self._reset_buffer()
+
+    def _write_meta(self):
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'camera_id': self.camera_id,
+            'names': {str(class_id): name for class_id, name in (self.names or {}).items()},
+            'frame_shape': list(self.frame_shape) if self.frame_shape else None,
+            'frames': sum(chunk['frames'] for chunk in self.chunks),
+            'chunks': self.chunks
+        }
+        path = os.path.join(self.directory, META_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + '.tmp', path)  # readers never see a half-written meta
+
+    def close(self):
+        self.flush()
+        self.logger.info(f"Detection recording {self.directory}: {self.frames_recorded} frames, "
+                         f"{self.boxes_recorded} boxes")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'directory': self.directory, 'frames': self.frames_recorded, 'boxes': self.boxes_recorded,
+                'chunks': len(self.chunks)}
+
+
+class DetectionRecording:
+    """Read side: iterates frames lazily, one chunk in memory at a time"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format_version', 0) > FORMAT_VERSION:
+            raise ValueError(f"Detection recording {directory} has a newer format "
+                             f"({self.meta['format_version']} > {FORMAT_VERSION})")
+        self.names = {int(class_id): name for class_id, name in self.meta.get('names', {}).items()}
+        self.frame_shape = tuple(self.meta['frame_shape']) if self.meta.get('frame_shape') else None
+
+    def __len__(self) -> int:
+        return self.meta.get('frames', 0)
+
+    def load_chunk(self, index: int) -> Dict[str, np.ndarray]:
+        with np.load(os.path.join(self.directory, self.meta['chunks'][index]['file'])) as data:
+            return {key: data[key] for key in data.files}
+
+    def __iter__(self) -> Iterator[Tuple[int, float, FrameDetections]]:
+        """(frame index, timestamp, FrameDetections) for every recorded frame"""
+        for index in range(len(self.meta['chunks'])):
+            chunk = self.load_chunk(index)
+            offsets = chunk['offsets']
+            for row in range(len(chunk['frame'])):
+                start, end = offsets[row], offsets[row + 1]
+                yield (int(chunk['frame'][row]), float(chunk['timestamp'][row]),
+                       FrameDetections(chunk['xyxy'][start:end], chunk['conf'][start:end],
+                                       chunk['cls'][start:end], self.names, bool(chunk['predicted'][row])))
+
+    def normalized_boxes(self) -> List[np.ndarray]:
+        """Per frame [x1, y1, x2, y2, conf, cls] rows with coordinates scaled to 0..1"""
+        if not self.frame_shape:
+            raise ValueError(f"Detection recording {self.directory} has no frame shape")
+        height, width = self.frame_shape[:2]
+        scale = np.array([width, height, width, height], dtype=np.float32)
+        return [np.column_stack([detections.xyxy / scale, detections.conf, detections.cls]).astype(np.float32)
+                for _, _, detections in self]
+
+
+class DetectionReplayCapture:
+    """
+    cv2.VideoCapture-like source for detections:// URLs. Each read() returns a
+    blank frame of the recorded size; recorded_detections and media_timestamp
+    describe that frame, so the camera skips its detector. Stops at the end
+    (finished) unless loop is set.
+    """
+
+    def __init__(self, directory: str, loop: bool = False):
+        self.recording = DetectionRecording(directory)
+        self.loop = loop
+        shape = self.recording.frame_shape or (720, 1280, 3)
+        self.blank = np.zeros(shape, dtype=np.uint8)
+        self.frames = iter(self.recording)
+        self.recorded_detections = None
+        self.media_timestamp = None
+        self.last_timestamp = 0.0
+        self.frames_read = 0
+        self.loops = 0
+        self.finished = len(self.recording) == 0
+        self.opened = True
+
+    def grab(self) -> bool:
+        if not self.opened or self.finished:
+            return False
+        try:
+            _, timestamp, detections = next(self.frames)
+        except StopIteration:
+            if not self.loop or not len(self.recording):
+                self.finished = True
+                return False
+            self.loops += 1
+            self.frames = iter(self.recording)
+            _, timestamp, detections = next(self.frames)
+        self.recorded_detections = detections
+        self.media_timestamp = timestamp
+        self.frames_read += 1
+        self.last_timestamp = time.time()
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if image is not None and image.shape == self.blank.shape:
+            image.fill(0)
+            return True, image
+        return True, self.blank.copy()
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def get(self, prop_id: int) -> float:
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def release(self):
+        self.opened = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'frames': len(self.recording), 'frames_read': self.frames_read, 'loops': self.loops,
+                'finished': self.finished}
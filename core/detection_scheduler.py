@@ -0,0 +1,177 @@
+# core/detection_scheduler.py - NEW FILE
+# Detect-every-k-frames mode with Kalman tracker prediction in between
+#
+# The detector only runs on some frames; on the others the use-case models get
+# boxes predicted by a DatacenterTracker, flagged predicted=True on the
+# FrameDetections so rules can tell them apart from real detections.
+#
+# Modes:
+#   every_frame - detector on every frame (default, current behaviour)
+#   fixed       - detector every `interval` frames
+#   adaptive    - detector at least every `max_interval` frames, and earlier when
+#                 a track becomes uncertain, objects move fast or the scene changes
+
+import logging
+from typing import Dict, Any, Callable, Tuple
+
+import cv2
+import numpy as np
+
+from camera_models.frame_detections import FrameDetections
+from camera_models.kalman_track import DatacenterTracker
+
+DETECTION_MODES = ('every_frame', 'fixed', 'adaptive')
+
+
+class DetectionScheduler:
+    """Decides per frame whether to run the detector or use tracker predictions"""
+
+    def __init__(self, mode: str = 'every_frame', interval: int = 1, max_interval: int = 5,
+                 uncertainty_threshold: float = 0.25, speed_threshold: float = 0.05,
+                 activity_threshold: float = 8.0, min_confidence: float = 0.3, max_age: int = 30):
+        if mode not in DETECTION_MODES:
+            raise ValueError(f"Unknown detection mode '{mode}', expected one of {DETECTION_MODES}")
+
+        self.mode = mode
+        self.interval = max(1, interval)
+        self.max_interval = max(1, max_interval)
+        self.uncertainty_threshold = uncertainty_threshold  # position std / box height
+        self.speed_threshold = speed_threshold              # box heights per frame
+        self.activity_threshold = activity_threshold        # mean abs diff of 64x36 grayscale thumbnails
+        self.min_confidence = min_confidence
+
+        # min_hits=1: every detection is immediately available for prediction
+        self.tracker = DatacenterTracker(max_age=max_age, min_hits=1)
+        self.names = {0: 'person'}
+        self.class_ids = {'person': 0}
+
+        self.frames_since_detect = None  # None until the first detector pass
+        self.reference_thumbnail = None
+        self.last_predictions = []
+
+        self.stats = {
+            'frames': 0,
+            'detector_passes': 0,
+            'predicted_frames': 0,
+            'forced_by_uncertainty': 0,
+            'forced_by_speed': 0,
+            'forced_by_activity': 0
+        }
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_camera_config(cls, camera_config: Dict[str, Any], config=None) -> 'DetectionScheduler':
+        """Build from camera config keys, falling back to processor config defaults"""
+        mode = camera_config.get('detection_mode', getattr(config, 'DETECTION_MODE', 'every_frame'))
+        interval = camera_config.get('detection_interval', getattr(config, 'DETECTION_INTERVAL', 3))
+        return cls(
+            mode=mode,
+            interval=interval,
+            max_interval=camera_config.get('max_detection_interval',
+                                           getattr(config, 'MAX_DETECTION_INTERVAL', max(interval, 5))),
+            uncertainty_threshold=getattr(config, 'PREDICTION_UNCERTAINTY_THRESHOLD', 0.25),
+            activity_threshold=getattr(config, 'SCENE_ACTIVITY_THRESHOLD', 8.0)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'every_frame'
+
+    def _thumbnail(self, frame) -> np.ndarray:
+        if hasattr(frame, 'activity_thumbnail'):  # PreparedFrame caches it
+            return frame.activity_thumbnail()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def should_detect(self, frame) -> bool:
+        """True when the detector must run on this frame"""
+        if not self.enabled or self.frames_since_detect is None:
+            return True
+
+        if self.mode == 'fixed':
+            return self.frames_since_detect + 1 >= self.interval
+
+        # adaptive
+        if self.frames_since_detect + 1 >= self.max_interval:
+            return True
+
+        if any(p['uncertainty'] > self.uncertainty_threshold for p in self.last_predictions):
+            self.stats['forced_by_uncertainty'] += 1
+            return True
+
+        if any(p['speed'] > self.speed_threshold for p in self.last_predictions):
+            self.stats['forced_by_speed'] += 1
+            return True
+
+        # Scene activity catches objects entering that no track can predict
+        if self.reference_thumbnail is not None:
+            activity = float(np.mean(np.abs(self._thumbnail(frame) - self.reference_thumbnail)))
+            if activity > self.activity_threshold:
+                self.stats['forced_by_activity'] += 1
+                return True
+
+        return False
+
+    def observe(self, detection_result, frame=None):
+        """Feed a real detector result to the tracker"""
+        detections = FrameDetections.coerce(detection_result)
+        if detections.names:
+            self.names = detections.names
+            self.class_ids = {name: class_id for class_id, name in self.names.items()}
+
+        detections = detections.filter(min_confidence=self.min_confidence)
+        measurements = []
+        classes = []
+        for (x1, y1, x2, y2), confidence, class_id in zip(detections.xyxy.tolist(), detections.conf.tolist(),
+                                                           detections.cls.tolist()):
+            height = y2 - y1
+            aspect_ratio = (x2 - x1) / height if height > 0 else 1.0
+            measurements.append([(x1 + x2) / 2, (y1 + y2) / 2, aspect_ratio, height, confidence])
+            classes.append(self.names.get(class_id, f"class_{class_id}"))
+
+        self.tracker.update(np.array(measurements) if measurements else None, classes)
+
+        self.frames_since_detect = 0
+        self.last_predictions = []
+        if frame is not None and self.mode == 'adaptive':
+            self.reference_thumbnail = self._thumbnail(frame)
+
+    def predict(self) -> FrameDetections:
+        """Predicted boxes for a frame the detector skipped"""
+        self.last_predictions = self.tracker.predict_tracks()
+        self.frames_since_detect = (self.frames_since_detect or 0) + 1
+
+        xyxy, conf, cls, track_ids = [], [], [], []
+        for prediction in self.last_predictions:
+            x, y, aspect_ratio, height = prediction['state'][:4]
+            width = aspect_ratio * height
+            xyxy.append([x - width / 2, y - height / 2, x + width / 2, y + height / 2])
+            conf.append(prediction['confidence'])
+            cls.append(self.class_ids.get(prediction['object_class'], -1))
+            track_ids.append(prediction['track_id'])
+
+        return FrameDetections(np.array(xyxy) if xyxy else None, conf, cls, self.names,
+                               predicted=True, track_ids=track_ids)
+
+    def run(self, frame, detect: Callable[[Any], Any]) -> Tuple[Any, bool]:
+        """Detection result for a frame: (detector output or prediction, detector_ran)"""
+        self.stats['frames'] += 1
+        if self.should_detect(frame):
+            detection_result = detect(frame)
+            self.stats['detector_passes'] += 1
+            if self.enabled:
+                self.observe(detection_result, frame)
+            return detection_result, True
+
+        self.stats['predicted_frames'] += 1
+        return self.predict(), False
+
+    def get_stats(self) -> Dict[str, Any]:
+        frames = self.stats['frames']
+        return {
+            'mode': self.mode,
+            'interval': self.interval if self.mode == 'fixed' else self.max_interval,
+            'active_tracks': len(self.tracker.trackers),
+            'detector_ratio': self.stats['detector_passes'] / frames if frames else 1.0,
+            **self.stats
+        }
@@ -0,0 +1,178 @@
+# core/detectors.py - NEW FILE
+# Shared detector wrapper with class/confidence filtering derived from enabled use cases
+
+import logging
+from typing import Dict, List, Any, Iterable, Optional
+
+from camera_models.frame_detections import FrameDetections
+from core.roi_inference import RoiPlanner, collect_zone_polygons
+from core.frame_preprocessor import PreparedFrame
+
+# Detector classes each use case consumes (all current models only look at people)
+USE_CASE_DETECTION_CLASSES = {
+    'people_counting': ('person',),
+    'ppe_detection': ('person',),
+    'tailgating': ('person',),
+    'intrusion': ('person',),
+    'loitering': ('person',),
+}
+
+DEFAULT_MIN_CONFIDENCE = 0.3
+
+# Predict settings passed on every model call: the YOLO instance is shared between
+# cameras and keeps its predictor args, so anything left out would be inherited
+# from whichever camera called it last
+DEFAULT_IMGSZ = 640
+DEFAULT_IOU = 0.7
+DEFAULT_UNFILTERED_CONFIDENCE = 0.25  # ultralytics default, for passes without a request
+
+
+class DetectionRequest:
+    """
+    Which classes a detector pass must return, the lowest confidence any consumer
+    needs and, for zone-ROI inference, the zone polygons it looks at
+    (zone_polygons=None means the full frame).
+    """
+
+    def __init__(self, class_names: Iterable[str] = (), min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+                 zone_polygons: Optional[List] = None):
+        self.class_names = frozenset(class_names)
+        self.min_confidence = min_confidence
+        self.zone_polygons = zone_polygons
+
+    @classmethod
+    def for_use_cases(cls, use_cases: Iterable[str], rules_config: Optional[Dict[str, Any]] = None,
+                      zones_config: Optional[Dict[str, Any]] = None) -> 'DetectionRequest':
+        """
+        Union of classes and lowest confidence threshold over the given use cases.
+        Passing zones_config turns on zone-ROI inference for those use cases.
+        """
+        use_cases = list(use_cases)
+        rules_config = rules_config or {}
+        class_names = set()
+        thresholds = []
+        for use_case in use_cases:
+            class_names.update(USE_CASE_DETECTION_CLASSES.get(use_case, ('person',)))
+            rules = rules_config.get(use_case, {}) or {}
+            thresholds.append(rules.get('confidence_threshold', DEFAULT_MIN_CONFIDENCE))
+        zone_polygons = collect_zone_polygons(zones_config, use_cases) if zones_config and use_cases else None
+        return cls(class_names, min(thresholds) if thresholds else DEFAULT_MIN_CONFIDENCE, zone_polygons)
+
+    @classmethod
+    def merge(cls, requests: Iterable['DetectionRequest']) -> 'DetectionRequest':
+        """Combine the requests of several consumers of one detector pass"""
+        requests = [request for request in requests if not request.is_empty]
+        class_names = set()
+        for request in requests:
+            class_names.update(request.class_names)
+        thresholds = [request.min_confidence for request in requests]
+
+        # Crop only if every consumer is zone-limited; the crops cover all their zones
+        zone_polygons = None
+        if requests and all(request.zone_polygons for request in requests):
+            zone_polygons = [polygon for request in requests for polygon in request.zone_polygons]
+        return cls(class_names, min(thresholds) if thresholds else DEFAULT_MIN_CONFIDENCE, zone_polygons)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.class_names
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, DetectionRequest) and self.class_names == other.class_names
+                and self.min_confidence == other.min_confidence and self.zone_polygons == other.zone_polygons)
+
+    def __repr__(self) -> str:
+        zones = len(self.zone_polygons) if self.zone_polygons else 'full frame'
+        return f"DetectionRequest(classes={sorted(self.class_names)}, conf={self.min_confidence}, zones={zones})"
+
+
+class YOLODetector:
+    """Runs the shared YOLO model restricted to the classes (and zone crops) a request needs"""
+
+    def __init__(self, model, roi_padding: int = 32, profile=None):
+        self.model = model
+        self.profile = profile  # optional InferenceProfile (imgsz, confidence, IoU)
+        self.imgsz = (profile.imgsz if profile is not None else None) or DEFAULT_IMGSZ
+        self.iou = profile.iou if profile is not None and profile.iou is not None else DEFAULT_IOU
+        self.logger = logging.getLogger(__name__)
+        self._class_id_cache = {}
+        self.roi_planner = RoiPlanner(padding=roi_padding)
+        self.stats = {'full_frame_passes': 0, 'roi_passes': 0, 'roi_crops': 0, 'roi_pixel_ratio': 1.0}
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return dict(getattr(self.model, 'names', None) or {0: 'person'})
+
+    def class_ids(self, class_names: Iterable[str]) -> List[int]:
+        """Detector class ids for class names (unknown names are ignored)"""
+        key = frozenset(class_names)
+        if key not in self._class_id_cache:
+            ids = sorted(class_id for class_id, name in self.names.items() if name in key)
+            missing = key - {self.names[class_id] for class_id in ids}
+            if missing:
+                self.logger.warning(f"Detector has no classes named {sorted(missing)}")
+            self._class_id_cache[key] = ids
+        return self._class_id_cache[key]
+
+    def detect(self, frame, request: Optional[DetectionRequest] = None) -> FrameDetections:
+        """
+        One detector pass; NMS and decoding only cover the requested classes.
+        frame may be a PreparedFrame, whose cached letterboxed input is reused.
+        """
+        prepared = frame if isinstance(frame, PreparedFrame) else None
+        if prepared is not None:
+            frame = prepared.full
+
+        if request is None:
+            confidence = DEFAULT_UNFILTERED_CONFIDENCE
+            if self.profile is not None and self.profile.confidence is not None:
+                confidence = self.profile.confidence
+            return self._detect_full(frame, prepared, None, confidence)
+
+        if request.is_empty:
+            # Nothing enabled needs detections - skip the pass entirely
+            return FrameDetections.empty(self.names)
+
+        # A profile confidence overrides the threshold derived from the use-case rules
+        min_confidence = request.min_confidence
+        if self.profile is not None and self.profile.confidence is not None:
+            min_confidence = self.profile.confidence
+
+        rois = self.roi_planner.plan(request.zone_polygons, frame.shape)
+        classes = self.class_ids(request.class_names)
+        if rois is None:
+            self.stats['full_frame_passes'] += 1
+            return self._detect_full(frame, prepared, classes, min_confidence)
+
+        return self._detect_rois(frame, rois, classes, min_confidence)
+
+    def _predict_kwargs(self, classes: Optional[List[int]], confidence: float) -> Dict[str, Any]:
+        """Complete predict settings for one call (classes=None means all classes)"""
+        return {'verbose': False, 'imgsz': self.imgsz, 'iou': self.iou, 'conf': confidence, 'classes': classes}
+
+    def _detect_full(self, frame, prepared: Optional[PreparedFrame], classes: Optional[List[int]],
+                     confidence: float) -> FrameDetections:
+        if prepared is None:
+            return FrameDetections.from_ultralytics(self.model(frame, **self._predict_kwargs(classes, confidence)))
+
+        # Already letterboxed to imgsz, so YOLO's own letterbox is a no-op
+        image, scale, (pad_x, pad_y) = prepared.inference(self.imgsz)
+        results = self.model(image, **self._predict_kwargs(classes, confidence))
+        return FrameDetections.from_ultralytics(results).unletterbox(scale, pad_x, pad_y, frame.shape)
+
+    def _detect_rois(self, frame, rois, classes, min_confidence) -> FrameDetections:
+        """Batch the zone crops through one model call and map boxes back to frame coordinates"""
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in rois]
+        results = self.model(crops, **self._predict_kwargs(classes, min_confidence))
+
+        parts = [FrameDetections.from_ultralytics(result).offset(x1, y1)
+                 for result, (x1, y1, _, _) in zip(results, rois)]
+
+        self.stats['roi_passes'] += 1
+        self.stats['roi_crops'] += len(crops)
+        self.stats['roi_pixel_ratio'] = sum(crop.shape[0] * crop.shape[1] for crop in crops) / float(
+            frame.shape[0] * frame.shape[1])
+        return FrameDetections.concatenate(parts, self.names)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
@@ -0,0 +1,256 @@
+# core/event_priority.py - NEW FILE
+# Severity-priority lanes for the event saving and GCP upload pipelines
+
+import time
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Lanes in priority order - earlier lanes are always served first
+SEVERITY_LEVELS = ('critical', 'warning', 'info')
+
+# Event type -> severity (single source of truth, also used by DatabaseHandler)
+EVENT_SEVERITY_MAP = {
+    'people_counting': 'info',
+    'ppe_detection': 'warning',
+    'tailgating': 'warning',
+    'intrusion': 'critical',
+    'loitering': 'warning'
+}
+
+
+def get_event_severity(event_type: str) -> str:
+    """Get severity for an event type (accepts flexible '<use_case>_multi' names)"""
+    if event_type in EVENT_SEVERITY_MAP:
+        return EVENT_SEVERITY_MAP[event_type]
+    if event_type and event_type.endswith('_multi'):
+        return EVENT_SEVERITY_MAP.get(event_type[:-len('_multi')], 'info')
+    return 'info'
+
+
+def get_highest_severity(event_types: Iterable[str]) -> str:
+    """Get the most urgent severity across several event types"""
+    ranks = [SEVERITY_LEVELS.index(get_event_severity(event_type)) for event_type in event_types]
+    return SEVERITY_LEVELS[min(ranks)] if ranks else 'info'
+
+
+def severity_rank(severity: str) -> int:
+    """Sort key for severities (critical first, unknown last)"""
+    return SEVERITY_LEVELS.index(severity) if severity in SEVERITY_LEVELS else len(SEVERITY_LEVELS)
+
+
+class SeverityPriorityQueue:
+    """
+    Thread-safe queue with one FIFO lane per severity.
+
+    Drop-in for queue.Queue in the saving/upload workers: get() raises
+    queue.Empty on timeout and task_done()/join() behave the same.
+    Higher lanes are served first; an item in a lower lane that has waited
+    longer than starvation_timeout is served ahead of newer urgent items,
+    but at most every other get() so a starved backlog cannot block
+    critical events.
+    Non-critical lanes can be capped with lane_maxsize: put() on a full lane
+    blocks until the consumer catches up (raising queue.Full on timeout), or
+    with drop_oldest drops that lane's oldest item and hands it to on_drop.
+    Critical items never wait and are never dropped.
+    """
+
+    def __init__(self, starvation_timeout: float = 5.0, lane_maxsize: int = 0, drop_oldest: bool = False,
+                 on_drop: Optional[Callable[[Any, str], None]] = None):
+        self.starvation_timeout = starvation_timeout
+        self.lane_maxsize = lane_maxsize
+        self.drop_oldest = drop_oldest
+        self.on_drop = on_drop  # called (outside the lock) with each dropped item and its severity
+
+        self._lanes = {severity: deque() for severity in SEVERITY_LEVELS}
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+        self._unfinished_tasks = 0
+        self._last_was_promotion = False
+
+        self.stats = {
+            severity: {'enqueued': 0, 'dequeued': 0, 'dropped': 0, 'promoted': 0,
+                       'total_wait': 0.0, 'max_wait': 0.0}
+            for severity in SEVERITY_LEVELS
+        }
+
+    def put(self, item: Any, severity: str = 'info', block: bool = True, timeout: Optional[float] = None):
+        """Add an item to the lane for its severity, waiting for room if the lane is full"""
+        if severity not in self._lanes:
+            severity = 'info'
+
+        dropped = None
+        with self._not_empty:
+            lane = self._lanes[severity]
+            if self.lane_maxsize and severity != 'critical' and len(lane) >= self.lane_maxsize:
+                if self.drop_oldest:
+                    _, dropped = lane.popleft()
+                    self.stats[severity]['dropped'] += 1
+                    self._unfinished_tasks -= 1
+                elif not block:
+                    raise queue.Full
+                elif timeout is None:
+                    while len(lane) >= self.lane_maxsize:
+                        self._not_full.wait()
+                else:
+                    deadline = time.time() + timeout
+                    while len(lane) >= self.lane_maxsize:
+                        remaining = deadline - time.time()
+                        if remaining <= 0.0:
+                            raise queue.Full
+                        self._not_full.wait(remaining)
+
+            lane.append((time.time(), item))
+            self.stats[severity]['enqueued'] += 1
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
+
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped, severity)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the next item by priority"""
+        item, _, _ = self.get_with_info(block, timeout)
+        return item
+
+    def get_with_info(self, block: bool = True, timeout: Optional[float] = None):
+        """Like get() but also returns (severity, seconds waited in queue)"""
+        with self._not_empty:
+            if not block:
+                if not self._qsize():
+                    raise queue.Empty
+            elif timeout is None:
+                while not self._qsize():
+                    self._not_empty.wait()
+            else:
+                deadline = time.time() + timeout
+                while not self._qsize():
+                    remaining = deadline - time.time()
+                    if remaining <= 0.0:
+                        raise queue.Empty
+                    self._not_empty.wait(remaining)
+
+            severity, promoted = self._select_lane()
+            self._last_was_promotion = promoted
+            enqueued_at, item = self._lanes[severity].popleft()
+            self._not_full.notify_all()
+
+            waited = time.time() - enqueued_at
+            lane_stats = self.stats[severity]
+            lane_stats['dequeued'] += 1
+            lane_stats['total_wait'] += waited
+            lane_stats['max_wait'] = max(lane_stats['max_wait'], waited)
+            if promoted:
+                lane_stats['promoted'] += 1
+
+            return item, severity, waited
+
+    def _select_lane(self):
+        """Pick the lane to serve next (caller holds the mutex)"""
+        now = time.time()
+        highest = None
+        starving = None
+
+        for severity in SEVERITY_LEVELS:
+            lane = self._lanes[severity]
+            if not lane:
+                continue
+            if highest is None:
+                highest = severity
+                continue
+            # Starvation protection: oldest starving lower-priority item wins
+            enqueued_at = lane[0][0]
+            if now - enqueued_at >= self.starvation_timeout:
+                if starving is None or enqueued_at < self._lanes[starving][0][0]:
+                    starving = severity
+
+        if starving is not None and not self._last_was_promotion:
+            return starving, True
+        return highest, False
+
+    def task_done(self):
+        """Indicate that a formerly enqueued task is complete"""
+        with self._all_tasks_done:
+            unfinished = self._unfinished_tasks - 1
+            if unfinished < 0:
+                raise ValueError('task_done() called too many times')
+            self._unfinished_tasks = unfinished
+            if unfinished == 0:
+                self._all_tasks_done.notify_all()
+
+    def join(self):
+        """Block until all items have been processed"""
+        with self._all_tasks_done:
+            while self._unfinished_tasks > 0:
+                self._all_tasks_done.wait()
+
+    def _qsize(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def qsize(self) -> int:
+        """Total number of queued items across all lanes"""
+        with self._mutex:
+            return self._qsize()
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def lane_sizes(self) -> Dict[str, int]:
+        """Number of queued items per severity"""
+        with self._mutex:
+            return {severity: len(lane) for severity, lane in self._lanes.items()}
+
+    def get_lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-lane counters and queue wait times"""
+        with self._mutex:
+            result = {}
+            for severity, lane_stats in self.stats.items():
+                dequeued = lane_stats['dequeued']
+                result[severity] = {
+                    'queued': len(self._lanes[severity]),
+                    'enqueued': lane_stats['enqueued'],
+                    'dequeued': dequeued,
+                    'dropped': lane_stats['dropped'],
+                    'promoted': lane_stats['promoted'],
+                    'avg_wait_ms': (lane_stats['total_wait'] / dequeued * 1000) if dequeued else 0.0,
+                    'max_wait_ms': lane_stats['max_wait'] * 1000
+                }
+            return result
+
+
+class SeverityLatencyTracker:
+    """Tracks end-to-end latency (e.g. queued -> persisted) per severity"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {
+            severity: {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0}
+            for severity in SEVERITY_LEVELS
+        }
+
+    def record(self, severity: str, seconds: float):
+        """Record one latency sample for a severity"""
+        if severity not in self._latency:
+            severity = 'info'
+        with self._lock:
+            entry = self._latency[severity]
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['last'] = seconds
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary per severity in milliseconds"""
+        with self._lock:
+            return {
+                severity: {
+                    'count': entry['count'],
+                    'avg_ms': (entry['total'] / entry['count'] * 1000) if entry['count'] else 0.0,
+                    'max_ms': entry['max'] * 1000,
+                    'last_ms': entry['last'] * 1000
+                }
+                for severity, entry in self._latency.items()
+            }
@@ -0,0 +1,346 @@
+# core/event_sinks.py - NEW FILE
+# Pluggable event sinks: where event rows and event snapshots go
+#
+# The processor persists every event through two objects with the
+# DatabaseHandler / GCPUploader interfaces:
+#   event store    - connect, disconnect, save_event, execute_query, ...
+#   snapshot store - save_and_upload_event, test_connection, get_upload_stats, stop
+#
+# EVENT_SINK (or --sink) picks both:
+#   remote  - MySQL + GCS (DatabaseHandler / GCPUploader, the default)
+#   local   - SQLite file + JPEG/JSON files on local disk (edge boxes, no network)
+#   sqlite  - SQLite rows, snapshots only counted
+#   memory  - rows kept in memory, snapshots only counted (benchmarks, tests)
+#   null    - everything discarded (pure analysis throughput)
+# Only 'remote' imports mysql-connector / google-cloud-storage.
+
+import os
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from core.event_priority import get_event_severity
+
+EVENT_SINKS = ('remote', 'local', 'sqlite', 'memory', 'null')
+
+
+class NullEventStore:
+    """Accepts and discards event rows (ids are still issued so listeners see saved events)"""
+
+    def __init__(self):
+        self.events_saved = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        return True
+
+    def disconnect(self):
+        pass
+
+    def execute_query(self, query: str, params: tuple = None) -> Optional[List[Dict]]:
+        return []
+
+    def save_event(self, camera_id, project_id: str, event_type: str, detection_data: Dict[str, Any] = None,
+                   local_path: str = None, gcp_path: str = None, confidence: float = None) -> str:
+        with self._lock:
+            self.events_saved += 1
+        return str(uuid.uuid4())
+
+    def update_processing_stats(self, camera_id, stats: Dict[str, int]):
+        pass
+
+    def get_event_stats(self, camera_id, hours: int = 24) -> Dict[str, Any]:
+        return {'total_events': 0, 'by_type': {}, 'latest_event': None}
+
+
+class InMemoryEventStore(NullEventStore):
+    """Event rows kept in a list (the newest keep_rows of them)"""
+
+    def __init__(self, keep_rows: int = 1000):
+        super().__init__()
+        self.keep_rows = keep_rows
+        self.rows = []
+
+    def save_event(self, camera_id, project_id: str, event_type: str, detection_data: Dict[str, Any] = None,
+                   local_path: str = None, gcp_path: str = None, confidence: float = None) -> str:
+        event_id = str(uuid.uuid4())
+        row = {
+            'event_id': event_id,
+            'camera_id': camera_id,
+            'project_id': project_id,
+            'event_type': event_type,
+            'severity': get_event_severity(event_type),
+            'detection_data': detection_data,
+            'local_image_path': local_path,
+            'gcp_image_path': gcp_path,
+            'confidence_score': confidence,
+            'timestamp': datetime.now()
+        }
+        with self._lock:
+            self.events_saved += 1
+            self.rows.append(row)
+            if len(self.rows) > self.keep_rows:
+                del self.rows[0]
+        return event_id
+
+    def get_event_stats(self, camera_id, hours: int = 24) -> Dict[str, Any]:
+        since = datetime.now() - timedelta(hours=hours)
+        stats = {'total_events': 0, 'by_type': {}, 'latest_event': None}
+        with self._lock:
+            rows = [row for row in self.rows if row['camera_id'] == camera_id and row['timestamp'] >= since]
+        for row in rows:
+            stats['by_type'][row['event_type']] = stats['by_type'].get(row['event_type'], 0) + 1
+            stats['total_events'] += 1
+            stats['latest_event'] = max(stats['latest_event'] or row['timestamp'], row['timestamp'])
+        return stats
+
+
+class SQLiteEventStore:
+    """Event rows in a local SQLite file, same columns as the MySQL events table"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            event_id TEXT PRIMARY KEY,
+            camera_id TEXT,
+            project_id TEXT,
+            event_type TEXT,
+            severity TEXT,
+            detection_data TEXT,
+            local_image_path TEXT,
+            gcp_image_path TEXT,
+            confidence_score REAL,
+            status TEXT DEFAULT 'new',
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_camera_time ON events (camera_id, timestamp);
+        CREATE TABLE IF NOT EXISTS processing_stats (
+            stat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            camera_id TEXT,
+            stats TEXT,
+            timestamp TEXT
+        );
+    """
+
+    def __init__(self, path: str = 'outputs/events.db'):
+        self.path = path
+        self.connection = None
+        self.events_saved = 0
+        self._lock = threading.Lock()  # one connection shared by the event worker and status readers
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self) -> bool:
+        """Open (and create) the database file"""
+        try:
+            if self.connection is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.connection = sqlite3.connect(self.path, check_same_thread=False)
+                self.connection.row_factory = sqlite3.Row
+                self.connection.execute('PRAGMA journal_mode=WAL')
+                self.connection.executescript(self.SCHEMA)
+                self.logger.info(f"SQLite event store opened: {self.path}")
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"SQLite event store error: {e}")
+            return False
+
+    def disconnect(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def execute_query(self, query: str, params: tuple = None) -> Optional[List[Dict]]:
+        """DatabaseHandler-style query (%s placeholders accepted)"""
+        if self.connection is None and not self.connect():
+            return None
+        try:
+            with self._lock:
+                cursor = self.connection.execute(query.replace('%s', '?'), params or ())
+                if query.strip().upper().startswith('SELECT'):
+                    return [dict(row) for row in cursor.fetchall()]
+                self.connection.commit()
+                return [{'affected_rows': cursor.rowcount}]
+        except sqlite3.Error as e:
+            self.logger.error(f"SQLite query error: {e}")
+            return None
+
+    def save_event(self, camera_id, project_id: str, event_type: str, detection_data: Dict[str, Any] = None,
+                   local_path: str = None, gcp_path: str = None, confidence: float = None) -> str:
+        event_id = str(uuid.uuid4())
+        result = self.execute_query(
+            "INSERT INTO events (event_id, camera_id, project_id, event_type, severity, detection_data, "
+            "local_image_path, gcp_image_path, confidence_score, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (event_id, str(camera_id), project_id, event_type, get_event_severity(event_type),
+             json.dumps(detection_data), local_path, gcp_path, confidence, datetime.now().isoformat()))
+        if not result:
+            self.logger.error(f"Failed to save event: {event_type}")
+            return None
+        self.events_saved += 1
+        return event_id
+
+    def update_processing_stats(self, camera_id, stats: Dict[str, int]):
+        self.execute_query("INSERT INTO processing_stats (camera_id, stats, timestamp) VALUES (?, ?, ?)",
+                           (str(camera_id), json.dumps(stats), datetime.now().isoformat()))
+
+    def get_event_stats(self, camera_id, hours: int = 24) -> Dict[str, Any]:
+        since = (datetime.now() - timedelta(hours=hours)).isoformat()
+        rows = self.execute_query(
+            "SELECT event_type, COUNT(*) AS count, MAX(timestamp) AS latest_event FROM events "
+            "WHERE camera_id = ? AND timestamp >= ? GROUP BY event_type ORDER BY count DESC",
+            (str(camera_id), since)) or []
+        stats = {'total_events': 0, 'by_type': {}, 'latest_event': None}
+        for row in rows:
+            stats['by_type'][row['event_type']] = row['count']
+            stats['total_events'] += row['count']
+            stats['latest_event'] = max(stats['latest_event'] or row['latest_event'], row['latest_event'])
+        return stats
+
+
+class NullSnapshotStore:
+    """Counts event snapshots (and their encoded size) without storing them"""
+
+    def __init__(self):
+        self.metrics = None  # MetricsRegistry, set by the processor like on GCPUploader
+        self.stats = {'total_uploads': 0, 'successful_uploads': 0, 'failed_uploads': 0, 'total_size_bytes': 0}
+        self._lock = threading.Lock()
+
+    def save_and_upload_event(self, frame, event_type: str, camera_id, detection_data: Dict[str, Any] = None,
+                              severity: Optional[str] = None, jpeg_bytes: Optional[bytes] = None) -> tuple:
+        self._count(True, len(jpeg_bytes) if jpeg_bytes else 0)
+        return None, None
+
+    def _count(self, success: bool, size: int = 0):
+        with self._lock:
+            self.stats['total_uploads'] += 1
+            self.stats['successful_uploads' if success else 'failed_uploads'] += 1
+            self.stats['total_size_bytes'] += size
+
+    def get_upload_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            'total_uploads': stats['total_uploads'],
+            'successful_uploads': stats['successful_uploads'],
+            'failed_uploads': stats['failed_uploads'],
+            'success_rate': (stats['successful_uploads'] / max(1, stats['total_uploads'])) * 100,
+            'total_size_mb': stats['total_size_bytes'] / (1024 * 1024),
+            'queue_size': 0,
+            'is_connected': True
+        }
+
+    def test_connection(self) -> bool:
+        return True
+
+    def stop(self):
+        pass
+
+
+class InMemorySnapshotStore(NullSnapshotStore):
+    """Like NullSnapshotStore but hands out memory:// paths so rows reference a snapshot"""
+
+    def save_and_upload_event(self, frame, event_type: str, camera_id, detection_data: Dict[str, Any] = None,
+                              severity: Optional[str] = None, jpeg_bytes: Optional[bytes] = None) -> tuple:
+        self._count(True, len(jpeg_bytes) if jpeg_bytes else 0)
+        path = f"memory://{camera_id}/{event_type}/{uuid.uuid4()}.jpg"
+        return path, path
+
+
+class LocalFileSnapshotStore(NullSnapshotStore):
+    """
+    Snapshots as JPEG files (plus a .json with the detection data) under
+    root/<event_type>/<date>/<hour>/ - the layout GCPUploader uses locally,
+    without the upload. Writes happen on the event worker thread.
+    """
+
+    def __init__(self, root: str = 'outputs/frames', jpeg_quality: int = 90):
+        super().__init__()
+        self.root = root
+        self.jpeg_quality = jpeg_quality
+        self.logger = logging.getLogger(__name__)
+
+    def save_and_upload_event(self, frame, event_type: str, camera_id, detection_data: Dict[str, Any] = None,
+                              severity: Optional[str] = None, jpeg_bytes: Optional[bytes] = None) -> tuple:
+        try:
+            timestamp = datetime.now()
+            local_dir = os.path.join(self.root, event_type, timestamp.strftime("%Y-%m-%d"), timestamp.strftime("%H"))
+            os.makedirs(local_dir, exist_ok=True)
+            filename = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_{event_type}"
+            local_path = os.path.join(local_dir, filename + '.jpg')
+
+            if jpeg_bytes is None:
+                from core.frame_preprocessor import encode_jpeg
+                jpeg_bytes = encode_jpeg(frame, 0, self.jpeg_quality)
+            if jpeg_bytes is None:
+                self.logger.error(f"Failed to encode snapshot: {local_path}")
+                self._count(False)
+                return None, None
+
+            with open(local_path, 'wb') as f:
+                f.write(jpeg_bytes)
+            if detection_data:
+                with open(os.path.join(local_dir, filename + '.json'), 'w') as f:
+                    json.dump(detection_data, f, default=str)
+
+            self._count(True, len(jpeg_bytes))
+            return local_path, None
+
+        except Exception as e:
+            self.logger.error(f"Error saving event snapshot: {e}")
+            self._count(False)
+            return None, None
+
+
+def _sink_kind(config, kind: Optional[str]) -> str:
+    kind = (kind or getattr(config, 'EVENT_SINK', 'remote') or 'remote').lower()
+    if kind not in EVENT_SINKS:
+        raise ValueError(f"Unknown event sink '{kind}' (expected one of: {', '.join(EVENT_SINKS)})")
+    return kind
+
+
+def create_event_store(config, kind: Optional[str] = None):
+    """Event row store for the configured sink"""
+    kind = _sink_kind(config, kind)
+    if kind == 'remote':
+        from core.database_handler import DatabaseHandler
+        return DatabaseHandler({
+            'host': config.MYSQL_HOST,
+            'user': config.MYSQL_USER,
+            'password': config.MYSQL_PASSWORD,
+            'database': config.MYSQL_DATABASE,
+            'port': config.MYSQL_PORT
+        })
+    if kind in ('local', 'sqlite'):
+        return SQLiteEventStore(getattr(config, 'LOCAL_EVENT_DB', 'outputs/events.db'))
+    if kind == 'memory':
+        return InMemoryEventStore()
+    return NullEventStore()
+
+
+def create_snapshot_store(config, kind: Optional[str] = None):
+    """Event snapshot store for the configured sink"""
+    kind = _sink_kind(config, kind)
+    if kind == 'remote':
+        from core.gcp_uploader import GCPUploader
+        return GCPUploader(
+            config.GCP_CREDENTIALS_PATH,
+            config.GCP_BUCKET_NAME,
+            config.GCP_PROJECT_ID,
+            starvation_timeout=getattr(config, 'EVENT_STARVATION_TIMEOUT', 5.0)
+        )
+    if kind == 'local':
+        return LocalFileSnapshotStore(getattr(config, 'LOCAL_EVENT_DIR', 'outputs/frames'),
+                                      getattr(config, 'EVENT_JPEG_QUALITY', 90))
+    if kind == 'memory':
+        return InMemorySnapshotStore()
+    return NullSnapshotStore()
+
+
+def create_event_sinks(config, kind: Optional[str] = None) -> Tuple[Any, Any]:
+    """(event store, snapshot store) for the configured sink"""
+    return create_event_store(config, kind), create_snapshot_store(config, kind)
@@ -23,9 +23,23 @@ from camera_models.tailgating_zone_monitoring import TailgatingZoneMonitor
 from camera_models.intrusion_zone_monitoring import IntrusionZoneMonitor
 from camera_models.loitering_zone_monitoring import LoiteringZoneMonitor
 
-from core.database_handler import DatabaseHandler
-from core.gcp_uploader import GCPUploader
+from core.event_sinks import create_event_store, create_snapshot_store
+from core.shared_stream import SharedStreamRegistry
+from core.detection_scheduler import DetectionScheduler
+from core.detectors import YOLODetector, DetectionRequest
+from core.model_registry import ModelRegistry, InferenceProfile
+from core.frame_preprocessor import FramePreprocessor, encode_jpeg
+from core.frame_buffer_pool import FrameBufferPool
+from core.inference_service import take_thread_timings
+from core.metrics import MetricsRegistry, MetricsServer, RollingRates
+from core.counters import ShardedCounters
+from core.cascade_detector import CascadeDetector
+from core.frame_sources import open_frame_source
+from core.detection_recording import DetectionRecorder
+from core.event_priority import (SeverityPriorityQueue, SeverityLatencyTracker,
+                                 get_event_severity, get_highest_severity, severity_rank)
 from ultralytics import YOLO
+from logger import get_logging_stats
 
 # Your existing camera model mapping (unchanged)
 CAMERA_MODEL_MAPPING = {
@@ -39,7 +53,8 @@ CAMERA_MODEL_MAPPING = {
 class FlexibleCameraStream:
     """Camera stream that can run multiple use cases with easy enable/disable"""
     
-    def __init__(self, camera_config: Dict[str, Any], shared_model: YOLO):
+    def __init__(self, camera_config: Dict[str, Any], shared_model: YOLO,
+                 inference_profile: Optional[InferenceProfile] = None):
         self.camera_id = camera_config['camera_id']
         self.camera_name = camera_config['name']
         self.stream_url = camera_config['stream_url']
@@ -50,8 +65,40 @@ class FlexibleCameraStream:
         self.zones_config = camera_config.get('zones', {})
         self.rules_config = camera_config.get('rules', {})
         
-        # Shared YOLO model (memory efficient)
+        # Shared YOLO model (memory efficient) and the camera's weights/imgsz/conf/IoU
         self.shared_model = shared_model
+        self.inference_profile = inference_profile
+        
+        # Detector pass limited to the classes/confidence the enabled use cases need
+        # (and, with roi_inference, to crops around their zones)
+        self.detector = YOLODetector(shared_model, profile=inference_profile)
+        self.preprocessor = FramePreprocessor(imgsz=self.detector.imgsz)
+        
+        # Reusable buffers for own captures and annotation copies; frame_lease covers the current frame
+        self.frame_pool = FrameBufferPool()
+        self.frame_lease = None
+        self.frame_shape = None
+        self.captured_at = None  # wall-clock capture time of the current frame
+        self.media_time = None  # recording time of the current frame (replay:// and detections:// sources)
+        
+        # replay:// recordings and detections:// recordings: every frame in order, own capture, stops at the end
+        self.replay = isinstance(self.stream_url, str) and self.stream_url.startswith(('replay://', 'detections://'))
+        
+        # Optional DetectionRecorder writing what the use cases receive (set by processor)
+        self.detection_recorder = None
+        
+        # Stage latency histograms (the processor swaps in its shared registry)
+        self.metrics = MetricsRegistry()
+        self.roi_inference = camera_config.get('roi_inference')
+        self.detection_request = DetectionRequest.for_use_cases(self.enabled_use_cases, self.rules_config)
+        
+        # Optional shared executor for running enabled models concurrently (set by processor)
+        self.model_executor = None
+        self.parallel_use_cases = camera_config.get('parallel_use_cases')
+        
+        # Optional out-of-process decoding through a shared-memory frame ring (set by processor)
+        self.decoder_process = camera_config.get('decoder_process')
+        self.decoder_options = {}
         
         # Camera-specific model instances - CREATE ALL, ENABLE SELECTIVELY
         self.camera_models = {}
@@ -59,16 +106,30 @@ class FlexibleCameraStream:
         
         self.cap = None
         
+        # Optional SharedStream when other logical cameras use the same URL (set by processor)
+        self.shared_stream = None
+        self.stream_registry = None
+        self.shared_seq = 0
+        self.last_detect_ms = 0.0  # own YOLO pass time, counted in avg_frame_ms
+        
+        # Optional detect-every-k-frames scheduler (tracker prediction in between)
+        self.detection_scheduler = None
+        
         # Processing state
         self.running = False
         self.frame_count = 0
-        self.last_processed_time = 0
+        
+        # Windowed processed/source fps, dropped frames and capture lag (1s/10s/60s)
+        self.rates = RollingRates()
+        self.source_frames = 0  # source frames behind the current frame (1 + frames skipped before it)
+        self.shared_source_count = None
         
         # Statistics per use case
         self.stats = {
             'frames_processed': 0,
             'events_detected_by_use_case': defaultdict(int),
-            'last_fps': 0,
+            'model_timings': {},  # {use_case: {'last_ms', 'avg_ms', 'max_ms', 'count'}}
+            'avg_frame_ms': 0.0,  # detection + all enabled models, moving average
             'connection_status': 'disconnected',
             'enabled_models': []
         }
@@ -80,7 +141,7 @@ class FlexibleCameraStream:
         import logging
         self.logger = logging.getLogger(f'camera_{self.camera_id}')
     
-    def initialize(self, db_handler: DatabaseHandler, gcp_uploader: GCPUploader):
+    def initialize(self, db_handler, gcp_uploader):
         """Initialize camera stream and ALL available models"""
         try:
             self.logger.info(f"Initializing camera {self.camera_id} with flexible use cases")
@@ -97,6 +158,7 @@ class FlexibleCameraStream:
                     settings = {
                         'use_case': use_case,
                         'shared_model': self.shared_model,
+                        'frame_pool': self.frame_pool,
                         'multi_camera_mode': True,
                         'flexible_mode': True
                     }
@@ -126,6 +188,7 @@ class FlexibleCameraStream:
             
             # Update stats
             self.stats['enabled_models'] = [uc for uc in self.enabled_use_cases]
+            self._update_detection_request()
             
             self.logger.info(f"Camera {self.camera_id} initialized with {len(self.camera_models)} models, {len(self.enabled_use_cases)} enabled")
             return True
@@ -143,6 +206,7 @@ class FlexibleCameraStream:
                     if use_case not in self.enabled_use_cases:
                         self.enabled_use_cases.append(use_case)
                     self.stats['enabled_models'] = [uc for uc in self.enabled_use_cases]
+                    self._update_detection_request()
                     self.logger.info(f"✅ ENABLED {use_case} for camera {self.camera_id}")
                     return True
                 else:
@@ -161,6 +225,7 @@ class FlexibleCameraStream:
                     if use_case in self.enabled_use_cases:
                         self.enabled_use_cases.remove(use_case)
                     self.stats['enabled_models'] = [uc for uc in self.enabled_use_cases]
+                    self._update_detection_request()
                     self.logger.info(f"❌ DISABLED {use_case} for camera {self.camera_id}")
                     return True
                 else:
@@ -170,6 +235,15 @@ class FlexibleCameraStream:
             self.logger.error(f"Error disabling {use_case}: {e}")
             return False
     
+    def _update_detection_request(self):
+        """Recompute detector classes/confidence from the enabled use cases (caller holds lock)"""
+        enabled = [uc for uc in self.camera_models if self.model_enabled.get(uc, False)]
+        zones_config = self.zones_config if self.roi_inference else None
+        self.detection_request = DetectionRequest.for_use_cases(enabled, self.rules_config, zones_config)
+        if self.shared_stream is not None:
+            self.shared_stream.set_detection_request(self.camera_id, self.detection_request)
+        self.logger.info(f"Camera {self.camera_id} detector request: {self.detection_request}")
+    
     def get_enabled_use_cases(self) -> List[str]:
         """Get list of currently enabled use cases"""
         with self.lock:
@@ -179,11 +253,90 @@ class FlexibleCameraStream:
         """Get list of all available use cases for this camera"""
         return list(self.camera_models.keys())
     
+    def set_model_executor(self, executor: Optional[ThreadPoolExecutor], parallel_default: bool = False):
+        """Attach the shared executor used to run enabled models concurrently"""
+        self.model_executor = executor
+        if self.parallel_use_cases is None:
+            self.parallel_use_cases = parallel_default
+    
+    def set_decoder_options(self, enabled_default: bool, **options):
+        """Configure decoding in a separate process feeding a SharedFrameRing"""
+        if self.decoder_process is None:
+            self.decoder_process = enabled_default and not self.replay
+        self.decoder_options = options
+    
+    def _run_use_case_model(self, use_case: str, model, frame, frame_time, detection_result):
+        """Run one use-case model on a frame and time it"""
+        start = time.perf_counter()
+        try:
+            _, detections = model.process_frame(frame, frame_time, detection_result)
+        except Exception as e:
+            self.logger.error(f"Error processing {use_case} for camera {self.camera_id}: {e}")
+            detections = None
+        finally:
+            # The annotated copy is not used here - hand its buffer straight back
+            if hasattr(model, 'release_frame_buffers'):
+                model.release_frame_buffers()
+        return use_case, detections, time.perf_counter() - start
+    
+    def _record_model_timing(self, use_case: str, elapsed: float):
+        """Update per-model timing statistics"""
+        elapsed_ms = elapsed * 1000
+        self.metrics.observe('use_case', elapsed_ms, camera=self.camera_id, use_case=use_case)
+        with self.lock:
+            timing = self.stats['model_timings'].get(use_case)
+            if timing is None:
+                timing = {'last_ms': 0.0, 'avg_ms': 0.0, 'max_ms': 0.0, 'count': 0}
+                self.stats['model_timings'][use_case] = timing
+            timing['count'] += 1
+            timing['last_ms'] = elapsed_ms
+            timing['avg_ms'] += (elapsed_ms - timing['avg_ms']) / timing['count']
+            timing['max_ms'] = max(timing['max_ms'], elapsed_ms)
+    
+    def set_shared_stream(self, shared_stream):
+        """Receive frames and detections from a SharedStream instead of an own capture"""
+        self.shared_stream = shared_stream
+        shared_stream.set_detection_request(self.camera_id, self.detection_request)
+        if shared_stream.detection_scheduler is None:
+            shared_stream.detection_scheduler = self.detection_scheduler
+    
+    def set_roi_inference(self, enabled_default: bool, padding: int = 32):
+        """Run the detector only on padded crops around the enabled zones"""
+        if self.roi_inference is None:
+            self.roi_inference = enabled_default
+        self.detector.roi_planner.padding = padding
+        if self.shared_stream is not None:
+            self.shared_stream.detector.roi_planner.padding = padding
+    
+    def set_cascade(self, small_model, **options):
+        """Put a small-model first stage in front of this camera's (or shared stream's) detector"""
+        owner = self.shared_stream if self.shared_stream is not None else self
+        if not isinstance(owner.detector, CascadeDetector):
+            small = YOLODetector(small_model, roi_padding=owner.detector.roi_planner.padding)
+            owner.detector = CascadeDetector(small, owner.detector, **options)
+    
+    def set_detection_scheduler(self, scheduler):
+        """Run the detector only on frames the scheduler selects"""
+        self.detection_scheduler = scheduler if scheduler is not None and scheduler.enabled else None
+    
+    def _open_capture(self):
+        """Open this camera's capture (in-process or decoder process)"""
+        if self.decoder_process:
+            from core.shared_frame_ring import SharedRingCapture
+            return SharedRingCapture(self.stream_url, **self.decoder_options)
+        # synthetic://, file:// and replay:// sources (benchmarks, backfills) stand in for real cameras
+        return open_frame_source(self.stream_url) or cv2.VideoCapture(self.stream_url)
+    
     def connect(self) -> bool:
         """Connect to camera stream"""
         try:
-            self.cap = cv2.VideoCapture(self.stream_url)
-            if self.cap.isOpened():
+            if self.shared_stream is not None:
+                connected = self.shared_stream.subscribe(self.camera_id)
+            else:
+                self.cap = self._open_capture()
+                connected = self.cap.isOpened()
+            
+            if connected:
                 self.stats['connection_status'] = 'connected'
                 self.logger.info(f"Camera {self.camera_id} connected: {self.stream_url}")
                 return True
@@ -198,88 +351,213 @@ class FlexibleCameraStream:
     
     def disconnect(self):
         """Disconnect camera stream"""
-        if self.cap:
+        if self.detection_recorder is not None:
+            self.detection_recorder.close()
+            self.detection_recorder = None
+        if self.shared_stream is not None:
+            if self.stream_registry is not None:
+                self.stream_registry.release(self.shared_stream, self.camera_id)
+            else:
+                self.shared_stream.unsubscribe(self.camera_id)
+            self.stats['connection_status'] = 'disconnected'
+            self.logger.info(f"Camera {self.camera_id} disconnected")
+        elif self.cap:
             self.cap.release()
             self.stats['connection_status'] = 'disconnected'
             self.logger.info(f"Camera {self.camera_id} disconnected")
     
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray], Any]:
+        """
+        Get the next frame and its shared YOLO detections (ok, frame, detection_result).
+        The frame stays valid until release_frame().
+        """
+        self.release_frame()
+        if self.shared_stream is not None:
+            ok, frame, detection_result, self.shared_seq, self.frame_lease = \
+                self.shared_stream.get_frame(self.shared_seq)
+            self.last_detect_ms = self.shared_stream.inference_share_ms()
+            self.captured_at = self.shared_stream.captured_at
+            if ok:
+                # Frames the shared stream read since our last one were dropped for this camera
+                source_count = self.shared_stream.source_frames
+                previous = self.shared_source_count
+                self.source_frames = source_count - previous if previous is not None else 1
+                self.shared_source_count = source_count
+            return ok, frame, detection_result
+        
+        if not self.cap or not self.cap.isOpened():
+            return False, None, None
+        
+        timings = {}
+        if hasattr(self.cap, 'ring'):
+            start = time.perf_counter()
+            previous_seq = self.cap.last_seq
+            ret, frame = self.cap.read()  # zero-copy view into the shared-memory ring
+            timings['grab'] = (time.perf_counter() - start) * 1000
+            self.source_frames = self.cap.last_seq - previous_seq if previous_seq >= 0 else 1
+        else:
+            ret, self.frame_lease = self.frame_pool.read(self.cap, self.frame_shape, timings)
+            frame = self.frame_lease.array if ret else None
+            self.source_frames = 1
+        if not ret:
+            return False, None, None
+        self.frame_shape = frame.shape
+        self.captured_at = getattr(self.cap, 'last_timestamp', None) or time.time()
+        self.media_time = getattr(self.cap, 'media_timestamp', None)
+        
+        # detections:// recordings carry the boxes - no detector pass
+        recorded = getattr(self.cap, 'recorded_detections', None)
+        if recorded is not None:
+            self.last_detect_ms = 0.0
+            return True, frame, recorded
+        
+        # Run YOLO detection ONCE (shared across all models), or predict boxes on skipped frames
+        detect_start = time.perf_counter()
+        prepared = self.preprocessor.prepare(frame)
+        take_thread_timings()
+        if self.detection_scheduler is not None:
+            detection_result, detected = self.detection_scheduler.run(prepared, self.detect)
+        else:
+            detection_result, detected = self.detect(prepared), True
+        self.last_detect_ms = (time.perf_counter() - detect_start) * 1000
+        
+        wait_ms, compute_ms = take_thread_timings()
+        for stage, value in timings.items():
+            self.metrics.observe(stage, value, camera=self.camera_id)
+        self.metrics.observe('preprocess', prepared.preprocess_ms, camera=self.camera_id)
+        if detected:
+            self.metrics.observe('inference_wait', wait_ms, camera=self.camera_id)
+            self.metrics.observe('inference', compute_ms, camera=self.camera_id)
+        self.metrics.observe('detect', self.last_detect_ms, camera=self.camera_id)
+        return True, prepared.full, detection_result
+    
+    def detect(self, frame):
+        """Run the shared YOLO model on a frame or PreparedFrame (only the classes enabled use cases need)"""
+        return self.detector.detect(frame, self.detection_request)
+    
+    def release_frame(self):
+        """Return the current capture buffer to its pool"""
+        if self.frame_lease is not None:
+            self.frame_lease.release()
+            self.frame_lease = None
+    
+    def release_result(self, result: Dict[str, Any]):
+        """Return the annotation buffer of a processed result once nobody needs it"""
+        lease = result.pop('annotated_lease', None)
+        if lease is not None:
+            lease.release()
+    
     def process_frame(self) -> Tuple[bool, Optional[Dict]]:
         """Process frame with ALL ENABLED use cases"""
         try:
-            if not self.cap or not self.cap.isOpened():
+            ok, frame, detection_result = self.read_frame()
+            if not ok:
+                if not self.finished:
+                    self.logger.warning(f"Failed to read frame from camera {self.camera_id}")
                 return False, None
             
-            ret, frame = self.cap.read()
-            if not ret:
-                self.logger.warning(f"Failed to read frame from camera {self.camera_id}")
-                return False, None
-            
-            self.frame_count += 1
-            
-            # Run YOLO detection ONCE (shared across all models)
-            detection_result = self.shared_model(frame, verbose=False)
-            
-            # Process with ALL ENABLED camera models
-            all_events = {}
-            annotated_frame = frame.copy()
-            total_events = 0
-            
-            with self.lock:
-                enabled_models = {uc: model for uc, model in self.camera_models.items() 
-                                if self.model_enabled.get(uc, False)}
-            
-            for use_case, model in enabled_models.items():
-                try:
-                    # Process with this specific model
-                    model_frame, detections = model.process_frame(
-                        frame, 
-                        datetime.now(),
-                        detection_result
-                    )
-                    
-                    # Collect events from this use case
-                    if detections:
-                        all_events[use_case] = detections
-                        detection_count = len(detections) if isinstance(detections, list) else 1
-                        total_events += detection_count
-                        self.stats['events_detected_by_use_case'][use_case] += detection_count
-                    
-                    # For visualization, you could overlay all annotations
-                    # but it might be messy with multiple models
-                    # annotated_frame = cv2.addWeighted(annotated_frame, 0.8, model_frame, 0.2, 0)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing {use_case} for camera {self.camera_id}: {e}")
-            
-            # Add info overlay showing which models are running
-            self._add_status_overlay(annotated_frame, enabled_models.keys(), total_events)
+            result = self.analyze(frame, detection_result)
             
-            # Update statistics
-            with self.lock:
-                self.stats['frames_processed'] += 1
-                current_time = time.time()
-                if current_time - self.last_processed_time > 0:
-                    self.stats['last_fps'] = 1.0 / (current_time - self.last_processed_time)
-                self.last_processed_time = current_time
-            
-            # Return processing result
-            result = {
-                'camera_id': self.camera_id,
-                'camera_name': self.camera_name,
-                'enabled_use_cases': list(enabled_models.keys()),
-                'frame_count': self.frame_count,
-                'annotated_frame': annotated_frame,
-                'all_events': all_events,  # Events from ALL enabled use cases
-                'total_events': total_events,
-                'timestamp': datetime.now(),
-                'has_events': bool(all_events)
-            }
+            # Uncopied shared-memory ring frame overwritten while in use: drop what was computed from it
+            source = self.shared_stream.cap if self.shared_stream is not None else self.cap
+            if self.frame_lease is None and hasattr(source, 'frame_valid') and not source.frame_valid():
+                self.logger.warning(f"Camera {self.camera_id} frame was overwritten during processing, dropped")
+                self.release_result(result)
+                return False, None
             
+            if self.detection_recorder is not None:
+                self.detection_recorder.record(self.media_time or self.captured_at or time.time(),
+                                               detection_result, frame.shape)
             return True, result
             
         except Exception as e:
             self.logger.error(f"Frame processing error for camera {self.camera_id}: {e}")
             return False, None
+        finally:
+            self.release_frame()
+    
+    @property
+    def finished(self) -> bool:
+        """A replay source has served its last frame"""
+        return self.replay and getattr(self.cap, 'finished', False)
+    
+    def analyze(self, frame, detection_result) -> Dict[str, Any]:
+        """Run every enabled use-case model on a frame and its shared detections"""
+        self.frame_count += 1
+        frame_start = time.perf_counter()
+        
+        # Process with ALL ENABLED camera models
+        all_events = {}
+        annotation_start = time.perf_counter()
+        annotated_lease = self.frame_pool.copy(frame)
+        annotated_frame = annotated_lease.array
+        annotation_ms = (time.perf_counter() - annotation_start) * 1000
+        total_events = 0
+        
+        with self.lock:
+            enabled_models = {uc: model for uc, model in self.camera_models.items() 
+                            if self.model_enabled.get(uc, False)}
+        
+        # Recording time on replays, so dwell/interval rules see the footage's own timing
+        frame_time = datetime.fromtimestamp(self.media_time) if self.media_time is not None else datetime.now()
+        
+        # Models only read the frame and shared detections, so they can run concurrently.
+        # Results are joined before returning, so each model still sees frames in order.
+        if self.model_executor is not None and self.parallel_use_cases and len(enabled_models) > 1:
+            futures = [
+                self.model_executor.submit(self._run_use_case_model, use_case, model,
+                                           frame, frame_time, detection_result)
+                for use_case, model in enabled_models.items()
+            ]
+            model_outputs = [future.result() for future in futures]
+        else:
+            model_outputs = [
+                self._run_use_case_model(use_case, model, frame, frame_time, detection_result)
+                for use_case, model in enabled_models.items()
+            ]
+        
+        for use_case, detections, elapsed in model_outputs:
+            self._record_model_timing(use_case, elapsed)
+            
+            # Collect events from this use case
+            if detections:
+                all_events[use_case] = detections
+                detection_count = len(detections) if isinstance(detections, list) else 1
+                total_events += detection_count
+                self.stats['events_detected_by_use_case'][use_case] += detection_count
+        
+        # Add info overlay showing which models are running
+        annotation_start = time.perf_counter()
+        self._add_status_overlay(annotated_frame, enabled_models.keys(), total_events)
+        annotation_ms += (time.perf_counter() - annotation_start) * 1000
+        self.metrics.observe('annotation', annotation_ms, camera=self.camera_id)
+        
+        # Update statistics
+        analyze_ms = (time.perf_counter() - frame_start) * 1000
+        self.metrics.observe('frame', analyze_ms, camera=self.camera_id)
+        with self.lock:
+            self.stats['frames_processed'] += 1
+            frame_ms = analyze_ms + self.last_detect_ms
+            self.stats['avg_frame_ms'] += (frame_ms - self.stats['avg_frame_ms']) * 0.1
+        
+        current_time = time.time()
+        lag_ms = (current_time - self.captured_at) * 1000 if self.captured_at else None
+        self.rates.record(1, self.source_frames, lag_ms, current_time)
+        
+        # Return processing result
+        return {
+            'camera_id': self.camera_id,
+            'camera_name': self.camera_name,
+            'enabled_use_cases': list(enabled_models.keys()),
+            'frame_count': self.frame_count,
+            'annotated_frame': annotated_frame,
+            'annotated_lease': annotated_lease,  # released by whoever consumes the result last
+            'all_events': all_events,  # Events from ALL enabled use cases
+            'total_events': total_events,
+            'timestamp': frame_time if self.media_time is not None else datetime.now(),
+            'captured_at': self.captured_at or time.time(),
+            'has_events': bool(all_events)
+        }
     
     def _add_status_overlay(self, frame, enabled_use_cases, total_events):
         """Add status overlay showing which models are running"""
@@ -297,6 +575,7 @@ class FlexibleCameraStream:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get camera statistics"""
+        rates = self.rates.summary()
         with self.lock:
             return {
                 'camera_id': self.camera_id,
@@ -307,8 +586,19 @@ class FlexibleCameraStream:
                 'frames_processed': self.stats['frames_processed'],
                 'events_by_use_case': dict(self.stats['events_detected_by_use_case']),
                 'total_events': sum(self.stats['events_detected_by_use_case'].values()),
-                'current_fps': self.stats['last_fps'],
-                'frame_count': self.frame_count
+                'model_timings': {uc: dict(timing) for uc, timing in self.stats['model_timings'].items()},
+                'avg_frame_ms': self.stats['avg_frame_ms'],
+                'current_fps': rates['10s']['processed_fps'],
+                'rates': rates,
+                'frame_count': self.frame_count,
+                'decoder': self.cap.get_stats() if hasattr(self.cap, 'get_stats') else None,
+                'preprocessing': (self.shared_stream or self).preprocessor.get_stats(),
+                'frame_pool': self.frame_pool.get_stats(),
+                'latency': self.metrics.snapshot(camera=self.camera_id),
+                'shared_stream': self.shared_stream.label if self.shared_stream is not None else None,
+                'detection_scheduler': self.detection_scheduler.get_stats() if self.detection_scheduler else None,
+                'detector': (self.shared_stream or self).detector.get_stats(),
+                'inference_profile': self.inference_profile.to_dict() if self.inference_profile else None
             }
 
 
@@ -317,66 +607,217 @@ class FlexibleMultiCameraProcessor:
     Flexible multi-camera processor with dynamic use case enable/disable
     """
     
-    def __init__(self, config):
+    def __init__(self, config, db_handler=None, gcp_uploader=None, model_factory=None):
+        """
+        db_handler / gcp_uploader replace the EVENT_SINK event store / snapshot store
+        (see core/event_sinks.py); model_factory replaces YOLO loading (benchmarks)
+        """
         self.config = config
         
         # Setup logging
         import logging
         self.logger = logging.getLogger(__name__)
         
-        # Initialize shared components (reuse your existing code)
-        self.db_handler = DatabaseHandler({
-            'host': config.MYSQL_HOST,
-            'user': config.MYSQL_USER,
-            'password': config.MYSQL_PASSWORD,
-            'database': config.MYSQL_DATABASE,
-            'port': config.MYSQL_PORT
-        })
-        
-        self.gcp_uploader = GCPUploader(
-            config.GCP_CREDENTIALS_PATH,
-            config.GCP_BUCKET_NAME,
-            config.GCP_PROJECT_ID
-        )
+        # Event sinks - MySQL + GCS by default, local/in-memory/null with EVENT_SINK
+        self.event_sink = getattr(config, 'EVENT_SINK', 'remote')
+        self.db_handler = db_handler or create_event_store(config)
+        self.gcp_uploader = gcp_uploader or create_snapshot_store(config)
         
-        # Load shared YOLO model (memory efficient - one model for all cameras)
-        self.shared_model = YOLO(config.DETECTION_MODEL_PATH)
+        # Load shared YOLO models (memory efficient - one instance per distinct weight file)
+        # (optionally exported to ONNX Runtime / OpenVINO for CPU-only servers)
+        self.model_registry = ModelRegistry(
+            model_factory=model_factory,
+            backend=getattr(config, 'INFERENCE_BACKEND', 'pytorch'),
+            int8=getattr(config, 'INFERENCE_INT8', False),
+            cache_dir=getattr(config, 'EXPORTED_MODEL_DIR', 'models/exported'),
+            calibration_dir=getattr(config, 'FRAMES_OUTPUT_DIR', 'outputs/frames'),
+            replicas=getattr(config, 'INFERENCE_REPLICAS', 1),
+            max_queue=getattr(config, 'INFERENCE_QUEUE_SIZE', 0)
+        )
+        self.shared_model = self.model_registry.get(config.DETECTION_MODEL_PATH)
         self.logger.info(f"Loaded shared YOLO model: {config.DETECTION_MODEL_PATH}")
         
         # Flexible camera streams
         self.camera_streams = {}  # {camera_id: FlexibleCameraStream}
         self.camera_configs = []
         
+        # One capture + detection pass per physical stream URL
+        # Stage latency histograms shared by all cameras, served on METRICS_PORT (0 = off)
+        self.metrics = MetricsRegistry()
+        self.metrics_port = getattr(config, 'METRICS_PORT', 0)
+        self.metrics_server = None
+        self.gcp_uploader.metrics = self.metrics
+        
+        self.stream_registry = SharedStreamRegistry(self.shared_model, self.metrics)
+        
         # Processing control
         self.running = False
         self.processing_threads = {}
-        self.event_queue = queue.Queue()
-        
-        # Statistics
-        self.global_stats = {
-            'total_cameras': 0,
-            'active_cameras': 0,
-            'total_events': 0,
-            'events_by_camera': defaultdict(int),
-            'events_by_use_case': defaultdict(int)
-        }
+        self.events_running = False  # the event worker keeps saving until stop() has joined the cameras
+        self.event_worker = None
+        
+        # Shared, bounded pool for running use-case models of a frame concurrently
+        self.parallel_use_cases = getattr(config, 'PARALLEL_USE_CASE_MODELS', False)
+        self.model_executor = None
+        
+        # Severity lanes: critical events are persisted ahead of info/warning backlog.
+        # A full lane makes the camera wait (backpressure) unless EVENT_QUEUE_DROP_OLDEST
+        self.event_queue = SeverityPriorityQueue(
+            starvation_timeout=getattr(config, 'EVENT_STARVATION_TIMEOUT', 5.0),
+            lane_maxsize=getattr(config, 'EVENT_QUEUE_SIZE', 0),
+            drop_oldest=getattr(config, 'EVENT_QUEUE_DROP_OLDEST', False),
+            on_drop=self._on_event_dropped
+        )
+        self.persist_latency = SeverityLatencyTracker()
+        queue_size = getattr(config, 'EVENT_QUEUE_SIZE', 0)
+        self.replay_event_backlog = max(1, queue_size // 2) if queue_size else 50
+        
+        # Optional callback receiving a summary of every persisted event (used by shard workers)
+        self.event_listener = None
+        
+        # Statistics: per-worker counter shards merged into snapshots on read
+        self.counters = ShardedCounters()
     
     def load_camera_configurations(self, camera_configs: List[Dict[str, Any]]):
         """Load flexible camera configurations"""
-        self.camera_configs = camera_configs
-        self.global_stats['total_cameras'] = len(camera_configs)
+        self.camera_configs = list(camera_configs)
+        self.counters.set_gauge('total_cameras', len(camera_configs))
         
         self.logger.info(f"Loaded {len(camera_configs)} flexible camera configurations")
         
         # Create flexible camera stream instances
         for config in camera_configs:
-            camera_stream = FlexibleCameraStream(config, self.shared_model)
-            self.camera_streams[config['camera_id']] = camera_stream
+            self.camera_streams[config['camera_id']] = self._create_camera_stream(config)
             
             enabled_count = len(config.get('enabled_use_cases', []))
             available_count = len(config.get('available_use_cases', []))
             
-            self.logger.info(f"Camera {config['camera_id']}: {config['name']} -> {enabled_count}/{available_count} use cases enabled")
+            self.logger.info(f"Camera {config['camera_id']}: {config['name']} -> {enabled_count}/{available_count} use cases enabled", extra={'camera_id': config['camera_id']})
+    
+    def _create_camera_stream(self, config: Dict[str, Any]) -> FlexibleCameraStream:
+        """Create a camera stream wired to the processor's shared resources"""
+        profile = InferenceProfile.from_camera_config(config, self.config)
+        model = self.model_registry.get(profile.weights, profile.imgsz)
+        camera_stream = FlexibleCameraStream(config, model, profile)
+        camera_stream.metrics = self.metrics
+        self.logger.info(f"Camera {config['camera_id']} inference profile: {profile}", extra={'camera_id': config['camera_id']})
+        camera_stream.set_detection_scheduler(DetectionScheduler.from_camera_config(config, self.config))
+        
+        if self.parallel_use_cases or config.get('parallel_use_cases'):
+            camera_stream.set_model_executor(self._get_model_executor(), self.parallel_use_cases)
+        
+        camera_stream.set_decoder_options(
+            getattr(self.config, 'DECODER_PROCESSES', False),
+            num_slots=getattr(self.config, 'FRAME_RING_SLOTS', 4),
+            max_height=getattr(self.config, 'FRAME_RING_MAX_HEIGHT', 1080),
+            max_width=getattr(self.config, 'FRAME_RING_MAX_WIDTH', 1920),
+            open_timeout=getattr(self.config, 'CAMERA_CONNECTION_TIMEOUT', 10)
+        )
+        
+        # Logical cameras on the same physical stream share one capture and one YOLO pass
+        # (not replays - a shared stream serves the latest frame and would skip some)
+        if config.get('share_stream', getattr(self.config, 'SHARE_IDENTICAL_STREAMS', True)) and not camera_stream.replay:
+            camera_stream.set_shared_stream(
+                self.stream_registry.get_stream(camera_stream.stream_url, camera_stream._open_capture,
+                                                model=model, profile=profile))
+            camera_stream.stream_registry = self.stream_registry
+        
+        # Record what the use cases receive, for model-free replays (detections:// URLs)
+        record_dir = config.get('record_detections', getattr(self.config, 'RECORD_DETECTIONS_DIR', ''))
+        if record_dir and not str(camera_stream.stream_url).startswith('detections://'):
+            camera_stream.detection_recorder = DetectionRecorder(
+                os.path.join(record_dir, str(config['camera_id'])), config['camera_id'],
+                chunk_frames=getattr(self.config, 'RECORD_DETECTIONS_CHUNK', 1024))
+        
+        camera_stream.set_roi_inference(getattr(self.config, 'ROI_INFERENCE', False),
+                                        padding=getattr(self.config, 'ROI_PADDING', 32))
+        
+        if config.get('cascade', getattr(self.config, 'CASCADE_MODE', False)):
+            camera_stream.set_cascade(
+                self.model_registry.get(getattr(self.config, 'CASCADE_SMALL_MODEL_PATH', 'models/yolo11n.pt')),
+                candidate_confidence=getattr(self.config, 'CASCADE_CANDIDATE_CONFIDENCE', 0.15),
+                accept_confidence=getattr(self.config, 'CASCADE_ACCEPT_CONFIDENCE', 0.6),
+                calibration_interval=getattr(self.config, 'CASCADE_CALIBRATION_INTERVAL', 100)
+            )
+        return camera_stream
+    
+    def _start_camera_worker(self, camera_id: str):
+        """Start the processing thread for one camera"""
+        self.camera_streams[camera_id].running = True
+        worker_thread = threading.Thread(
+            target=self._camera_processing_worker, 
+            args=(camera_id,),
+            daemon=True
+        )
+        worker_thread.start()
+        self.processing_threads[camera_id] = worker_thread
+    
+    def add_camera(self, config: Dict[str, Any]) -> bool:
+        """Add a camera while processing is running (e.g. after claiming its lease)"""
+        camera_id = config['camera_id']
+        if camera_id in self.camera_streams:
+            return True
+        
+        camera_stream = self._create_camera_stream(config)
+        if not camera_stream.initialize(self.db_handler, self.gcp_uploader):
+            self.logger.error(f"Camera {camera_id} failed to initialize")
+            return False
+        if not camera_stream.connect():
+            self.logger.error(f"Camera {camera_id} failed to connect")
+            return False
+        
+        self.camera_streams[camera_id] = camera_stream
+        self.camera_configs.append(config)
+        self.counters.adjust_gauge('total_cameras', 1)
+        self.counters.adjust_gauge('active_cameras', 1)
+        
+        if self.running:
+            self._start_camera_worker(camera_id)
+        
+        self.logger.info(f"Camera {camera_id} added at runtime", extra={'camera_id': camera_id})
+        return True
+    
+    def remove_camera(self, camera_id: str, timeout: float = 5.0) -> bool:
+        """Stop and remove a camera while processing is running"""
+        camera_stream = self.camera_streams.get(camera_id)
+        if camera_stream is None:
+            return False
+        
+        camera_stream.running = False
+        thread = self.processing_threads.pop(camera_id, None)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        else:
+            camera_stream.disconnect()
+        
+        del self.camera_streams[camera_id]
+        self.camera_configs = [c for c in self.camera_configs if c['camera_id'] != camera_id]
+        self.counters.adjust_gauge('total_cameras', -1)
+        self.counters.adjust_gauge('active_cameras', -1)
+        
+        self.logger.info(f"Camera {camera_id} removed at runtime", extra={'camera_id': camera_id})
+        return True
+    
+    def wait_for_replays(self, timeout: Optional[float] = None) -> bool:
+        """Block until every replay:// camera has processed its last frame (True if all did)"""
+        deadline = time.time() + timeout if timeout is not None else None
+        for camera_id, camera_stream in list(self.camera_streams.items()):
+            thread = self.processing_threads.get(camera_id)
+            if not camera_stream.replay or thread is None:
+                continue
+            thread.join(None if deadline is None else max(0.0, deadline - time.time()))
+            if thread.is_alive():
+                return False
+        return True
+    
+    def _get_model_executor(self) -> ThreadPoolExecutor:
+        """Create the shared use-case model executor on first use"""
+        if self.model_executor is None:
+            max_workers = getattr(self.config, 'USE_CASE_WORKER_THREADS', 8)
+            self.model_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                     thread_name_prefix='use_case_model')
+            self.logger.info(f"Parallel use-case execution enabled ({max_workers} worker threads)")
+        return self.model_executor
     
     def enable_use_case_for_camera(self, camera_id: str, use_case: str) -> bool:
         """Enable a specific use case for a specific camera"""
@@ -396,37 +837,78 @@ class FlexibleMultiCameraProcessor:
             return self.camera_streams[camera_id].get_stats()
         return None
     
-    def get_all_camera_status(self) -> Dict[str, Dict]:
-        """Get status of all cameras"""
+    def get_global_stats(self, max_age: float = 0.0) -> Dict[str, Any]:
+        """Global counters as plain dicts, merged from the worker shards"""
+        snapshot = self.counters.snapshot(max_age)
+        return {
+            'total_cameras': snapshot.gauge('total_cameras'),
+            'active_cameras': snapshot.gauge('active_cameras'),
+            'total_events': snapshot.total('events'),
+            'frames_processed': snapshot.total('frames'),
+            'events_by_camera': snapshot.by_label('events'),
+            'events_by_use_case': snapshot.by_label('use_case_events_total')
+        }
+    
+    def get_all_camera_status(self, max_age: float = 1.0) -> Dict[str, Dict]:
+        """Lightweight status of all cameras from a (possibly cached) counters snapshot"""
+        snapshot = self.counters.snapshot(max_age)
         status = {}
-        for camera_id, camera_stream in self.camera_streams.items():
-            status[camera_id] = camera_stream.get_stats()
+        for camera_id, camera_stream in list(self.camera_streams.items()):
+            rates = camera_stream.rates.summary()
+            status[camera_id] = {
+                'camera_id': camera_id,
+                'camera_name': camera_stream.camera_name,
+                'connection_status': camera_stream.stats['connection_status'],
+                'enabled_use_cases': list(camera_stream.enabled_use_cases),
+                'frames_processed': snapshot.get('frames', camera_id),
+                'total_events': snapshot.get('events', camera_id),
+                'events_by_use_case': snapshot.by_label('use_case_events', prefix=camera_id),
+                'current_fps': rates['10s']['processed_fps'],
+                'rates': rates,
+                'model_timings': {uc: dict(timing) for uc, timing in list(camera_stream.stats['model_timings'].items())}
+            }
         return status
     
     def _camera_processing_worker(self, camera_id: str):
         """Worker thread for processing individual camera"""
         camera_stream = self.camera_streams[camera_id]
-        self.logger.info(f"Started flexible processing worker for camera {camera_id}")
+        counters = self.counters.shard()  # owned by this thread - updates need no lock
+        self.logger.info(f"Started flexible processing worker for camera {camera_id}", extra={'camera_id': camera_id})
         
-        while self.running:
+        while self.running and camera_stream.running:
             try:
                 # Process frame
                 success, result = camera_stream.process_frame()
+                if success:
+                    counters.add('frames', 1, camera_id)
+                elif camera_stream.finished:
+                    self.logger.info(f"Camera {camera_id} replay finished after {camera_stream.frame_count} frames", extra={'camera_id': camera_id})
+                    break
                 
                 if success and result and result['has_events']:
-                    # Queue events for saving
-                    self.event_queue.put(result)
+                    # Replays run faster than events persist - wait instead of dropping queued events
+                    while camera_stream.replay and self.running and self.event_queue.qsize() >= self.replay_event_backlog:
+                        time.sleep(0.005)
                     
-                    # Update global statistics
-                    self.global_stats['total_events'] += result['total_events']
-                    self.global_stats['events_by_camera'][camera_id] += result['total_events']
+                    # Queue events for saving in the lane of their most urgent use case
+                    result['severity'] = get_highest_severity(result['all_events'].keys())
+                    result['queued_at'] = time.time()
+                    if not self._queue_event(result):
+                        camera_stream.release_result(result)
+                        continue
                     
+                    # Update global statistics
+                    counters.add('events', result['total_events'], camera_id)
                     for use_case in result['enabled_use_cases']:
                         if use_case in result['all_events']:
-                            self.global_stats['events_by_use_case'][use_case] += 1
+                            counters.add('use_case_events_total', 1, use_case)
+                            counters.add('use_case_events', 1, (camera_id, use_case))
+                elif result is not None:
+                    camera_stream.release_result(result)
                 
-                # Small delay to prevent CPU overload
-                time.sleep(0.01)
+                # Small delay to prevent CPU overload (replays run flat out)
+                if not camera_stream.replay:
+                    time.sleep(0.01)
                 
             except Exception as e:
                 self.logger.error(f"Error in camera {camera_id} worker: {e}")
@@ -434,7 +916,8 @@ class FlexibleMultiCameraProcessor:
         
         # Cleanup
         camera_stream.disconnect()
-        self.logger.info(f"Stopped flexible processing worker for camera {camera_id}")
+        self.counters.retire(counters)
+        self.logger.info(f"Stopped flexible processing worker for camera {camera_id}", extra={'camera_id': camera_id})
     
     def _save_camera_event(self, result: Dict[str, Any]):
         """Save camera events from all enabled use cases"""
@@ -444,8 +927,18 @@ class FlexibleMultiCameraProcessor:
             annotated_frame = result['annotated_frame']
             all_events = result['all_events']
             
-            # Save events for each use case that generated events
-            for use_case, events in all_events.items():
+            # Encode the snapshot once for all use cases that fired on this frame
+            with self.metrics.timer('encode', camera=camera_id):
+                jpeg_bytes = encode_jpeg(annotated_frame, getattr(self.config, 'EVENT_FRAME_MAX_WIDTH', 0),
+                                         getattr(self.config, 'EVENT_JPEG_QUALITY', 90))
+            
+            # Save events for each use case that generated events - most severe first
+            ordered_events = sorted(all_events.items(),
+                                    key=lambda item: severity_rank(get_event_severity(item[0])))
+            
+            for use_case, events in ordered_events:
+                severity = get_event_severity(use_case)
+                
                 # Make data JSON serializable
                 json_safe_data = self._make_json_serializable({
                     'camera_id': camera_id,
@@ -462,56 +955,134 @@ class FlexibleMultiCameraProcessor:
                     annotated_frame,
                     f"{use_case}_multi",  # Distinguish from single-use case events
                     camera_id,
-                    json_safe_data
+                    json_safe_data,
+                    severity=severity,
+                    jpeg_bytes=jpeg_bytes
                 )
                 
                 # Save to database
-                event_id = self.db_handler.save_event(
-                    camera_id=camera_id,
-                    project_id='flexible-multi-camera-project',
-                    event_type=use_case,
-                    detection_data=json_safe_data,
-                    local_path=local_path,
-                    gcp_path=gcp_path,
-                    confidence=0.75
-                )
+                with self.metrics.timer('db_write', camera=camera_id):
+                    event_id = self.db_handler.save_event(
+                        camera_id=camera_id,
+                        project_id='flexible-multi-camera-project',
+                        event_type=use_case,
+                        detection_data=json_safe_data,
+                        local_path=local_path,
+                        gcp_path=gcp_path,
+                        confidence=0.75
+                    )
+                if event_id and result.get('captured_at'):
+                    self.metrics.observe('capture_to_persisted', (time.time() - result['captured_at']) * 1000,
+                                         camera=camera_id, use_case=use_case)
                 
                 if event_id:
-                    self.logger.info(f"Event saved: Camera {camera_id} -> {use_case} -> {event_id}")
+                    self.logger.info(f"Event saved: Camera {camera_id} -> {use_case} -> {event_id}", extra={'camera_id': camera_id})
+                
+                if self.event_listener is not None:
+                    self.event_listener({
+                        'camera_id': camera_id,
+                        'use_case': use_case,
+                        'severity': severity,
+                        'event_id': event_id,
+                        'event_count': len(events) if isinstance(events, list) else 1,
+                        'timestamp': result['timestamp'].isoformat(),
+                        'frame_count': result['frame_count']
+                    })
             
         except Exception as e:
             self.logger.error(f"Error saving camera events: {e}")
+        finally:
+            lease = result.pop('annotated_lease', None)
+            if lease is not None:
+                lease.release()
+    
+    def _queue_event(self, result: Dict[str, Any]) -> bool:
+        """Queue a result for saving, waiting while its lane is full (False if stopped meanwhile)"""
+        while True:
+            try:
+                self.event_queue.put(result, result['severity'], timeout=0.5)
+                return True
+            except queue.Full:
+                if not self.running:
+                    self.logger.warning(f"Event queue full at shutdown, discarding event from camera {result['camera_id']}")
+                    return False
+    
+    def _discard_pending_events(self):
+        """Release results nobody will save (queued by a camera worker that outlived stop())"""
+        discarded = 0
+        while True:
+            try:
+                result = self.event_queue.get(block=False)
+            except queue.Empty:
+                break
+            lease = result.pop('annotated_lease', None)
+            if lease is not None:
+                lease.release()
+            self.event_queue.task_done()
+            discarded += 1
+        if discarded:
+            self.logger.warning(f"Discarded {discarded} unsaved events at shutdown")
+    
+    def _on_event_dropped(self, result: Dict[str, Any], severity: str):
+        """EVENT_QUEUE_DROP_OLDEST: a full lane discarded its oldest result"""
+        self.logger.warning(f"Event queue {severity} lane full, dropped oldest event from camera {result['camera_id']}")
+        lease = result.pop('annotated_lease', None)
+        if lease is not None:
+            lease.release()
     
     def _print_global_stats(self):
         """Print global statistics with flexible use case info"""
         print("\n" + "="*80)
         print(f" FLEXIBLE MULTI-CAMERA PROCESSING STATS")
         print("="*80)
-        print(f" Active cameras: {self.global_stats['active_cameras']}/{self.global_stats['total_cameras']}")
-        print(f" Total events: {self.global_stats['total_events']}")
-        print(f" Pending events: {self.event_queue.qsize()}")
+        global_stats = self.get_global_stats()
+        camera_status = self.get_all_camera_status(max_age=0)
+        print(f" Active cameras: {global_stats['active_cameras']}/{global_stats['total_cameras']}")
+        print(f" Total events: {global_stats['total_events']}")
+        print(f" Pending events: {self.event_queue.qsize()} {self.event_queue.lane_sizes()}")
+        
+        critical_latency = self.persist_latency.get_stats()['critical']
+        if critical_latency['count']:
+            print(f" Critical persist latency: avg {critical_latency['avg_ms']:.0f}ms | "
+                  f"max {critical_latency['max_ms']:.0f}ms | last {critical_latency['last_ms']:.0f}ms")
         
         print("\n Camera Status:")
-        for camera_id, camera_stream in self.camera_streams.items():
-            stats = camera_stream.get_stats()
+        for camera_id, stats in camera_status.items():
             enabled_models = ", ".join([uc.replace('_', ' ').title() for uc in stats['enabled_use_cases']])
-            print(f"   {camera_id}: {stats['connection_status']} | FPS: {stats['current_fps']:.1f}")
+            rates = stats['rates']['10s']
+            lag = stats['rates']['current_lag_ms']
+            print(f"   {camera_id}: {stats['connection_status']} | FPS: {rates['processed_fps']:.1f}"
+                  f"/{rates['source_fps']:.1f} source (1s {stats['rates']['1s']['processed_fps']:.1f}, "
+                  f"60s {stats['rates']['60s']['processed_fps']:.1f}) | "
+                  f"dropped {rates['dropped_frames']} ({rates['drop_rate']:.0%}) | "
+                  f"lag {lag or 0:.0f}ms")
             print(f"      Enabled models: {enabled_models}")
             print(f"      Events: {stats['total_events']} total")
+            
+            model_timings = " | ".join(f"{uc}: {timing['avg_ms']:.1f}ms (max {timing['max_ms']:.0f})"
+                                       for uc, timing in stats['model_timings'].items())
+            if model_timings:
+                print(f"      Model time: {model_timings}")
         
         print("\n Events by use case:")
-        for use_case, count in self.global_stats['events_by_use_case'].items():
+        for use_case, count in global_stats['events_by_use_case'].items():
             print(f"   {use_case.replace('_', ' ').title()}: {count}")
         
+        log_stats = get_logging_stats()
+        if log_stats['suppressed_total'] or log_stats['dropped']:
+            noisiest = ", ".join(f"{site} ({count})" for site, count in list(log_stats['noisiest_sites'].items())[:3])
+            print(f"\n Log messages suppressed: {log_stats['suppressed_total']} | dropped: {log_stats['dropped']}"
+                  f"{' | noisiest: ' + noisiest if noisiest else ''}")
+        
         print("="*80)
     
     def initialize(self):
         """Initialize the flexible multi-camera processor"""
         self.logger.info("Initializing Flexible Multi-Camera Processor")
         
-        # Connect to database
+        # Connect to the event store (MySQL, or the local/in-memory sink)
         if not self.db_handler.connect():
-            raise RuntimeError("Failed to connect to database")
+            raise RuntimeError(f"Failed to connect to event store ({self.event_sink})")
         
         # Initialize each camera stream
         initialized_cameras = 0
@@ -519,16 +1090,18 @@ class FlexibleMultiCameraProcessor:
             if camera_stream.initialize(self.db_handler, self.gcp_uploader):
                 if camera_stream.connect():
                     initialized_cameras += 1
-                    self.logger.info(f"Camera {camera_id} initialized and connected")
+                    self.logger.info(f"Camera {camera_id} initialized and connected", extra={'camera_id': camera_id})
                 else:
                     self.logger.error(f"Camera {camera_id} failed to connect")
             else:
                 self.logger.error(f"Camera {camera_id} failed to initialize")
         
-        self.global_stats['active_cameras'] = initialized_cameras
+        self.counters.set_gauge('active_cameras', initialized_cameras)
         
-        # Test GCP connection
-        if self.gcp_uploader.test_connection():
+        # Test GCP connection (upload/download round trip - remote sink only)
+        if self.event_sink != 'remote':
+            self.logger.info(f"Event sink: {self.event_sink} (no network I/O)")
+        elif self.gcp_uploader.test_connection():
             self.logger.info("GCP storage connection successful")
         else:
             self.logger.warning("GCP storage connection failed")
@@ -539,13 +1112,15 @@ class FlexibleMultiCameraProcessor:
         """Worker thread for saving events to database and GCP"""
         self.logger.info("Started event saving worker")
         
-        while self.running or not self.event_queue.empty():
+        # Runs until stop() has joined the camera workers and cleared events_running, then drains
+        while self.events_running or not self.event_queue.empty():
             try:
-                # Get event from queue (with timeout)
-                result = self.event_queue.get(timeout=1.0)
+                # Get event from queue (with timeout) - highest severity first
+                result, severity, _ = self.event_queue.get_with_info(timeout=1.0)
                 
                 # Save event using existing logic
                 self._save_camera_event(result)
+                self.persist_latency.record(severity, time.time() - result['queued_at'])
                 
                 # Mark task as done
                 self.event_queue.task_done()
@@ -572,30 +1147,35 @@ class FlexibleMultiCameraProcessor:
         else:
             return obj
     
-    def start_processing(self):
-        """Start flexible multi-camera processing"""
-        self.logger.info("Starting flexible multi-camera processing...")
-        
+    def start_workers(self):
+        """Initialize and start the camera and event saving worker threads (non-blocking)"""
         # Initialize
         self.initialize()
         
         self.running = True
         
         # Start event saving worker
-        event_worker = threading.Thread(target=self._event_saving_worker, daemon=True)
-        event_worker.start()
+        self.events_running = True
+        self.event_worker = threading.Thread(target=self._event_saving_worker, daemon=True)
+        self.event_worker.start()
         
         # Start processing worker for each camera
-        for camera_id in self.camera_streams.keys():
-            worker_thread = threading.Thread(
-                target=self._camera_processing_worker, 
-                args=(camera_id,),
-                daemon=True
-            )
-            worker_thread.start()
-            self.processing_threads[camera_id] = worker_thread
+        for camera_id in list(self.camera_streams.keys()):
+            self._start_camera_worker(camera_id)
+        
+        if self.metrics_port and self.metrics_server is None:
+            self.metrics_server = MetricsServer(self.metrics, self.metrics_port,
+                                                getattr(self.config, 'METRICS_HOST', '127.0.0.1'))
+            if not self.metrics_server.start():
+                self.metrics_server = None
         
         self.logger.info(f"Started flexible processing for {len(self.processing_threads)} cameras")
+    
+    def start_processing(self):
+        """Start flexible multi-camera processing"""
+        self.logger.info("Starting flexible multi-camera processing...")
+        
+        self.start_workers()
         
         # Main monitoring loop
         try:
@@ -615,26 +1195,36 @@ class FlexibleMultiCameraProcessor:
         # Cleanup
         self.stop()
     
-    def stop(self):
-        """Stop flexible multi-camera processing"""
+    def stop(self, event_timeout: Optional[float] = None):
+        """Stop flexible multi-camera processing (event_timeout bounds the wait for pending events)"""
         self.logger.info("Stopping flexible multi-camera processing...")
         
         # Stop processing
         self.running = False
         
-        # Wait for worker threads to finish
-        for camera_id, thread in self.processing_threads.items():
-            self.logger.info(f"Waiting for camera {camera_id} worker to finish...")
+        # Wait for worker threads to finish - they may still queue the result of their last frame
+        for camera_id, thread in list(self.processing_threads.items()):
+            self.logger.info(f"Waiting for camera {camera_id} worker to finish...", extra={'camera_id': camera_id})
             thread.join(timeout=5.0)
         
-        # Wait for event queue to empty
+        # Only then let the event worker drain the queue and exit
         self.logger.info("Waiting for pending events to be saved...")
-        try:
-            self.event_queue.join()
-        except:
-            pass
+        self.events_running = False
+        if self.event_worker is not None:
+            self.event_worker.join(timeout=event_timeout)
+            if self.event_worker.is_alive():
+                self.logger.warning(f"Pending events not saved within {event_timeout}s, "
+                                    f"{self.event_queue.qsize()} left unsaved")
+            self.event_worker = None
+        self._discard_pending_events()
         
         # Cleanup resources
+        if self.model_executor is not None:
+            self.model_executor.shutdown(wait=True)
+        self.model_registry.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        
         self.gcp_uploader.stop()
         self.db_handler.disconnect()
         
@@ -643,12 +1233,18 @@ class FlexibleMultiCameraProcessor:
     def get_camera_stats(self) -> Dict[str, Any]:
         """Get detailed statistics for all cameras"""
         camera_stats = {}
-        for camera_id, camera_stream in self.camera_streams.items():
+        for camera_id, camera_stream in list(self.camera_streams.items()):
             camera_stats[camera_id] = camera_stream.get_stats()
         
         return {
-            'global_stats': self.global_stats,
+            'global_stats': self.get_global_stats(),
             'camera_stats': camera_stats,
+            'event_queue': self.event_queue.get_lane_stats(),
+            'persist_latency_by_severity': self.persist_latency.get_stats(),
+            'shared_streams': self.stream_registry.get_stats(),
+            'models': self.model_registry.get_stats(),
+            'latency': self.metrics.snapshot(),
+            'logging': get_logging_stats(),
             'gcp_stats': self.gcp_uploader.get_upload_stats()
         }
 
@@ -0,0 +1,137 @@
+# core/frame_buffer_pool.py - NEW FILE
+# Reusable frame buffers for capture and annotation
+#
+# Capture reads decode into pooled buffers (cap.read(image=buf)) and annotation
+# copies are leased instead of allocated, so steady-state processing reuses the
+# same few arrays per camera instead of allocating megabytes per frame. Leases
+# are reference counted: a frame shared by several logical cameras goes back
+# to the pool only once the last of them has released it.
+
+import time
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+class FrameLease:
+    """A pooled buffer on loan; release() returns it when the last holder is done"""
+
+    __slots__ = ('pool', 'array', 'refs')
+
+    def __init__(self, pool: 'FrameBufferPool', array: np.ndarray):
+        self.pool = pool
+        self.array = array
+        self.refs = 1
+
+    def retain(self) -> 'FrameLease':
+        with self.pool._lock:
+            self.refs += 1
+        return self
+
+    def release(self):
+        with self.pool._lock:
+            self.refs -= 1
+            if self.refs != 0:
+                return
+        self.pool._give_back(self.array)
+
+
+class FrameBufferPool:
+    """Free lists of same-shape uint8 buffers, bounded per shape"""
+
+    def __init__(self, max_free_per_shape: int = 6):
+        self.max_free_per_shape = max_free_per_shape
+        self.free = {}  # {(shape, dtype): [array, ...]}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'adopted': 0, 'returned': 0, 'discarded': 0, 'leased': 0}
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> FrameLease:
+        """Lease a buffer of the given shape (contents undefined)"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            buffers = self.free.get(key)
+            if buffers:
+                array = buffers.pop()
+                self.stats['hits'] += 1
+            else:
+                array = None
+                self.stats['misses'] += 1
+            self.stats['leased'] += 1
+        if array is None:
+            array = np.empty(shape, dtype=dtype)
+        return FrameLease(self, array)
+
+    def adopt(self, array: np.ndarray) -> FrameLease:
+        """Lease an array allocated elsewhere (e.g. the first capture read) so it joins the pool"""
+        with self._lock:
+            self.stats['adopted'] += 1
+            self.stats['leased'] += 1
+        return FrameLease(self, array)
+
+    def copy(self, frame: np.ndarray) -> FrameLease:
+        """Leased copy of a frame (pooled replacement for frame.copy())"""
+        lease = self.acquire(frame.shape, frame.dtype)
+        np.copyto(lease.array, frame)
+        return lease
+
+    def read(self, cap, shape_hint: Optional[Tuple[int, ...]] = None,
+             timings: Optional[Dict[str, float]] = None) -> Tuple[bool, Optional[FrameLease]]:
+        """
+        cap.read() into a pooled buffer; a resolution change just adopts the new array.
+        With a timings dict, grab and decode are split (grab()/retrieve()) and timed in ms.
+        """
+        lease = self.acquire(shape_hint) if shape_hint is not None else None
+        image = {'image': lease.array} if lease is not None else {}
+        try:
+            if timings is not None and hasattr(cap, 'grab') and hasattr(cap, 'retrieve'):
+                start = time.perf_counter()
+                ret = cap.grab()
+                grabbed = time.perf_counter()
+                ret, frame = cap.retrieve(**image) if ret else (False, None)
+                timings['grab'] = (grabbed - start) * 1000
+                timings['decode'] = (time.perf_counter() - grabbed) * 1000
+            else:
+                start = time.perf_counter()
+                ret, frame = cap.read(**image)
+                if timings is not None:
+                    timings['grab'] = (time.perf_counter() - start) * 1000
+        except Exception:
+            if lease is not None:
+                lease.release()
+            raise
+
+        if not ret or frame is None:
+            if lease is not None:
+                lease.release()
+            return False, None
+
+        if lease is not None and frame is lease.array:
+            return True, lease
+        if lease is not None:
+            lease.release()
+        return True, self.adopt(frame)
+
+    def _give_back(self, array: np.ndarray):
+        key = (array.shape, array.dtype.str)
+        with self._lock:
+            self.stats['leased'] -= 1
+            if not array.flags.owndata or not array.flags.c_contiguous:
+                return  # views (e.g. shared-memory slots) are never pooled
+            buffers = self.free.setdefault(key, [])
+            if len(buffers) < self.max_free_per_shape:
+                buffers.append(array)
+                self.stats['returned'] += 1
+            else:
+                self.stats['discarded'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.stats['hits'] + self.stats['misses']
+            return {
+                'hit_rate': self.stats['hits'] / requests if requests else 0.0,
+                'in_use': self.stats['leased'],
+                'free_buffers': sum(len(buffers) for buffers in self.free.values()),
+                'free_bytes': sum(array.nbytes for buffers in self.free.values() for array in buffers),
+                **self.stats
+            }
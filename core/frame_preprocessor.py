@@ -0,0 +1,115 @@
+# core/frame_preprocessor.py - NEW FILE
+# Per-frame preprocessing computed once: inference input, preview and activity thumbnail
+#
+# A PreparedFrame wraps the full-resolution BGR frame and lazily caches the
+# derived images every consumer used to compute for itself:
+#   full                 - read-only view of the captured frame (models, ROI crops)
+#   inference(imgsz)     - letterboxed detector input, same geometry as ultralytics'
+#                          own letterbox, so YOLO does not resize again
+#   preview()            - downscaled copy (event snapshots, dashboards)
+#   activity_thumbnail() - 64x36 grayscale used by the detection scheduler
+# Derivations run at most once per frame, whichever consumer asks first.
+
+import time
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+LETTERBOX_COLOR = (114, 114, 114)
+
+
+class PreparedFrame:
+    """One captured frame and its cached derived images"""
+
+    def __init__(self, frame: np.ndarray, preprocessor: 'FramePreprocessor'):
+        self.full = frame.view()
+        self.full.flags.writeable = False  # shared by all consumers - copy before drawing
+        self.shape = frame.shape
+        self.preprocessor = preprocessor
+        self._inference = {}  # {imgsz: (image, scale, (pad_x, pad_y))}
+        self._preview = None
+        self._thumbnail = None
+        self._lock = threading.Lock()
+        self.preprocess_ms = 0.0  # time spent deriving images for this frame
+
+    def inference(self, imgsz: int) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Letterboxed BGR detector input plus the scale/padding to map boxes back"""
+        with self._lock:
+            if imgsz not in self._inference:
+                start = time.perf_counter()
+                self._inference[imgsz] = self.preprocessor.letterbox(self.full, imgsz)
+                self.preprocess_ms += (time.perf_counter() - start) * 1000
+                self.preprocessor.stats['letterbox'] += 1
+            else:
+                self.preprocessor.stats['reused'] += 1
+            return self._inference[imgsz]
+
+    def preview(self) -> np.ndarray:
+        """Downscaled copy of the full frame (preprocessor.preview_width wide)"""
+        with self._lock:
+            if self._preview is None:
+                start = time.perf_counter()
+                self._preview = self.preprocessor.downscale(self.full, self.preprocessor.preview_width)
+                self.preprocess_ms += (time.perf_counter() - start) * 1000
+                self.preprocessor.stats['preview'] += 1
+            else:
+                self.preprocessor.stats['reused'] += 1
+            return self._preview
+
+    def activity_thumbnail(self) -> np.ndarray:
+        """64x36 int16 grayscale thumbnail for scene-activity checks"""
+        source = self.preview()
+        with self._lock:
+            if self._thumbnail is None:
+                gray = cv2.cvtColor(source, cv2.COLOR_BGR2GRAY) if source.ndim == 3 else source
+                self._thumbnail = cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA).astype(np.int16)
+            return self._thumbnail
+
+
+class FramePreprocessor:
+    """Builds PreparedFrames; the single place to tune preprocessing sizes"""
+
+    def __init__(self, imgsz: int = 640, preview_width: int = 640, stride: int = 32):
+        self.imgsz = imgsz
+        self.preview_width = preview_width
+        self.stride = stride
+        self.stats = {'frames': 0, 'letterbox': 0, 'preview': 0, 'reused': 0}
+
+    def prepare(self, frame: np.ndarray) -> PreparedFrame:
+        self.stats['frames'] += 1
+        return PreparedFrame(frame, self)
+
+    def letterbox(self, frame: np.ndarray, imgsz: Optional[int] = None) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Resize keeping aspect ratio and pad to a stride multiple (ultralytics 'auto' letterbox)"""
+        imgsz = imgsz or self.imgsz
+        height, width = frame.shape[:2]
+        scale = min(imgsz / height, imgsz / width)
+        new_width, new_height = int(round(width * scale)), int(round(height * scale))
+        pad_x = (-new_width) % self.stride
+        pad_y = (-new_height) % self.stride
+
+        resized = frame if (new_width, new_height) == (width, height) else cv2.resize(
+            frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+        left, top = pad_x // 2, pad_y // 2
+        image = cv2.copyMakeBorder(resized, top, pad_y - top, left, pad_x - left, cv2.BORDER_CONSTANT,
+                                   value=LETTERBOX_COLOR)
+        return image, scale, (left, top)
+
+    @staticmethod
+    def downscale(frame: np.ndarray, max_width: int) -> np.ndarray:
+        height, width = frame.shape[:2]
+        if not max_width or width <= max_width:
+            return frame
+        return cv2.resize(frame, (max_width, int(round(height * max_width / width))), interpolation=cv2.INTER_AREA)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats)
+
+
+def encode_jpeg(frame: np.ndarray, max_width: int = 0, quality: int = 90) -> Optional[bytes]:
+    """JPEG bytes of a frame, optionally downscaled first (encode once, write many)"""
+    ok, buffer = cv2.imencode('.jpg', FramePreprocessor.downscale(frame, max_width),
+                              [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return buffer.tobytes() if ok else None
@@ -0,0 +1,358 @@
+# core/frame_sources.py - NEW FILE
+# cv2.VideoCapture-compatible sources for runs without real cameras
+#
+# Selected by the camera's stream_url:
+#   synthetic://1280x720@15?objects=4&seed=1   - generated frames with moving boxes
+#   file:///path/to/video.mp4?loop=1&realtime=1 - a recorded clip, looped, paced to its fps
+#   replay:///path/to/dir_or_file?speed=0       - recordings played once, every frame,
+#                                                 as fast as read (speed=0) or at N x real time
+#   detections:///path/to/recording?loop=0     - recorded detections, no model (core/detection_recording.py)
+# fps 0 (or realtime=0) serves frames as fast as they are read. Anything else
+# is left to cv2.VideoCapture.
+#
+# Replays never skip frames and carry media_timestamp (recording start + position
+# in the file), which the camera uses instead of the wall clock for event times.
+
+import os
+import re
+import time
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+import cv2
+import numpy as np
+
+FRAME_SOURCE_SCHEMES = ('synthetic', 'file', 'replay', 'detections')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.m4v', '.ts', '.webm')
+
+# Recording start in file names: 20240131_235959, 2024-01-31_23-59-59, 20240131T235959 ...
+_START_TIME_PATTERN = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})[_T\- ]?(\d{2})[-:]?(\d{2})[-:]?(\d{2})')
+
+
+class _PacedSource:
+    """Shared pacing: read() blocks until the next frame is due, like a live camera"""
+
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.started_at = None
+        self.frame_index = -1
+        self.last_timestamp = 0.0
+        self.opened = True
+
+    def _next_frame_index(self) -> int:
+        """Index of the frame to serve now (frames that went by unread are skipped)"""
+        now = time.time()
+        if self.started_at is None:
+            self.started_at = now
+        if not self.fps:
+            self.frame_index += 1
+        else:
+            due = max(self.frame_index + 1, int((now - self.started_at) * self.fps))
+            wait = self.started_at + due / self.fps - now
+            if wait > 0:
+                time.sleep(wait)
+            self.frame_index = due
+        self.last_timestamp = time.time()
+        return self.frame_index
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frame_index + 1)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+class SyntheticCapture(_PacedSource):
+    """Noisy static background with a few person-sized boxes moving across it"""
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 15.0, objects: int = 4, seed: int = 0):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        rng = np.random.default_rng(seed)
+
+        gradient = np.linspace(40, 160, width, dtype=np.float32)[None, :, None]
+        noise = rng.normal(0, 12, (height, width, 3)).astype(np.float32)
+        self.background = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+
+        box_height = max(40, height // 4)
+        self.objects = [{
+            'size': (box_height // 2, box_height),
+            'start': (float(rng.uniform(0, width)), float(rng.uniform(0, height - box_height))),
+            'velocity': (float(rng.uniform(-8, 8)), float(rng.uniform(-3, 3))),
+            'color': tuple(int(c) for c in rng.integers(0, 255, 3))
+        } for _ in range(objects)]
+
+    def grab(self) -> bool:
+        if not self.opened:
+            return False
+        self._next_frame_index()
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        frame = image if image is not None and image.shape == self.background.shape else np.empty_like(self.background)
+        np.copyto(frame, self.background)
+        for obj in self.object_boxes(self.frame_index):
+            x1, y1, x2, y2, color = obj
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+        return True, frame
+
+    def object_boxes(self, frame_index: int):
+        """(x1, y1, x2, y2, color) of every object in a frame; objects bounce off the edges"""
+        boxes = []
+        for obj in self.objects:
+            w, h = obj['size']
+            x = _bounce(obj['start'][0] + obj['velocity'][0] * frame_index, self.width - w)
+            y = _bounce(obj['start'][1] + obj['velocity'][1] * frame_index, self.height - h)
+            boxes.append((int(x), int(y), int(x) + w, int(y) + h, obj['color']))
+        return boxes
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        return super().get(prop_id)
+
+
+class FileCapture(_PacedSource):
+    """A video file served like a live stream: paced to its fps and optionally looped"""
+
+    def __init__(self, path: str, loop: bool = True, realtime: bool = True, fps: Optional[float] = None):
+        self.cap = cv2.VideoCapture(path)
+        source_fps = self.cap.get(cv2.CAP_PROP_FPS) or 15.0
+        super().__init__((fps or source_fps) if realtime else 0.0)
+        self.path = path
+        self.loop = loop
+        self.opened = self.cap.isOpened()
+        self.loops = 0
+        self.logger = logging.getLogger('frame_sources')
+        if not self.opened:
+            self.logger.error(f"Cannot open video file {path}")
+
+    def grab(self) -> bool:
+        if not self.opened:
+            return False
+        previous = self.frame_index
+        index = self._next_frame_index()
+        # A slow reader skips frames, as it would on a live stream
+        for _ in range(max(1, index - previous)):
+            if not self._grab_one():
+                return False
+        return True
+
+    def _grab_one(self) -> bool:
+        if self.cap.grab():
+            return True
+        if not self.loop:
+            return False
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.loops += 1
+        return self.cap.grab()
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.cap.retrieve(image) if image is not None else self.cap.retrieve()
+
+    def get(self, prop_id: int) -> float:
+        if prop_id in (cv2.CAP_PROP_FPS, cv2.CAP_PROP_POS_FRAMES):
+            return super().get(prop_id)
+        return self.cap.get(prop_id)
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+
+class ReplayCapture:
+    """
+    Recorded files (or every video in a directory, by name) read once, frame by frame.
+    speed 0 returns frames as fast as they are read; speed N paces them at N x the
+    recording's own timing. read() fails after the last frame (finished is then True).
+    """
+
+    def __init__(self, paths: List[str], speed: float = 0.0, start_time: Optional[float] = None):
+        self.paths = list(paths)
+        self.speed = speed
+        self.start_time = start_time  # epoch seconds of the first file (else from names / mtimes)
+        self.cap = None
+        self.file_index = -1
+        self.file_start = 0.0
+        self.file_fps = 0.0
+        self.file_frame = -1
+        self.frames_read = 0
+        self.media_timestamp = None
+        self.last_timestamp = 0.0
+        self.finished = not self.paths
+        self.opened = bool(self.paths)
+        self.paced_from = None  # (wall time, media time) pacing started at
+        self.logger = logging.getLogger('frame_sources')
+        if not self.paths:
+            self.logger.error("Replay source has no video files")
+
+    @staticmethod
+    def expand(path: str) -> List[str]:
+        """A file, or the video files of a directory (recursively) in name order"""
+        if os.path.isdir(path):
+            return sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+                          if name.lower().endswith(VIDEO_EXTENSIONS))
+        return [path]
+
+    @staticmethod
+    def recording_start(path: str, cap=None) -> float:
+        """Recording start from the file name, else its mtime minus its duration"""
+        match = _START_TIME_PATTERN.search(os.path.basename(path))
+        if match:
+            try:
+                return datetime(*(int(part) for part in match.groups())).timestamp()
+            except ValueError:
+                pass
+        duration = 0.0
+        if cap is not None:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+            frames = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+            duration = frames / fps if fps else 0.0
+        return os.path.getmtime(path) - duration
+
+    def _open_next(self) -> bool:
+        """Advance to the next readable file"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        while self.file_index + 1 < len(self.paths):
+            self.file_index += 1
+            path = self.paths[self.file_index]
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                self.logger.error(f"Cannot open video file {path}")
+                continue
+            if self.file_index == 0 and self.start_time is not None:
+                self.file_start = self.start_time
+            else:
+                self.file_start = self.recording_start(path, cap)
+            self.file_fps = cap.get(cv2.CAP_PROP_FPS) or 15.0
+            self.file_frame = -1
+            self.cap = cap
+            self.logger.info(f"Replaying {path} ({self.file_index + 1}/{len(self.paths)}) "
+                             f"from {datetime.fromtimestamp(self.file_start).isoformat()}")
+            return True
+        self.finished = True
+        return False
+
+    def grab(self) -> bool:
+        if not self.opened or self.finished:
+            return False
+        if self.cap is None and not self._open_next():
+            return False
+        while not self.cap.grab():
+            if not self._open_next():
+                return False
+        self.file_frame += 1
+        self.frames_read += 1
+
+        # Media time: container position, or frame index / fps when the container has none
+        position_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        offset = position_ms / 1000.0 if position_ms > 0 else self.file_frame / self.file_fps
+        self.media_timestamp = self.file_start + offset
+
+        if self.speed:
+            now = time.time()
+            if self.paced_from is None:
+                self.paced_from = (now, self.media_timestamp)
+            wait = self.paced_from[0] + (self.media_timestamp - self.paced_from[1]) / self.speed - now
+            if wait > 0:
+                time.sleep(min(wait, 1.0))  # gaps between recordings are not waited out
+        self.last_timestamp = time.time()
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.cap.retrieve(image) if image is not None else self.cap.retrieve()
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frames_read)
+        if self.cap is None:
+            return 0.0
+        return self.cap.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        return False
+
+    def release(self):
+        self.opened = False
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def get_stats(self):
+        return {
+            'files': len(self.paths),
+            'file_index': self.file_index,
+            'frames_read': self.frames_read,
+            'media_time': datetime.fromtimestamp(self.media_timestamp).isoformat() if self.media_timestamp else None,
+            'finished': self.finished
+        }
+
+
+def _bounce(position: float, limit: int) -> float:
+    """Reflect a position into [0, limit]"""
+    if limit <= 0:
+        return 0.0
+    period = 2 * limit
+    position = position % period
+    return position if position <= limit else period - position
+
+
+def open_frame_source(stream_url):
+    """Capture for synthetic://, file://, replay:// and detections:// URLs, None for anything else"""
+    if not isinstance(stream_url, str) or '://' not in stream_url:
+        return None
+    parts = urlsplit(stream_url)
+    if parts.scheme not in FRAME_SOURCE_SCHEMES:
+        return None
+    options = dict(parse_qsl(parts.query))
+
+    if parts.scheme == 'synthetic':
+        size, _, fps = parts.netloc.partition('@')
+        width, _, height = size.partition('x')
+        return SyntheticCapture(int(width or 1280), int(height or 720), float(fps or 15),
+                                objects=int(options.get('objects', 4)), seed=int(options.get('seed', 0)))
+
+    if parts.scheme == 'detections':
+        from core.detection_recording import DetectionReplayCapture
+        return DetectionReplayCapture(unquote(parts.netloc + parts.path), loop=options.get('loop', '0') != '0')
+
+    if parts.scheme == 'replay':
+        start = options.get('start')
+        return ReplayCapture(ReplayCapture.expand(unquote(parts.netloc + parts.path)),
+                             speed=float(options.get('speed', 0)),
+                             start_time=datetime.fromisoformat(start).timestamp() if start else None)
+
+    return FileCapture(unquote(parts.netloc + parts.path),
+                       loop=options.get('loop', '1') != '0',
+                       realtime=options.get('realtime', '1') != '0',
+                       fps=float(options['fps']) if 'fps' in options else None)
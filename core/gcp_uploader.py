@@ -11,15 +11,18 @@ import logging
 import numpy as np
 from datetime import datetime
 from threading import Thread
-from queue import Queue, Empty
+from queue import Empty
 from typing import Optional, Dict, Any
 from google.cloud import storage
 from google.oauth2 import service_account
 
+from core.event_priority import SeverityPriorityQueue, SeverityLatencyTracker, get_event_severity
+
 class GCPUploader:
     """GCP Storage uploader for camera events - FINAL FIXED VERSION"""
     
-    def __init__(self, credentials_path: str, bucket_name: str, project_id: str):
+    def __init__(self, credentials_path: str, bucket_name: str, project_id: str,
+                 starvation_timeout: float = 5.0):
         self.credentials_path = credentials_path
         self.bucket_name = bucket_name
         self.project_id = project_id
@@ -30,8 +33,12 @@ class GCPUploader:
         self.bucket = None
         self._init_gcp_client()
         
-        # Upload queue for background processing
-        self.upload_queue = Queue()
+        # Optional MetricsRegistry for upload latency (set by the processor)
+        self.metrics = None
+        
+        # Upload queue for background processing - critical snapshots go first
+        self.upload_queue = SeverityPriorityQueue(starvation_timeout=starvation_timeout)
+        self.upload_latency = SeverityLatencyTracker()
         self.running = True
         
         # Start background upload worker
@@ -96,9 +103,13 @@ class GCPUploader:
             return obj
     
     def save_and_upload_event(self, frame, event_type: str, camera_id: int, 
-                            detection_data: Dict[str, Any] = None) -> tuple:
-        """Save frame locally and queue for GCP upload"""
+                            detection_data: Dict[str, Any] = None,
+                            severity: Optional[str] = None,
+                            jpeg_bytes: Optional[bytes] = None) -> tuple:
+        """Save frame locally and queue for GCP upload (jpeg_bytes: already encoded frame)"""
         try:
+            severity = severity or get_event_severity(event_type)
+            
             # Generate unique identifiers
             event_id = str(uuid.uuid4())
             timestamp = datetime.now()
@@ -118,7 +129,12 @@ class GCPUploader:
             local_path = os.path.join(local_dir, filename)
             
             # Save frame locally
-            success = cv2.imwrite(local_path, frame)
+            if jpeg_bytes is not None:
+                with open(local_path, 'wb') as f:
+                    f.write(jpeg_bytes)
+                success = True
+            else:
+                success = cv2.imwrite(local_path, frame)
             if not success:
                 self.logger.error(f"Failed to save frame locally: {local_path}")
                 return None, None
@@ -138,10 +154,12 @@ class GCPUploader:
                     'event_id': event_id,
                     'timestamp': timestamp.isoformat(),  # FIXED: Convert to string
                     'detection_data': safe_detection_data,
-                    'camera_id': camera_id
+                    'camera_id': camera_id,
+                    'severity': severity,
+                    'queued_at': time.time()
                 }
                 
-                self.upload_queue.put(upload_item)
+                self.upload_queue.put(upload_item, severity)
                 self.logger.info(f"Saved and queued: {event_type} -> {filename}")
             else:
                 self.logger.warning(f"GCP not available, saved locally only: {filename}")
@@ -163,6 +181,10 @@ class GCPUploader:
                 
                 # Perform upload
                 success = self._upload_single_file(upload_item)
+                self.upload_latency.record(
+                    upload_item.get('severity', 'info'),
+                    time.time() - upload_item.get('queued_at', time.time())
+                )
                 
                 # Update statistics
                 self.stats['total_uploads'] += 1
@@ -231,6 +253,8 @@ class GCPUploader:
             start_time = time.time()
             blob.upload_from_filename(local_path)
             upload_time = time.time() - start_time
+            if self.metrics is not None:
+                self.metrics.observe('upload', upload_time * 1000, camera=upload_item['camera_id'])
             
             # Update statistics
             self.stats['total_size_bytes'] += file_size
@@ -254,6 +278,8 @@ class GCPUploader:
             'success_rate': (self.stats['successful_uploads'] / max(1, self.stats['total_uploads'])) * 100,
             'total_size_mb': self.stats['total_size_bytes'] / (1024 * 1024),
             'queue_size': queue_size,
+            'queue_by_severity': self.upload_queue.get_lane_stats(),
+            'upload_latency_by_severity': self.upload_latency.get_stats(),
             'is_connected': self.bucket is not None
         }
     
@@ -0,0 +1,252 @@
+# core/inference_backends.py - NEW FILE
+# Exported CPU inference backends (ONNX Runtime / OpenVINO) behind the shared YOLO model
+#
+# ultralytics.YOLO loads exported engines and runs them through the same call
+# interface as the PyTorch weights, so the rest of the pipeline is unchanged.
+# Exports are built once and cached on disk, keyed by weights hash, backend,
+# input size and precision:
+#   <cache_dir>/<weights stem>-<sha256[:12]>-<backend>-<imgsz>[-int8].<onnx|openvino>
+# INT8 variants are calibrated from recorded frames (FRAMES_OUTPUT_DIR by default).
+
+import os
+import glob
+import shutil
+import hashlib
+import logging
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+import cv2
+import numpy as np
+
+INFERENCE_BACKENDS = ('pytorch', 'onnx', 'openvino')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+logger = logging.getLogger('inference_backends')
+
+
+def weights_hash(weights_path: str) -> str:
+    """Short content hash of a weight file (exports are rebuilt when the weights change)"""
+    digest = hashlib.sha256()
+    with open(weights_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def export_cache_path(weights_path: str, backend: str, imgsz: int, int8: bool = False,
+                      cache_dir: str = 'models/exported') -> str:
+    stem = os.path.splitext(os.path.basename(weights_path))[0]
+    suffix = '.onnx' if backend == 'onnx' else '_openvino_model'
+    name = f"{stem}-{weights_hash(weights_path)}-{backend}-{imgsz}{'-int8' if int8 else ''}{suffix}"
+    return os.path.join(cache_dir, name)
+
+
+def collect_calibration_images(frames_dir: str, max_images: int = 300) -> List[str]:
+    """Recorded frames used to calibrate INT8 quantization (newest first)"""
+    images = [path for path in glob.glob(os.path.join(frames_dir, '**', '*'), recursive=True)
+              if path.lower().endswith(IMAGE_EXTENSIONS)]
+    images.sort(key=os.path.getmtime, reverse=True)
+    return images[:max_images]
+
+
+def _write_calibration_dataset(images: List[str], names: Dict[int, str], work_dir: str) -> str:
+    """Minimal ultralytics dataset yaml over the calibration images (used by OpenVINO INT8 export)"""
+    image_dir = os.path.join(work_dir, 'images')
+    os.makedirs(image_dir, exist_ok=True)
+    for i, path in enumerate(images):
+        shutil.copy(path, os.path.join(image_dir, f"{i:05d}{os.path.splitext(path)[1].lower()}"))
+
+    yaml_path = os.path.join(work_dir, 'calibration.yaml')
+    with open(yaml_path, 'w') as f:
+        f.write(f"path: {work_dir}\ntrain: images\nval: images\nnames:\n")
+        for class_id, name in sorted(names.items()):
+            f.write(f"  {class_id}: {name}\n")
+    return yaml_path
+
+
+def _letterbox_tensor(image_path: str, imgsz: int) -> Optional[np.ndarray]:
+    """BGR image -> 1x3xHxW float32 RGB tensor, letterboxed like ultralytics preprocessing"""
+    image = cv2.imread(image_path)
+    if image is None:
+        return None
+    height, width = image.shape[:2]
+    scale = imgsz / max(height, width)
+    resized = cv2.resize(image, (int(round(width * scale)), int(round(height * scale))),
+                         interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top = (imgsz - resized.shape[0]) // 2
+    left = (imgsz - resized.shape[1]) // 2
+    canvas[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+    return (canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0).copy()
+
+
+def _quantize_onnx(onnx_path: str, output_path: str, images: List[str], imgsz: int):
+    """Static INT8 quantization of an exported ONNX model with onnxruntime"""
+    import onnxruntime
+    from onnxruntime.quantization import CalibrationDataReader, QuantType, quantize_static
+
+    input_name = onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.paths = iter(images)
+
+        def get_next(self):
+            for path in self.paths:
+                tensor = _letterbox_tensor(path, imgsz)
+                if tensor is not None:
+                    return {input_name: tensor}
+            return None
+
+    quantize_static(onnx_path, output_path, FrameReader(), weight_type=QuantType.QInt8,
+                    activation_type=QuantType.QUInt8)
+
+
+@contextmanager
+def _export_lock(target: str):
+    """Exclusive lock so only one process (per target) runs an export; no-op where flock is unavailable"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(target + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def build_exported_model(weights_path: str, backend: str, imgsz: int = 640, int8: bool = False,
+                         cache_dir: str = 'models/exported', calibration_dir: Optional[str] = None,
+                         calibration_images: int = 300) -> str:
+    """Path of the cached export, building it first if needed"""
+    if backend not in INFERENCE_BACKENDS or backend == 'pytorch':
+        raise ValueError(f"Cannot export to backend '{backend}'")
+
+    target = export_cache_path(weights_path, backend, imgsz, int8, cache_dir)
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    images = []
+    if int8:
+        images = collect_calibration_images(calibration_dir or 'outputs/frames', calibration_images)
+        if not images:
+            raise RuntimeError(f"INT8 export needs recorded frames for calibration in {calibration_dir}")
+
+    with _export_lock(target):
+        # Another process may have finished the export while we waited for the lock
+        if os.path.exists(target):
+            return target
+        _export(weights_path, backend, imgsz, int8, images, target, cache_dir)
+    return target
+
+
+def _export(weights_path: str, backend: str, imgsz: int, int8: bool, images: List[str], target: str,
+            cache_dir: str):
+    """Run the export in a scratch directory and move the result to target (caller holds the lock)"""
+    from ultralytics import YOLO
+
+    start = time.time()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Export from a copy so ultralytics writes its artifacts into the scratch directory
+        local_weights = os.path.join(work_dir, os.path.basename(weights_path))
+        shutil.copy(weights_path, local_weights)
+        model = YOLO(local_weights)
+
+        if backend == 'onnx':
+            exported = model.export(format='onnx', imgsz=imgsz, dynamic=True, simplify=True)
+            if int8:
+                quantized = os.path.join(work_dir, 'model-int8.onnx')
+                _quantize_onnx(exported, quantized, images, imgsz)
+                exported = quantized
+        else:
+            data = _write_calibration_dataset(images, model.names, work_dir) if int8 else None
+            exported = model.export(format='openvino', imgsz=imgsz, dynamic=True, int8=int8,
+                                    **({'data': data} if data else {}))
+
+        # Stage in a private directory next to the target, then rename into place, so
+        # readers never see a partial export and concurrent exporters never share a path
+        staging_dir = tempfile.mkdtemp(dir=cache_dir, prefix='.export-')
+        try:
+            staged = os.path.join(staging_dir, os.path.basename(target))
+            shutil.move(exported, staged)
+            try:
+                os.replace(staged, target)
+            except OSError:
+                if not os.path.exists(target):
+                    raise
+                logger.info(f"Export {target} was created by another process, using it")
+                return
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    logger.info(f"Exported {weights_path} -> {target} in {time.time() - start:.1f}s")
+
+
+def load_model(weights_path: str, backend: str = 'pytorch', imgsz: Optional[int] = None, int8: bool = False,
+               cache_dir: str = 'models/exported', calibration_dir: Optional[str] = None):
+    """YOLO model on the requested backend; falls back to PyTorch if the export fails"""
+    from ultralytics import YOLO
+
+    if backend == 'pytorch' or not os.path.exists(weights_path):
+        return YOLO(weights_path)
+
+    try:
+        exported = build_exported_model(weights_path, backend, imgsz or 640, int8, cache_dir, calibration_dir)
+        return YOLO(exported, task='detect')
+    except Exception as e:
+        logger.error(f"Could not load {backend}{' int8' if int8 else ''} backend for {weights_path}, "
+                     f"using PyTorch: {e}")
+        return YOLO(weights_path)
+
+
+def benchmark_backends(weights_path: str, backends=INFERENCE_BACKENDS, imgsz: int = 640, int8: bool = False,
+                       runs: int = 30, frame=None, cache_dir: str = 'models/exported',
+                       calibration_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Average/percentile inference latency per backend on this machine"""
+    if frame is None:
+        frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+
+    variants = [(backend, False) for backend in backends]
+    if int8:
+        variants += [(backend, True) for backend in backends if backend != 'pytorch']
+
+    results = {}
+    for backend, quantized in variants:
+        label = f"{backend}-int8" if quantized else backend
+        try:
+            # No PyTorch fallback here - a failed export must show up as an error, not as PyTorch numbers
+            from ultralytics import YOLO
+            start = time.perf_counter()
+            if backend == 'pytorch':
+                model = YOLO(weights_path)
+            else:
+                model = YOLO(build_exported_model(weights_path, backend, imgsz, quantized, cache_dir,
+                                                  calibration_dir), task='detect')
+            load_s = time.perf_counter() - start
+
+            for _ in range(3):  # warmup
+                model(frame, verbose=False, imgsz=imgsz)
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                model(frame, verbose=False, imgsz=imgsz)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            results[label] = {
+                'load_seconds': load_s,
+                'avg_ms': float(np.mean(timings)),
+                'p95_ms': float(np.percentile(timings, 95)),
+                'fps': 1000.0 / float(np.mean(timings))
+            }
+        except Exception as e:
+            logger.error(f"Benchmark of {label} failed: {e}")
+            results[label] = {'error': str(e)}
+    return results
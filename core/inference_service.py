@@ -0,0 +1,170 @@
+# core/inference_service.py - NEW FILE
+# Serialized inference owner: one worker thread per model replica behind a request queue
+#
+# ultralytics predictors keep mutable state, so camera threads must not call the
+# same YOLO object concurrently. The service owns N independent replicas; callers
+# submit requests through a queue and get futures back. ServedModel is a drop-in
+# callable with the YOLO call signature, so detectors do not change.
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional, Tuple
+
+# Per calling thread: queue wait / compute ms accumulated since the last take_thread_timings()
+_thread_timings = threading.local()
+
+
+def take_thread_timings() -> Tuple[float, float]:
+    """(queue_wait_ms, compute_ms) of this thread's model calls since the last call, then reset"""
+    wait_ms = getattr(_thread_timings, 'wait_ms', 0.0)
+    compute_ms = getattr(_thread_timings, 'compute_ms', 0.0)
+    _thread_timings.wait_ms = 0.0
+    _thread_timings.compute_ms = 0.0
+    return wait_ms, compute_ms
+
+
+class _InferenceRequest:
+    __slots__ = ('source', 'kwargs', 'future', 'enqueued_at')
+
+    def __init__(self, source, kwargs: Dict[str, Any]):
+        self.source = source
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceService:
+    """Owns model replicas; every replica is only ever used by its own worker thread"""
+
+    def __init__(self, replicas: List[Any], name: str = 'detector', max_queue: int = 0):
+        if not replicas:
+            raise ValueError("InferenceService needs at least one model replica")
+
+        self.replicas = replicas
+        self.name = name
+        self.requests = queue.Queue(maxsize=max_queue)
+        self.running = True
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'queue_wait_ms_total': 0.0,
+            'queue_wait_ms_max': 0.0,
+            'compute_ms_total': 0.0,
+            'compute_ms_max': 0.0
+        }
+        self.replica_busy = [False] * len(replicas)
+        self.logger = logging.getLogger('inference_service')
+
+        self.workers = []
+        for index in range(len(replicas)):
+            worker = threading.Thread(target=self._worker, args=(index,), daemon=True,
+                                      name=f"inference-{name}-{index}")
+            worker.start()
+            self.workers.append(worker)
+
+    def submit(self, source, **kwargs) -> Future:
+        """Queue one model call; the future resolves to the model's return value"""
+        if not self.running:
+            raise RuntimeError(f"Inference service {self.name} is stopped")
+        request = _InferenceRequest(source, kwargs)
+        self.requests.put(request)
+        with self._stats_lock:
+            self.stats['submitted'] += 1
+        return request.future
+
+    def _worker(self, index: int):
+        model = self.replicas[index]
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            if not request.future.set_running_or_notify_cancel():
+                continue
+
+            started = time.perf_counter()
+            self.replica_busy[index] = True
+            result, error = None, None
+            try:
+                result = model(request.source, **request.kwargs)
+            except Exception as e:
+                self.logger.error(f"Inference error in {self.name} replica {index}: {e}")
+                error = e
+            finally:
+                self.replica_busy[index] = False
+
+            finished = time.perf_counter()
+            wait_ms = (started - request.enqueued_at) * 1000
+            compute_ms = (finished - started) * 1000
+            failed = error is not None
+
+            # Timing is attached before the future resolves so the caller always sees it
+            request.future.timing = (wait_ms, compute_ms)
+            if failed:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(result)
+            with self._stats_lock:
+                self.stats['failed' if failed else 'completed'] += 1
+                self.stats['queue_wait_ms_total'] += wait_ms
+                self.stats['queue_wait_ms_max'] = max(self.stats['queue_wait_ms_max'], wait_ms)
+                self.stats['compute_ms_total'] += compute_ms
+                self.stats['compute_ms_max'] = max(self.stats['compute_ms_max'], compute_ms)
+
+    def stop(self, timeout: float = 5.0):
+        """Finish queued requests, then stop the workers"""
+        if not self.running:
+            return
+        self.running = False
+        for _ in self.workers:
+            self.requests.put(None)
+        for worker in self.workers:
+            worker.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        done = stats['completed'] + stats['failed']
+        stats.update({
+            'replicas': len(self.replicas),
+            'busy_replicas': sum(self.replica_busy),
+            'queue_depth': self.requests.qsize(),
+            'avg_queue_wait_ms': stats['queue_wait_ms_total'] / done if done else 0.0,
+            'avg_compute_ms': stats['compute_ms_total'] / done if done else 0.0
+        })
+        return stats
+
+
+class ServedModel:
+    """Callable with the YOLO call signature that runs through an InferenceService"""
+
+    def __init__(self, service: InferenceService, timeout: Optional[float] = None):
+        self.service = service
+        self.timeout = timeout
+
+    def __call__(self, source, **kwargs):
+        future = self.service.submit(source, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        finally:
+            wait_ms, compute_ms = getattr(future, 'timing', (0.0, 0.0))
+            _thread_timings.wait_ms = getattr(_thread_timings, 'wait_ms', 0.0) + wait_ms
+            _thread_timings.compute_ms = getattr(_thread_timings, 'compute_ms', 0.0) + compute_ms
+
+    def submit(self, source, **kwargs) -> Future:
+        return self.service.submit(source, **kwargs)
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return getattr(self.service.replicas[0], 'names', None) or {}
+
+    def __getattr__(self, name):
+        # Read-only attributes (task, overrides, ...) come from the first replica
+        if name == 'service':
+            raise AttributeError(name)
+        return getattr(self.service.replicas[0], name)
@@ -0,0 +1,298 @@
+# core/metrics.py - NEW FILE
+# Low-overhead latency histograms per pipeline stage, camera and use case,
+# exposed in get_camera_stats() and on a local Prometheus-format HTTP endpoint
+#
+# Stages (all in milliseconds):
+#   grab, decode                    - capture (own capture or shared stream)
+#   preprocess, inference_wait,     - detector pass: letterbox, queue wait in the
+#   inference, detect               - inference service, model compute, total
+#   use_case                        - one use-case model on one frame
+#   annotation                      - annotation copy + status overlay
+#   frame                           - whole analyze() of a frame
+#   encode, db_write, upload        - event persistence
+#   capture_to_persisted            - capture timestamp -> event row written
+#
+# RollingRates keeps per-second frame counts for windowed throughput
+# (processed / source fps, dropped frames, lag) over the last 1 s / 10 s / 60 s.
+
+import time
+import bisect
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+# Bucket upper bounds in ms (+Inf is implicit)
+DEFAULT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and three additions"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th value"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'avg_ms': self.sum / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max
+        }
+
+
+class MetricsRegistry:
+    """Histograms keyed by stage name plus labels (camera, use_case, stream, ...)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = buckets
+        self.histograms = {}  # {(stage, ((label, value), ...)): Histogram}
+        self._lock = threading.Lock()  # only taken when a new series is created
+
+    def histogram(self, stage: str, **labels) -> Histogram:
+        key = (stage, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, stage: str, value_ms: float, **labels):
+        self.histogram(stage, **labels).observe(value_ms)
+
+    def timer(self, stage: str, **labels) -> '_Timer':
+        """with metrics.timer('encode', camera=cam): ..."""
+        return _Timer(self.histogram(stage, **labels))
+
+    def snapshot(self, **label_filter) -> Dict[str, Dict[str, float]]:
+        """Summaries of series matching all given labels, keyed 'stage[label=value,...]'"""
+        result = {}
+        for (stage, labels), histogram in list(self.histograms.items()):
+            label_dict = dict(labels)
+            if any(label_dict.get(name) != value for name, value in label_filter.items()):
+                continue
+            rest = ','.join(f"{name}={value}" for name, value in labels if name not in label_filter)
+            result[f"{stage}[{rest}]" if rest else stage] = histogram.summary()
+        return result
+
+    def summary_by_stage(self) -> Dict[str, Dict[str, float]]:
+        """One summary per stage, merging the series of all cameras/streams/use cases"""
+        merged = {}
+        for (stage, _), histogram in list(self.histograms.items()):
+            total = merged.get(stage)
+            if total is None:
+                total = merged[stage] = Histogram(histogram.buckets)
+            total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+            total.count += histogram.count
+            total.sum += histogram.sum
+            total.max = max(total.max, histogram.max)
+        return {stage: histogram.summary() for stage, histogram in sorted(merged.items())}
+
+    def reset(self):
+        """Drop all series (e.g. after a warmup period)"""
+        with self._lock:
+            self.histograms = {}
+
+    def render_prometheus(self, prefix: str = 'camera_pipeline') -> str:
+        """Prometheus text exposition format (one histogram family per stage)"""
+        by_stage = {}
+        for (stage, labels), histogram in list(self.histograms.items()):
+            by_stage.setdefault(stage, []).append((labels, histogram))
+
+        lines = []
+        for stage in sorted(by_stage):
+            name = f"{prefix}_{stage}_ms"
+            lines.append(f"# HELP {name} {stage} latency in milliseconds")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in by_stage[stage]:
+                label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    bucket_labels = _join(label_text, 'le="%s"' % bound)
+                    lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+                bucket_labels = _join(label_text, 'le="+Inf"')
+                lines.append(f"{name}_bucket{{{bucket_labels}}} {histogram.count}")
+                suffix = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{name}_sum{suffix} {histogram.sum:.3f}")
+                lines.append(f"{name}_count{suffix} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _join(*parts: str) -> str:
+    return ','.join(part for part in parts if part)
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class RollingRates:
+    """
+    Per-second ring of processed/source/dropped frame counts and capture lag.
+    record() is a handful of list writes from the single hot-path writer;
+    windows are summed over completed seconds when stats are read.
+    """
+
+    WINDOWS = (1, 10, 60)
+
+    def __init__(self, horizon: int = 60):
+        self.horizon = horizon
+        self.started_at = time.time()
+        self.slot_second = [-1] * horizon  # epoch second each slot currently holds
+        self.processed = [0] * horizon
+        self.source = [0] * horizon
+        self.dropped = [0] * horizon
+        self.lag_sum_ms = [0.0] * horizon
+        self.lag_max_ms = [0.0] * horizon
+        self.last_lag_ms = None
+
+    def record(self, processed: int = 1, source: int = 1, lag_ms: Optional[float] = None,
+               now: Optional[float] = None):
+        """Count processed frames and the source frames they stand for (the rest were dropped)"""
+        now = now or time.time()
+        second = int(now)
+        slot = second % self.horizon
+        if self.slot_second[slot] != second:
+            self.slot_second[slot] = second
+            self.processed[slot] = self.source[slot] = self.dropped[slot] = 0
+            self.lag_sum_ms[slot] = self.lag_max_ms[slot] = 0.0
+        self.processed[slot] += processed
+        self.source[slot] += max(source, processed)
+        self.dropped[slot] += max(0, source - processed)
+        if lag_ms is not None:
+            self.lag_sum_ms[slot] += lag_ms
+            if lag_ms > self.lag_max_ms[slot]:
+                self.lag_max_ms[slot] = lag_ms
+            self.last_lag_ms = lag_ms
+
+    def window(self, seconds: int, now: Optional[float] = None) -> Dict[str, float]:
+        """Rates over the last `seconds` completed seconds (shorter right after start)"""
+        now_second = int(now or time.time())
+        span = max(1, min(seconds, self.horizon, now_second - int(self.started_at)))
+        processed = source = dropped = 0
+        lag_sum, lag_max = 0.0, 0.0
+        for second in range(now_second - span, now_second):
+            slot = second % self.horizon
+            if self.slot_second[slot] != second:
+                continue
+            processed += self.processed[slot]
+            source += self.source[slot]
+            dropped += self.dropped[slot]
+            lag_sum += self.lag_sum_ms[slot]
+            lag_max = max(lag_max, self.lag_max_ms[slot])
+        return {
+            'processed_fps': processed / span,
+            'source_fps': source / span,
+            'dropped_frames': dropped,
+            'drop_rate': dropped / source if source else 0.0,
+            'avg_lag_ms': lag_sum / processed if processed else 0.0,
+            'max_lag_ms': lag_max
+        }
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = now or time.time()
+        result = {f"{seconds}s": self.window(seconds, now) for seconds in self.WINDOWS if seconds <= self.horizon}
+        result['current_lag_ms'] = self.last_lag_ms
+        return result
+
+
+class MetricsServer:
+    """Serves GET /metrics (Prometheus text) from a daemon thread on a local port"""
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1', extra_renderers=()):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.extra_renderers = list(extra_renderers)  # callables returning more exposition text
+        self.server = None
+        self.thread = None
+        self.logger = logging.getLogger('metrics')
+
+    def start(self) -> bool:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = server.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes would flood the log
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            self.logger.error(f"Could not start metrics endpoint on {self.host}:{self.port}: {e}")
+            return False
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name='metrics-http')
+        self.thread.start()
+        self.logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def render(self) -> str:
+        text = self.registry.render_prometheus()
+        for renderer in self.extra_renderers:
+            try:
+                text += renderer()
+            except Exception as e:
+                self.logger.error(f"Metrics renderer error: {e}")
+        return text
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,138 @@
+# core/model_registry.py - NEW FILE
+# Per-camera inference profiles (weights, imgsz, confidence, IoU) and a registry
+# that loads each distinct weight file once and shares it between cameras
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional, Callable
+
+from core.inference_service import InferenceService, ServedModel
+
+
+class InferenceProfile:
+    """Detector settings for a camera; None fields fall back to the model's defaults"""
+
+    FIELDS = ('weights', 'imgsz', 'confidence', 'iou')
+
+    def __init__(self, weights: str, imgsz: Optional[int] = None, confidence: Optional[float] = None,
+                 iou: Optional[float] = None, name: str = 'custom'):
+        self.weights = weights
+        self.imgsz = imgsz
+        self.confidence = confidence
+        self.iou = iou
+        self.name = name
+
+    @classmethod
+    def from_camera_config(cls, camera_config: Dict[str, Any], config) -> 'InferenceProfile':
+        """
+        Resolve a camera's 'inference_profile': missing -> the 'default' profile,
+        a string -> a named profile from config.INFERENCE_PROFILES, a dict -> its
+        fields on top of the named 'profile' it extends (or 'default').
+        """
+        profiles = getattr(config, 'INFERENCE_PROFILES', {}) or {}
+        default = dict(profiles.get('default', {}))
+        default.setdefault('weights', config.DETECTION_MODEL_PATH)
+
+        value = camera_config.get('inference_profile')
+        if value is None:
+            return cls._build('default', default)
+
+        if isinstance(value, str):
+            if value not in profiles:
+                raise ValueError(f"Camera {camera_config.get('camera_id')}: unknown inference profile '{value}'")
+            return cls._build(value, {**default, **profiles[value]})
+
+        base_name = value.get('profile', 'default')
+        if base_name not in profiles and base_name != 'default':
+            raise ValueError(f"Camera {camera_config.get('camera_id')}: unknown inference profile '{base_name}'")
+        overrides = {key: value[key] for key in cls.FIELDS if key in value}
+        return cls._build(f"{base_name}+custom" if overrides else base_name,
+                          {**default, **profiles.get(base_name, {}), **overrides})
+
+    @classmethod
+    def _build(cls, name: str, values: Dict[str, Any]) -> 'InferenceProfile':
+        return cls(values['weights'], values.get('imgsz'), values.get('confidence'), values.get('iou'), name)
+
+    @property
+    def key(self) -> str:
+        """Identifies profiles whose detector output is interchangeable"""
+        return f"{os.path.basename(self.weights)}@{self.imgsz or 'auto'}/conf={self.confidence}/iou={self.iou}"
+
+    def model_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for the ultralytics predict call"""
+        kwargs = {}
+        if self.imgsz:
+            kwargs['imgsz'] = self.imgsz
+        if self.iou is not None:
+            kwargs['iou'] = self.iou
+        return kwargs
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'weights': self.weights, 'imgsz': self.imgsz,
+                'confidence': self.confidence, 'iou': self.iou}
+
+    def __repr__(self) -> str:
+        return f"InferenceProfile({self.name}: {self.key})"
+
+
+class ModelRegistry:
+    """
+    Loads each weight file once; cameras with the same weights share the model object.
+    With an exported backend ('onnx'/'openvino', see core.inference_backends) models
+    are also keyed by input size, since exports are built per imgsz.
+    Every model is owned by an InferenceService with `replicas` copies; callers get
+    a ServedModel proxy, so no two threads ever run the same predictor at once.
+    """
+
+    def __init__(self, model_factory: Optional[Callable[[str], Any]] = None, backend: str = 'pytorch',
+                 int8: bool = False, cache_dir: str = 'models/exported', calibration_dir: Optional[str] = None,
+                 replicas: int = 1, max_queue: int = 0):
+        self.model_factory = model_factory
+        self.replicas = max(1, replicas)
+        self.max_queue = max_queue
+        self.backend = backend
+        self.int8 = int8
+        self.cache_dir = cache_dir
+        self.calibration_dir = calibration_dir
+        self.models = {}  # {absolute weights path[@imgsz]: ServedModel}
+        self.services = {}  # {absolute weights path[@imgsz]: InferenceService}
+        self.users = {}   # {absolute weights path[@imgsz]: number of get() calls}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('model_registry')
+
+    def _load(self, weights: str, imgsz: Optional[int]):
+        if self.model_factory is not None:
+            return self.model_factory(weights)
+        from core.inference_backends import load_model
+        return load_model(weights, self.backend, imgsz, self.int8, self.cache_dir, self.calibration_dir)
+
+    def get(self, weights: str, imgsz: Optional[int] = None):
+        """Shared model for a weight file, loading it on first use"""
+        key = os.path.abspath(weights) if os.path.exists(weights) else weights
+        if self.model_factory is None and self.backend != 'pytorch':
+            key = f"{key}@{imgsz or 640}"
+        with self._lock:
+            if key not in self.models:
+                replicas = [self._load(weights, imgsz) for _ in range(self.replicas)]
+                service = InferenceService(replicas, name=os.path.basename(key), max_queue=self.max_queue)
+                self.services[key] = service
+                self.models[key] = ServedModel(service)
+                self.logger.info(f"Loaded detection model: {weights} ({self.backend}"
+                                 f"{' int8' if self.int8 and self.backend != 'pytorch' else ''}, "
+                                 f"{self.replicas} replica(s))")
+            self.users[key] = self.users.get(key, 0) + 1
+            return self.models[key]
+
+    def stop(self):
+        """Stop all inference services"""
+        with self._lock:
+            services = list(self.services.values())
+        for service in services:
+            service.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'backend': self.backend, 'int8': self.int8, 'loaded_models': len(self.models),
+                    'users': dict(self.users),
+                    'inference': {key: service.get_stats() for key, service in self.services.items()}}
@@ -25,6 +25,7 @@ from camera_models.loitering_zone_monitoring import LoiteringZoneMonitor
 
 from core.database_handler import DatabaseHandler
 from core.gcp_uploader import GCPUploader
+from core.event_priority import SeverityPriorityQueue, SeverityLatencyTracker, get_event_severity
 from ultralytics import YOLO
 
 # Your existing camera model mapping (unchanged)
@@ -221,10 +222,13 @@ class MultiCameraProcessor:
             'port': config.MYSQL_PORT
         })
         
+        starvation_timeout = getattr(config, 'EVENT_STARVATION_TIMEOUT', 5.0)
+        
         self.gcp_uploader = GCPUploader(
             config.GCP_CREDENTIALS_PATH,
             config.GCP_BUCKET_NAME,
-            config.GCP_PROJECT_ID
+            config.GCP_PROJECT_ID,
+            starvation_timeout=starvation_timeout
         )
         
         # Load shared YOLO model (memory efficient - one model for all cameras)
@@ -238,7 +242,12 @@ class MultiCameraProcessor:
         # Processing control
         self.running = False
         self.processing_threads = {}
-        self.event_queue = queue.Queue()
+        # Severity lanes: critical events are persisted ahead of info/warning backlog
+        self.event_queue = SeverityPriorityQueue(
+            starvation_timeout=starvation_timeout,
+            lane_maxsize=getattr(config, 'EVENT_QUEUE_SIZE', 0)
+        )
+        self.persist_latency = SeverityLatencyTracker()
         
         # Statistics
         self.global_stats = {
@@ -319,8 +328,10 @@ class MultiCameraProcessor:
                 success, result = camera_stream.process_frame()
                 
                 if success and result and result['has_events']:
-                    # Queue events for saving
-                    self.event_queue.put(result)
+                    # Queue events for saving in the lane of their severity
+                    result['severity'] = get_event_severity(result['use_case'])
+                    result['queued_at'] = time.time()
+                    self.event_queue.put(result, result['severity'])
                     
                     # Update global statistics
                     self.global_stats['total_events'] += 1
@@ -344,11 +355,12 @@ class MultiCameraProcessor:
         
         while self.running or not self.event_queue.empty():
             try:
-                # Get event from queue (with timeout)
-                result = self.event_queue.get(timeout=1.0)
+                # Get event from queue (with timeout) - highest severity first
+                result, severity, _ = self.event_queue.get_with_info(timeout=1.0)
                 
                 # Save event using your existing logic
                 self._save_camera_event(result)
+                self.persist_latency.record(severity, time.time() - result['queued_at'])
                 
                 # Mark task as done
                 self.event_queue.task_done()
@@ -490,7 +502,12 @@ class MultiCameraProcessor:
         print("="*80)
         print(f" Active cameras: {self.global_stats['active_cameras']}/{self.global_stats['total_cameras']}")
         print(f" Total events: {self.global_stats['total_events']}")
-        print(f" Pending events: {self.event_queue.qsize()}")
+        print(f" Pending events: {self.event_queue.qsize()} {self.event_queue.lane_sizes()}")
+        
+        critical_latency = self.persist_latency.get_stats()['critical']
+        if critical_latency['count']:
+            print(f" Critical persist latency: avg {critical_latency['avg_ms']:.0f}ms | "
+                  f"max {critical_latency['max_ms']:.0f}ms | last {critical_latency['last_ms']:.0f}ms")
         
         print("\n Events by camera:")
         for camera_id, count in self.global_stats['events_by_camera'].items():
@@ -518,6 +535,8 @@ class MultiCameraProcessor:
         return {
             'global_stats': self.global_stats,
             'camera_stats': camera_stats,
+            'event_queue': self.event_queue.get_lane_stats(),
+            'persist_latency_by_severity': self.persist_latency.get_stats(),
             'gcp_stats': self.gcp_uploader.get_upload_stats()
         }
 
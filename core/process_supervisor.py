@@ -0,0 +1,367 @@
+# core/process_supervisor.py - NEW FILE
+# Process-sharded execution of camera groups across CPU cores
+#
+# Each worker process runs its own FlexibleMultiCameraProcessor (own YOLO model,
+# own trackers, own DB/GCP connections) for a shard of the cameras, so Python
+# post-processing is no longer limited to one core by the GIL. The supervisor
+# routes enable/disable commands to the owning worker, merges stats and event
+# summaries coming back over IPC and restarts workers that crash.
+
+import os
+import time
+import queue
+import logging
+import itertools
+import threading
+import multiprocessing
+from collections import defaultdict, deque
+from typing import Dict, List, Any
+
+from core.shared_stream import normalize_stream_url
+
+
+def shard_camera_configs(camera_configs: List[Dict[str, Any]], num_shards: int) -> List[List[Dict[str, Any]]]:
+    """Split cameras into shards, balancing by number of enabled use cases"""
+    # Logical cameras on the same physical stream stay together so they can share it
+    groups = defaultdict(list)
+    for camera_config in camera_configs:
+        groups[normalize_stream_url(camera_config['stream_url'])].append(camera_config)
+
+    num_shards = max(1, min(num_shards, len(groups)))
+    shards = [[] for _ in range(num_shards)]
+    loads = [0] * num_shards
+
+    def group_load(group):
+        return sum(max(1, len(c.get('enabled_use_cases', []))) for c in group)
+
+    # Heaviest groups first, each to the currently lightest shard
+    for group in sorted(groups.values(), key=group_load, reverse=True):
+        shard_id = loads.index(min(loads))
+        shards[shard_id].extend(group)
+        loads[shard_id] += group_load(group)
+
+    return shards
+
+
+def _shard_worker_main(shard_id: int, camera_configs: List[Dict[str, Any]],
+                       command_queue, status_queue, stats_interval: float):
+    """Entry point of a shard worker process"""
+    from logger import configure_async_logging
+    configure_async_logging(logging.INFO, f'%(asctime)s - shard{shard_id} - %(name)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(f'shard_worker_{shard_id}')
+
+    from config.multi_camera_config import MultiCameraConfig
+    from core.flexible_multi_camera_processor import FlexibleMultiCameraProcessor
+
+    processor = FlexibleMultiCameraProcessor(MultiCameraConfig)
+    if processor.metrics_port:
+        processor.metrics_port += 1 + shard_id  # the supervisor's port stays free; each shard gets its own
+    processor.event_listener = lambda event: status_queue.put({'type': 'event', 'shard_id': shard_id, 'event': event})
+    processor.load_camera_configurations(camera_configs)
+    processor.start_workers()
+
+    status_queue.put({'type': 'started', 'shard_id': shard_id, 'pid': os.getpid(),
+                      'cameras': [c['camera_id'] for c in camera_configs]})
+    logger.info(f"Shard {shard_id} running {len(camera_configs)} cameras in pid {os.getpid()}")
+
+    last_stats_time = 0.0
+    try:
+        while processor.running:
+            try:
+                command = command_queue.get(timeout=min(1.0, stats_interval))
+            except queue.Empty:
+                command = None
+
+            if command is not None:
+                action = command.get('action')
+                if action == 'stop':
+                    break
+                elif action == 'enable':
+                    success = processor.enable_use_case_for_camera(command['camera_id'], command['use_case'])
+                elif action == 'disable':
+                    success = processor.disable_use_case_for_camera(command['camera_id'], command['use_case'])
+                else:
+                    logger.warning(f"Unknown command: {command}")
+                    success = False
+
+                status_queue.put({'type': 'command_result', 'shard_id': shard_id,
+                                  'command': command, 'success': success})
+
+            if time.time() - last_stats_time >= stats_interval:
+                status_queue.put({'type': 'stats', 'shard_id': shard_id, 'pid': os.getpid(),
+                                  'stats': processor.get_camera_stats()})
+                last_stats_time = time.time()
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processor.stop()
+        status_queue.put({'type': 'stopped', 'shard_id': shard_id, 'pid': os.getpid()})
+
+
+class ShardedProcessorSupervisor:
+    """
+    Supervisor that splits cameras across N worker processes.
+    Exposes the same control surface as FlexibleMultiCameraProcessor.
+    """
+
+    def __init__(self, config, num_workers: int):
+        self.config = config
+        self.num_workers = max(1, num_workers)
+        self.stats_interval = getattr(config, 'WORKER_STATS_INTERVAL', 5.0)
+        self.restart_delay = getattr(config, 'WORKER_RESTART_DELAY', 5.0)
+        self.command_timeout = getattr(config, 'WORKER_COMMAND_TIMEOUT', 10.0)
+
+        self.logger = logging.getLogger(__name__)
+
+        # spawn: workers must not inherit a forked copy of threads/model state
+        self.mp_context = multiprocessing.get_context('spawn')
+        self.status_queue = self.mp_context.Queue()
+
+        self.shard_configs = []  # [shard_id] -> list of camera configs (kept current for restarts)
+        self.camera_to_shard = {}  # {camera_id: shard_id}
+        self.workers = {}  # {shard_id: {'process', 'command_queue', 'restarts', 'started_at', ...}}
+
+        self.worker_stats = {}  # {shard_id: latest stats snapshot}
+        self.recent_events = deque(maxlen=500)
+        self.event_counts = defaultdict(int)  # {use_case: persisted events}
+
+        # Commands waiting for the worker's reply: {command_id: {'command', 'done', 'success'}}
+        self.pending_commands = {}
+        self._command_ids = itertools.count(1)
+        self._status_lock = threading.Lock()  # the supervisor loop and command callers both drain
+
+        self.running = False
+
+    def load_camera_configurations(self, camera_configs: List[Dict[str, Any]]):
+        """Assign camera configurations to worker shards"""
+        self.shard_configs = shard_camera_configs(camera_configs, self.num_workers)
+        self.camera_to_shard = {}
+
+        for shard_id, shard in enumerate(self.shard_configs):
+            for camera_config in shard:
+                self.camera_to_shard[camera_config['camera_id']] = shard_id
+            self.logger.info(f"Shard {shard_id}: {[c['camera_id'] for c in shard]}")
+
+    def _spawn_worker(self, shard_id: int):
+        """Start (or restart) the worker process for a shard"""
+        previous = self.workers.get(shard_id, {})
+        command_queue = self.mp_context.Queue()
+
+        process = self.mp_context.Process(
+            target=_shard_worker_main,
+            args=(shard_id, self.shard_configs[shard_id], command_queue,
+                  self.status_queue, self.stats_interval),
+            name=f'camera_shard_{shard_id}',
+            daemon=False
+        )
+        process.start()
+
+        self.workers[shard_id] = {
+            'process': process,
+            'command_queue': command_queue,
+            'restarts': previous.get('restarts', -1) + 1,
+            'started_at': time.time(),
+            'died_at': None
+        }
+        self.logger.info(f"Started shard {shard_id} worker (pid {process.pid})")
+
+    def start(self):
+        """Start all shard workers (non-blocking)"""
+        self.running = True
+        for shard_id in range(len(self.shard_configs)):
+            self._spawn_worker(shard_id)
+
+    def _send_command(self, camera_id: str, action: str, use_case: str) -> bool:
+        """Route a command to the worker that owns the camera and wait for its verdict"""
+        shard_id = self.camera_to_shard.get(camera_id)
+        if shard_id is None or shard_id not in self.workers or not self.workers[shard_id]['process'].is_alive():
+            return False
+
+        command = {'id': next(self._command_ids), 'action': action, 'camera_id': camera_id, 'use_case': use_case}
+        pending = {'command': command, 'done': threading.Event(), 'success': False}
+        self.pending_commands[command['id']] = pending
+        self.workers[shard_id]['command_queue'].put(command)
+
+        # Drain here as well, so the reply arrives even without the supervisor loop running
+        deadline = time.time() + self.command_timeout
+        while not pending['done'].wait(0.05):
+            self._drain_status_queue()
+            if time.time() >= deadline:
+                self.pending_commands.pop(command['id'], None)
+                self.logger.error(f"Shard {shard_id} did not answer command {command} "
+                                  f"within {self.command_timeout}s")
+                return False
+        return pending['success']
+
+    def _apply_command(self, shard_id: int, command: Dict[str, Any]):
+        """Mirror a command the worker accepted into the shard config, so a restarted worker matches"""
+        for camera_config in self.shard_configs[shard_id]:
+            if camera_config['camera_id'] == command['camera_id']:
+                enabled = camera_config.setdefault('enabled_use_cases', [])
+                if command['action'] == 'enable' and command['use_case'] not in enabled:
+                    enabled.append(command['use_case'])
+                elif command['action'] == 'disable' and command['use_case'] in enabled:
+                    enabled.remove(command['use_case'])
+
+    def enable_use_case_for_camera(self, camera_id: str, use_case: str) -> bool:
+        """Enable a use case on the worker owning the camera"""
+        return self._send_command(camera_id, 'enable', use_case)
+
+    def disable_use_case_for_camera(self, camera_id: str, use_case: str) -> bool:
+        """Disable a use case on the worker owning the camera"""
+        return self._send_command(camera_id, 'disable', use_case)
+
+    def _drain_status_queue(self):
+        """Collect stats, events and command results sent by workers"""
+        with self._status_lock:
+            while True:
+                try:
+                    message = self.status_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._handle_status_message(message)
+
+    def _handle_status_message(self, message: Dict[str, Any]):
+        """Apply one worker message (caller holds _status_lock)"""
+        message_type = message.get('type')
+        shard_id = message.get('shard_id')
+
+        if message_type == 'stats':
+            self.worker_stats[shard_id] = message['stats']
+        elif message_type == 'event':
+            event = message['event']
+            self.recent_events.append(event)
+            self.event_counts[event['use_case']] += event.get('event_count', 1)
+        elif message_type == 'command_result':
+            command = message['command']
+            if message['success']:
+                self._apply_command(shard_id, command)
+            else:
+                self.logger.warning(f"Shard {shard_id} rejected command {command}")
+            pending = self.pending_commands.pop(command.get('id'), None)
+            if pending is not None:
+                pending['success'] = message['success']
+                pending['done'].set()
+        elif message_type in ('started', 'stopped'):
+            self.logger.info(f"Shard {shard_id} {message_type} (pid {message.get('pid')})")
+
+    def _check_workers(self):
+        """Restart workers that exited while the supervisor is running"""
+        for shard_id, worker in self.workers.items():
+            process = worker['process']
+            if process.is_alive():
+                continue
+
+            if worker['died_at'] is None:
+                worker['died_at'] = time.time()
+                self.logger.error(f"Shard {shard_id} worker (pid {process.pid}) exited with code {process.exitcode}")
+
+            if time.time() - worker['died_at'] >= self.restart_delay:
+                self.logger.warning(f"Restarting shard {shard_id} worker")
+                self._spawn_worker(shard_id)
+
+    def get_camera_stats(self) -> Dict[str, Any]:
+        """Merged statistics from all workers"""
+        global_stats = {
+            'total_cameras': 0,
+            'active_cameras': 0,
+            'total_events': 0,
+            'events_by_camera': defaultdict(int),
+            'events_by_use_case': defaultdict(int)
+        }
+        camera_stats = {}
+
+        for stats in self.worker_stats.values():
+            worker_global = stats.get('global_stats', {})
+            for key in ('total_cameras', 'active_cameras', 'total_events'):
+                global_stats[key] += worker_global.get(key, 0)
+            for key in ('events_by_camera', 'events_by_use_case'):
+                for name, count in worker_global.get(key, {}).items():
+                    global_stats[key][name] += count
+            camera_stats.update(stats.get('camera_stats', {}))
+
+        workers = {}
+        for shard_id, worker in self.workers.items():
+            workers[shard_id] = {
+                'pid': worker['process'].pid,
+                'alive': worker['process'].is_alive(),
+                'restarts': worker['restarts'],
+                'cameras': [c['camera_id'] for c in self.shard_configs[shard_id]],
+                'uptime_seconds': time.time() - worker['started_at']
+            }
+
+        return {
+            'global_stats': global_stats,
+            'camera_stats': camera_stats,
+            'persisted_events_by_use_case': dict(self.event_counts),
+            'workers': workers
+        }
+
+    def _print_global_stats(self):
+        """Print merged statistics"""
+        stats = self.get_camera_stats()
+        global_stats = stats['global_stats']
+
+        print("\n" + "="*80)
+        print(f" SHARDED MULTI-CAMERA PROCESSING STATS ({len(self.workers)} worker processes)")
+        print("="*80)
+        print(f" Active cameras: {global_stats['active_cameras']}/{global_stats['total_cameras']}")
+        print(f" Total events: {global_stats['total_events']}")
+
+        print("\n Workers:")
+        for shard_id, worker in stats['workers'].items():
+            status = 'alive' if worker['alive'] else 'DOWN'
+            print(f"   shard {shard_id} (pid {worker['pid']}): {status} | restarts: {worker['restarts']} | "
+                  f"cameras: {', '.join(worker['cameras'])}")
+
+        print("\n Camera Status:")
+        for camera_id, camera in stats['camera_stats'].items():
+            print(f"   {camera_id}: {camera['connection_status']} | FPS: {camera['current_fps']:.1f} | "
+                  f"Events: {camera['total_events']}")
+
+        print("="*80)
+
+    def start_processing(self):
+        """Start workers and supervise them until interrupted"""
+        self.logger.info(f"Starting sharded processing with {len(self.shard_configs)} worker processes...")
+        self.start()
+
+        try:
+            last_stats_time = time.time()
+
+            while self.running:
+                self._drain_status_queue()
+                self._check_workers()
+
+                if time.time() - last_stats_time > 10:
+                    self._print_global_stats()
+                    last_stats_time = time.time()
+
+                time.sleep(0.5)
+
+        except KeyboardInterrupt:
+            self.logger.info("Received interrupt signal")
+
+        self.stop()
+
+    def stop(self, timeout: float = 15.0):
+        """Stop all workers, terminating any that do not exit in time"""
+        self.logger.info("Stopping shard workers...")
+        self.running = False
+
+        for worker in self.workers.values():
+            if worker['process'].is_alive():
+                worker['command_queue'].put({'action': 'stop'})
+
+        deadline = time.time() + timeout
+        for shard_id, worker in self.workers.items():
+            process = worker['process']
+            process.join(timeout=max(0.0, deadline - time.time()))
+            if process.is_alive():
+                self.logger.warning(f"Shard {shard_id} did not stop in time, terminating")
+                process.terminate()
+                process.join(timeout=2.0)
+
+        self._drain_status_queue()
+        self.logger.info("Sharded processing stopped")
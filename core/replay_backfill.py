@@ -0,0 +1,154 @@
+# core/replay_backfill.py - NEW FILE
+# Re-run the pipeline over recorded footage, spread across a process pool
+#
+# Every job is one camera config whose stream_url is a replay:// source, run by
+# a FlexibleMultiCameraProcessor in a worker process until the recording ends.
+# With one process a directory is replayed as a single continuous stream; with
+# more, each file becomes its own job (tracks and dwell timers restart at file
+# boundaries). Event times come from the recordings, events go to EVENT_SINK
+# (local by default), so a day of footage can be re-checked against new rule
+# settings, and a fixed recording doubles as a deterministic workload.
+# A detection recording (core/detection_recording.py) as input replays the
+# recorded boxes instead: no decoding and no model, just tracking and use cases.
+
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from urllib.parse import quote
+
+from core.frame_sources import ReplayCapture
+from core.detection_recording import is_detection_recording
+
+logger = logging.getLogger('replay_backfill')
+
+
+def replay_url(path: str, speed: float = 0.0) -> str:
+    """replay:// URL for a file or directory"""
+    return f"replay://{quote(os.path.abspath(path))}?speed={speed:g}"
+
+
+def replay_jobs(camera_config: Dict[str, Any], input_path: str, processes: int = 1,
+                speed: float = 0.0) -> List[Dict[str, Any]]:
+    """Camera configs to run: the whole input as one job, or one per file when running in parallel"""
+    if is_detection_recording(input_path):
+        return [dict(camera_config, stream_url=f"detections://{quote(os.path.abspath(input_path))}",
+                     decoder_process=False, share_stream=False, replay_path=input_path)]
+    files = ReplayCapture.expand(input_path)
+    if not files:
+        return []
+    paths = files if processes > 1 and len(files) > 1 else [input_path]
+    jobs = []
+    for path in paths:
+        job = dict(camera_config)
+        job['stream_url'] = replay_url(path, speed)
+        job['decoder_process'] = False
+        job['share_stream'] = False
+        job['replay_path'] = path
+        jobs.append(job)
+    return jobs
+
+
+def _init_replay_worker():
+    from logger import configure_async_logging
+    configure_async_logging(logging.INFO, f'%(asctime)s - replay{os.getpid()} - %(name)s - %(levelname)s - %(message)s')
+
+
+def run_replay_job(camera_config: Dict[str, Any], config_overrides: Optional[Dict[str, Any]] = None,
+                   detector: str = 'yolo', stub_latency_ms: float = 0.0) -> Dict[str, Any]:
+    """Replay one job to the end in this process and return its counts"""
+    from config.multi_camera_config import MultiCameraConfig
+    from core.flexible_multi_camera_processor import FlexibleMultiCameraProcessor
+
+    config = type('ReplayConfig', (MultiCameraConfig,), {'METRICS_PORT': 0, **(config_overrides or {})})
+    model_factory = None
+    if detector == 'stub' or camera_config['stream_url'].startswith('detections://'):
+        from core.benchmark import ReplayDetector
+        model_factory = lambda weights: ReplayDetector(latency_ms=stub_latency_ms)
+
+    camera_id = camera_config['camera_id']
+    started = time.time()
+    processor = FlexibleMultiCameraProcessor(config, model_factory=model_factory)
+    processor.load_camera_configurations([camera_config])
+    processor.start_workers()
+    try:
+        processor.wait_for_replays()
+    finally:
+        camera_stream = processor.camera_streams[camera_id]
+        replay_stats = camera_stream.cap.get_stats() if hasattr(camera_stream.cap, 'get_stats') else {}
+        processor.stop()
+    elapsed = time.time() - started
+
+    snapshot = processor.counters.snapshot()
+    frames = snapshot.get('frames', camera_id)
+    return {
+        'path': camera_config.get('replay_path'),
+        'camera_id': camera_id,
+        'frames': frames,
+        'events': snapshot.get('events', camera_id),
+        'events_by_use_case': snapshot.by_label('use_case_events', prefix=camera_id),
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed else 0.0,
+        'files': replay_stats.get('files'),
+        'media_end': replay_stats.get('media_time'),
+        'pid': os.getpid()
+    }
+
+
+def run_backfill(camera_config: Dict[str, Any], input_path: str, processes: int = 1, speed: float = 0.0,
+                 sink: str = 'local', detector: str = 'yolo', stub_latency_ms: float = 0.0,
+                 progress=None) -> Dict[str, Any]:
+    """Replay input_path (file or directory) for one camera's zones/rules across `processes` workers"""
+    jobs = replay_jobs(camera_config, input_path, processes, speed)
+    if not jobs:
+        raise ValueError(f"No video files found in {input_path}")
+
+    overrides = {'EVENT_SINK': sink}
+    started_at = datetime.now()
+    started = time.time()
+    results = []
+    if processes <= 1:
+        for job in jobs:
+            results.append(run_replay_job(job, overrides, detector, stub_latency_ms))
+            if progress is not None:
+                progress(results[-1], len(results), len(jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs)),
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_replay_worker) as pool:
+            futures = {pool.submit(run_replay_job, job, overrides, detector, stub_latency_ms): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Replay of {futures[future]['replay_path']} failed: {e}")
+                    result = {'path': futures[future]['replay_path'], 'error': str(e), 'frames': 0, 'events': 0}
+                results.append(result)
+                if progress is not None:
+                    progress(result, len(results), len(jobs))
+    elapsed = time.time() - started
+
+    results.sort(key=lambda result: result['path'] or '')
+    frames = sum(result['frames'] for result in results)
+    events_by_use_case = {}
+    for result in results:
+        for use_case, count in result.get('events_by_use_case', {}).items():
+            events_by_use_case[use_case] = events_by_use_case.get(use_case, 0) + count
+    return {
+        'started_at': started_at.isoformat(),
+        'input': input_path,
+        'camera_id': camera_config['camera_id'],
+        'processes': processes,
+        'speed': speed,
+        'sink': sink,
+        'jobs': results,
+        'failed_jobs': sum(1 for result in results if 'error' in result),
+        'frames': frames,
+        'events': sum(result['events'] for result in results),
+        'events_by_use_case': events_by_use_case,
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed else 0.0
+    }
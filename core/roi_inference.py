@@ -0,0 +1,102 @@
+# core/roi_inference.py - NEW FILE
+# Zone-ROI cropped inference: detect only inside the padded rectangles around enabled zones
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # x1, y1, x2, y2 (x2/y2 exclusive)
+
+
+def collect_zone_polygons(zones_config: Dict[str, Any], use_cases: Iterable[str]) -> Optional[List[List[List[float]]]]:
+    """
+    Zone polygons of the given use cases, or None if any of them has no zones
+    (that use case needs the full frame).
+    Accepts flexible configs ({use_case: {zone_type: [zone, ...]}}) and flat
+    legacy configs ({zone_type: [zone, ...]}).
+    """
+    polygons = []
+    for use_case in use_cases:
+        use_case_zones = zones_config.get(use_case, zones_config) if zones_config else {}
+        found = False
+        for zone_list in (use_case_zones or {}).values():
+            if not isinstance(zone_list, list):
+                continue
+            for zone in zone_list:
+                coordinates = zone.get('coordinates') if isinstance(zone, dict) else zone
+                if coordinates and len(coordinates) >= 3:
+                    polygons.append([list(map(float, point)) for point in coordinates])
+                    found = True
+        if not found:
+            return None
+    return polygons
+
+
+def _area(rect: Rect) -> int:
+    return max(0, rect[2] - rect[0]) * max(0, rect[3] - rect[1])
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def compute_rois(polygons: List[List[List[float]]], frame_shape: Tuple[int, ...], padding: int = 32,
+                 merge_ratio: float = 1.3) -> List[Rect]:
+    """
+    Padded bounding rectangles of the zones, clipped to the frame.
+    Two rectangles are merged when their union is not much larger than the two
+    crops separately (union area <= merge_ratio * sum of areas), so nearby zones
+    become one crop and distant zones stay separate crops.
+    """
+    height, width = frame_shape[:2]
+    rects = []
+    for polygon in polygons:
+        points = np.asarray(polygon, dtype=np.float32)
+        x1 = int(max(0, np.floor(points[:, 0].min()) - padding))
+        y1 = int(max(0, np.floor(points[:, 1].min()) - padding))
+        x2 = int(min(width, np.ceil(points[:, 0].max()) + padding))
+        y2 = int(min(height, np.ceil(points[:, 1].max()) + padding))
+        if x2 > x1 and y2 > y1:
+            rects.append((x1, y1, x2, y2))
+
+    merged = True
+    while merged and len(rects) > 1:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                union = _union(rects[i], rects[j])
+                if _area(union) <= merge_ratio * (_area(rects[i]) + _area(rects[j])):
+                    rects[i] = union
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return rects
+
+
+class RoiPlanner:
+    """Caches crop rectangles per (frame size, zones) and decides when cropping is worth it"""
+
+    def __init__(self, padding: int = 32, merge_ratio: float = 1.3, max_coverage: float = 0.8):
+        self.padding = padding
+        self.merge_ratio = merge_ratio
+        self.max_coverage = max_coverage  # above this fraction of the frame, just run the full frame
+        self._cache = {}
+
+    def plan(self, polygons, frame_shape) -> Optional[List[Rect]]:
+        """Crop rectangles for a frame, or None to run on the full frame"""
+        if not polygons:
+            return None
+
+        key = (frame_shape[:2], tuple(tuple(map(tuple, polygon)) for polygon in polygons))
+        if key not in self._cache:
+            rects = compute_rois(polygons, frame_shape, self.padding, self.merge_ratio)
+            frame_area = frame_shape[0] * frame_shape[1]
+            if not rects or sum(_area(rect) for rect in rects) >= self.max_coverage * frame_area:
+                rects = None
+            if len(self._cache) > 64:
+                self._cache.clear()
+            self._cache[key] = rects
+        return self._cache[key]
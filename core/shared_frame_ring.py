@@ -0,0 +1,406 @@
+# core/shared_frame_ring.py - NEW FILE
+# Shared-memory frame transport between decoder processes and analysis workers
+#
+# A SharedFrameRing is one multiprocessing.shared_memory block per camera:
+#   [header][slot metadata x N][frame slot x N]
+# The decoder process writes frames straight into a slot (cv2 decodes into the
+# shared buffer when the frame shape matches) and the consumer gets zero-copy
+# NumPy views, so 1080p frames never get pickled through a multiprocessing.Queue.
+#
+# Single writer / single reader per ring. Each slot has a seqlock-style version
+# (odd while being written) and the reader pins the slot it is using so the
+# writer skips it until the next read. Pinning and claiming race (the writer can
+# read the pin just before the reader sets it), so both sides re-check: the
+# writer backs off a slot that got pinned after it marked it odd, and the reader
+# re-validates the slot version once it is done with the view (validate_pin).
+
+import time
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, Dict, Any
+
+import numpy as np
+
+HEADER_DTYPE = np.dtype([
+    ('latest_seq', 'i8'),     # sequence number of the newest complete frame (-1 = none yet)
+    ('latest_slot', 'i8'),    # slot holding latest_seq
+    ('reader_slot', 'i8'),    # slot pinned by the consumer (-1 = none)
+    ('writer_status', 'i8'),  # see WRITER_* below
+    ('frames_written', 'i8'),
+    ('read_errors', 'i8'),
+])
+
+SLOT_META_DTYPE = np.dtype([
+    ('version', 'u8'),        # odd while the writer is filling the slot
+    ('seq', 'i8'),
+    ('timestamp', 'f8'),      # capture time (time.time()) in the decoder process
+    ('height', 'i4'),
+    ('width', 'i4'),
+    ('channels', 'i4'),
+    ('_pad', 'i4'),
+])
+
+WRITER_STARTING = 0
+WRITER_RUNNING = 1
+WRITER_RECONNECTING = 2
+WRITER_STOPPED = 3
+WRITER_FAILED = 4
+
+_ALIGN = 64
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SharedFrameRing:
+    """Fixed-size ring of frame slots in shared memory"""
+
+    def __init__(self, name: Optional[str], num_slots: int, max_height: int, max_width: int,
+                 channels: int = 3, create: bool = True):
+        self.num_slots = num_slots
+        self.max_height = max_height
+        self.max_width = max_width
+        self.channels = channels
+        self.slot_bytes = _align(max_height * max_width * channels)
+
+        self._meta_offset = _align(HEADER_DTYPE.itemsize)
+        self._frames_offset = _align(self._meta_offset + SLOT_META_DTYPE.itemsize * num_slots)
+        total_size = self._frames_offset + self.slot_bytes * num_slots
+
+        self.created = create
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=total_size if create else 0)
+        self.name = self.shm.name
+
+        buf = self.shm.buf
+        self.header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=buf, offset=0)
+        self.meta = np.ndarray((num_slots,), dtype=SLOT_META_DTYPE, buffer=buf, offset=self._meta_offset)
+        self._frames = np.ndarray((num_slots, self.slot_bytes), dtype=np.uint8,
+                                  buffer=buf, offset=self._frames_offset)
+
+        if create:
+            self.header['latest_seq'] = -1
+            self.header['latest_slot'] = -1
+            self.header['reader_slot'] = -1
+            self.header['writer_status'] = WRITER_STARTING
+            self.header['frames_written'] = 0
+            self.header['read_errors'] = 0
+            self.meta[:] = 0
+
+        # Writer-side state
+        self._next_slot = 0
+        self._next_seq = 0
+
+        # Reader-side state: slot and version of the pinned frame
+        self._pinned_slot = -1
+        self._pinned_version = 0
+
+    def describe(self) -> Dict[str, Any]:
+        """Arguments needed to attach to this ring from another process"""
+        return {
+            'name': self.name,
+            'num_slots': self.num_slots,
+            'max_height': self.max_height,
+            'max_width': self.max_width,
+            'channels': self.channels
+        }
+
+    @classmethod
+    def attach(cls, description: Dict[str, Any]) -> 'SharedFrameRing':
+        """Attach to an existing ring created by another process"""
+        return cls(create=False, **description)
+
+    def slot_view(self, slot: int, height: int, width: int, channels: Optional[int] = None) -> np.ndarray:
+        """Zero-copy (height, width, channels) uint8 view into a slot"""
+        channels = channels or self.channels
+        size = height * width * channels
+        return self._frames[slot, :size].reshape(height, width, channels)
+
+    def fits(self, height: int, width: int, channels: int) -> bool:
+        return height * width * channels <= self.slot_bytes
+
+    # ----- writer side -----
+
+    def begin_write(self, height: int, width: int, channels: Optional[int] = None) -> Tuple[int, np.ndarray]:
+        """Reserve the next free slot and return (slot, view) to decode into"""
+        channels = channels or self.channels
+        slot = self._next_slot
+        for _ in range(self.num_slots):
+            if slot != int(self.header['reader_slot'][0]):
+                meta = self.meta[slot:slot + 1]
+                meta['version'] += 1  # odd: slot is being written
+                # The reader may have pinned it between the check and the mark
+                if slot != int(self.header['reader_slot'][0]):
+                    break
+                meta['version'] -= 1  # untouched - back to its stable version
+            slot = (slot + 1) % self.num_slots
+        else:
+            self.meta[slot:slot + 1]['version'] += 1  # single-slot ring: nothing else to write into
+        self._next_slot = (slot + 1) % self.num_slots
+
+        meta = self.meta[slot:slot + 1]
+        meta['height'] = height
+        meta['width'] = width
+        meta['channels'] = channels
+        return slot, self.slot_view(slot, height, width, channels)
+
+    def commit_write(self, slot: int, timestamp: float) -> int:
+        """Publish a slot filled after begin_write; returns its sequence number"""
+        seq = self._next_seq
+        self._next_seq += 1
+
+        meta = self.meta[slot:slot + 1]
+        meta['seq'] = seq
+        meta['timestamp'] = timestamp
+        meta['version'] += 1  # even: slot is stable
+
+        self.header['latest_slot'] = slot
+        self.header['latest_seq'] = seq
+        self.header['frames_written'] += 1
+        return seq
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Copy a frame into the ring (used when it could not be decoded in place)"""
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        slot, view = self.begin_write(height, width, channels)
+        np.copyto(view, frame.reshape(height, width, channels))
+        return self.commit_write(slot, timestamp if timestamp is not None else time.time())
+
+    def set_writer_status(self, status: int):
+        self.header['writer_status'] = status
+
+    # ----- reader side -----
+
+    @property
+    def latest_seq(self) -> int:
+        return int(self.header['latest_seq'][0])
+
+    @property
+    def writer_status(self) -> int:
+        return int(self.header['writer_status'][0])
+
+    def read_latest(self, after_seq: int = -1) -> Optional[Tuple[np.ndarray, int, float]]:
+        """
+        Pin and return (view, seq, timestamp) of the newest frame newer than after_seq.
+        The view stays valid until the next read_latest()/release_pin() call; check
+        validate_pin() after using it.
+        """
+        for _ in range(self.num_slots + 1):
+            seq = int(self.header['latest_seq'][0])
+            if seq <= after_seq:
+                return None
+            slot = int(self.header['latest_slot'][0])
+
+            # Pin first, then confirm the writer did not start on this slot meanwhile
+            self.header['reader_slot'] = slot
+            meta = self.meta[slot]
+            version = int(meta['version'])
+            if version % 2 == 0 and int(meta['seq']) == seq:
+                self._pinned_slot, self._pinned_version = slot, version
+                view = self.slot_view(slot, int(meta['height']), int(meta['width']), int(meta['channels']))
+                return view, seq, float(meta['timestamp'])
+
+        return None
+
+    def validate_pin(self) -> bool:
+        """True if the pinned frame was not overwritten while the reader used it"""
+        if self._pinned_slot < 0:
+            return False
+        return int(self.meta[self._pinned_slot]['version']) == self._pinned_version
+
+    def release_pin(self):
+        self.header['reader_slot'] = -1
+        self._pinned_slot = -1
+
+    def close(self):
+        """Detach from the shared memory block (views must not be used afterwards)"""
+        self.header = None
+        self.meta = None
+        self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping is released when it is collected
+            pass
+
+    def unlink(self):
+        """Destroy the shared memory block (creator only)"""
+        if self.created:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _decoder_process_main(stream_url: str, ring_description: Dict[str, Any], stop_event,
+                          reconnect_delay: float, max_fps: float):
+    """Decoder process: read frames from cv2.VideoCapture straight into the ring"""
+    import cv2
+
+    logger = logging.getLogger('frame_decoder')
+    ring = SharedFrameRing.attach(ring_description)
+    min_interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+
+    cap = None
+    last_write = 0.0
+    frame_shape = None  # (height, width, channels) of the last decoded frame
+    try:
+        while not stop_event.is_set():
+            if cap is None or not cap.isOpened():
+                from core.frame_sources import open_frame_source
+                cap = open_frame_source(stream_url) or cv2.VideoCapture(stream_url)
+                if not cap.isOpened():
+                    ring.set_writer_status(WRITER_RECONNECTING)
+                    from core.shared_stream import redact_stream_url
+                    logger.warning(f"Decoder could not open {redact_stream_url(stream_url)}, retrying in {reconnect_delay}s")
+                    stop_event.wait(reconnect_delay)
+                    continue
+                ring.set_writer_status(WRITER_RUNNING)
+
+            if not cap.grab():
+                ring.header['read_errors'] += 1
+                cap.release()
+                cap = None
+                continue
+
+            if min_interval and time.time() - last_write < min_interval:
+                continue  # grab() keeps the stream current without decoding skipped frames
+
+            timestamp = time.time()
+            last_write = timestamp
+
+            # Decode into the next slot; cv2 only reuses the buffer if shape/dtype match
+            if frame_shape is not None:
+                slot, view = ring.begin_write(*frame_shape)
+                ret, frame = cap.retrieve(image=view)
+                if ret and frame is not None and frame.ctypes.data == view.ctypes.data:
+                    ring.commit_write(slot, timestamp)
+                    continue
+                # Shape changed (or decode failed): mark the slot stable but empty
+                ring.meta[slot:slot + 1]['seq'] = -1
+                ring.meta[slot:slot + 1]['version'] += 1
+            else:
+                ret, frame = cap.retrieve()
+            if not ret or frame is None:
+                continue
+
+            frame_shape = (frame.shape[0], frame.shape[1], frame.shape[2] if frame.ndim == 3 else 1)
+            if not ring.fits(*frame_shape):
+                logger.error(f"Frame {frame.shape} does not fit ring slots "
+                             f"({ring.max_height}x{ring.max_width}x{ring.channels})")
+                ring.set_writer_status(WRITER_FAILED)
+                break
+            ring.write(frame, timestamp)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cap is not None:
+            cap.release()
+        if ring.writer_status != WRITER_FAILED:
+            ring.set_writer_status(WRITER_STOPPED)
+        ring.close()
+
+
+class SharedRingCapture:
+    """
+    cv2.VideoCapture-like reader backed by a decoder process and a SharedFrameRing.
+    read() returns zero-copy views that stay valid until the next read().
+    """
+
+    def __init__(self, stream_url: str, num_slots: int = 4, max_height: int = 1080, max_width: int = 1920,
+                 open_timeout: float = 10.0, read_timeout: float = 5.0,
+                 reconnect_delay: float = 2.0, max_fps: float = 0.0):
+        self.stream_url = stream_url
+        self.read_timeout = read_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.ring = SharedFrameRing(None, num_slots, max_height, max_width, create=True)
+        self.last_seq = -1
+        self.last_timestamp = 0.0
+        self.frames_read = 0
+        self.frames_skipped = 0
+        self.frames_torn = 0
+
+        context = multiprocessing.get_context('spawn')
+        self.stop_event = context.Event()
+        self.process = context.Process(
+            target=_decoder_process_main,
+            args=(stream_url, self.ring.describe(), self.stop_event, reconnect_delay, max_fps),
+            name=f'frame_decoder_{self.ring.name}',
+            daemon=True
+        )
+        self.process.start()
+
+        # Block like cv2.VideoCapture() until the first frame arrives (or the decoder gives up)
+        deadline = time.time() + open_timeout
+        while time.time() < deadline and self.ring.latest_seq < 0 and self.process.is_alive():
+            if self.ring.writer_status == WRITER_FAILED:
+                break
+            time.sleep(0.01)
+
+    def isOpened(self) -> bool:
+        return (self.ring is not None and self.process.is_alive()
+                and self.ring.writer_status not in (WRITER_FAILED, WRITER_STOPPED)
+                and self.ring.latest_seq >= 0)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the newest frame not yet read, waiting up to read_timeout"""
+        if self.ring is None:
+            return False, None
+
+        deadline = time.time() + self.read_timeout
+        while True:
+            latest = self.ring.read_latest(self.last_seq)
+            if latest is not None:
+                frame, seq, timestamp = latest
+                if self.last_seq >= 0:
+                    self.frames_skipped += seq - self.last_seq - 1
+                self.last_seq = seq
+                self.last_timestamp = timestamp
+                self.frames_read += 1
+                return True, frame
+
+            if time.time() >= deadline or not self.process.is_alive():
+                return False, None
+            time.sleep(0.002)
+
+    def frame_valid(self) -> bool:
+        """Whether the frame from the last read() stayed intact until now (else drop its results)"""
+        if self.ring is None:
+            return False
+        if self.ring.validate_pin():
+            return True
+        self.frames_torn += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Decoder/transport statistics"""
+        if self.ring is None:
+            return {}
+        return {
+            'decoder_pid': self.process.pid,
+            'frames_decoded': int(self.ring.header['frames_written'][0]),
+            'frames_read': self.frames_read,
+            'frames_skipped': self.frames_skipped,
+            'frames_torn': self.frames_torn,
+            'decode_errors': int(self.ring.header['read_errors'][0]),
+            'frame_age_ms': (time.time() - self.last_timestamp) * 1000 if self.last_timestamp else None
+        }
+
+    def release(self):
+        """Stop the decoder process and free the shared memory"""
+        if self.ring is None:
+            return
+        self.stop_event.set()
+        self.process.join(timeout=5.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2.0)
+
+        self.ring.release_pin()
+        self.ring.close()
+        self.ring.unlink()
+        self.ring = None
@@ -0,0 +1,273 @@
+# core/shared_stream.py - NEW FILE
+# One decoder and one YOLO pass per physical stream, fanned out to logical cameras
+#
+# Several logical cameras (different zones/rules/use cases) often point at the same
+# RTSP URL. Instead of each opening its own cv2.VideoCapture and running its own
+# detection, they subscribe to a SharedStream keyed by the normalized URL. Whichever
+# subscriber first needs a frame newer than the latest one reads and detects it;
+# the others reuse that frame and detection result.
+
+import os
+import time
+import threading
+import logging
+from typing import Dict, Any, Optional, Callable, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from core.detectors import YOLODetector, DetectionRequest
+from core.frame_preprocessor import FramePreprocessor
+from core.frame_buffer_pool import FrameBufferPool
+from core.inference_service import take_thread_timings
+from core.metrics import MetricsRegistry
+
+DEFAULT_PORTS = {'rtsp': 554, 'rtsps': 322, 'http': 80, 'https': 443, 'rtmp': 1935}
+
+
+def normalize_stream_url(stream_url) -> str:
+    """Canonical key for a stream URL so equivalent spellings share one capture"""
+    if isinstance(stream_url, int) or str(stream_url).isdigit():
+        return f"device:{int(stream_url)}"  # local webcam index
+
+    url = str(stream_url).strip()
+    parts = urlsplit(url)
+    if not parts.scheme or len(parts.scheme) == 1:  # plain path (or Windows drive letter)
+        return 'file:' + os.path.normcase(os.path.abspath(url))
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{credentials}@{netloc}"
+
+    path = parts.path.rstrip('/') or ''
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def redact_stream_url(stream_url) -> str:
+    """Stream URL (or normalized key) without user:password@, for logs, metric labels and stats"""
+    url = str(stream_url)
+    parts = urlsplit(url)
+    if not parts.scheme or '@' not in parts.netloc:
+        return url
+    return urlunsplit(parts._replace(netloc=parts.netloc.rsplit('@', 1)[1]))
+
+
+class SharedStream:
+    """A physical stream shared by one or more logical cameras"""
+
+    def __init__(self, key: str, stream_url: str, shared_model, capture_factory: Callable[[], Any], profile=None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.key = key  # identity only - may contain credentials
+        self.label = redact_stream_url(key)  # what logs, metrics and stats show
+        self.stream_url = stream_url  # full URL, only for opening the capture
+        self.shared_model = shared_model
+        self.capture_factory = capture_factory
+
+        self.cap = None
+        self.subscribers = set()
+
+        # Latest frame shared by all subscribers
+        self.seq = 0
+        self.frame = None
+        self.detection_result = None
+        self.last_inference_ms = 0.0
+        
+        # Capture buffers are pooled; each subscriber holds a lease on the frame it analyzes
+        self.frame_pool = FrameBufferPool()
+        self.frame_lease = None
+        self.frame_shape = None
+        self.captured_at = None  # wall-clock capture time of the latest frame
+        self.source_frames = 0  # frames the source produced, including ones the decoder skipped
+        
+        # Stage latencies, labelled stream=<label>
+        self.metrics = metrics or MetricsRegistry()
+
+        # Optional DetectionScheduler (set by the first subscriber that has one)
+        self.detection_scheduler = None
+
+        # One detector pass covering every subscriber's classes
+        self.detector = YOLODetector(shared_model, profile=profile)
+        self.preprocessor = FramePreprocessor(imgsz=self.detector.imgsz)
+        self.detection_requests = {}  # {camera_id: DetectionRequest}
+        self.detection_request = DetectionRequest()
+
+        self._lock = threading.Lock()          # protects subscribers/cap/latest frame
+        self._produce_lock = threading.Lock()  # only one subscriber reads + detects at a time
+
+        self.stats = {'frames_read': 0, 'inference_passes': 0, 'frames_reused': 0, 'read_failures': 0}
+        self.logger = logging.getLogger('shared_stream')
+
+    def set_detection_request(self, camera_id: str, request: DetectionRequest):
+        """Update one subscriber's detector needs; the pass uses the union"""
+        with self._lock:
+            self.detection_requests[camera_id] = request
+            self.detection_request = DetectionRequest.merge(self.detection_requests.values())
+
+    def subscribe(self, camera_id: str) -> bool:
+        """Register a logical camera; opens the capture for the first subscriber"""
+        with self._lock:
+            if self.cap is None or not self.cap.isOpened():
+                self.cap = self.capture_factory()
+                if not self.cap.isOpened():
+                    self.cap.release()
+                    self.cap = None
+                    return False
+                self.logger.info(f"Opened shared stream {self.label}")
+            self.subscribers.add(camera_id)
+            return True
+
+    def unsubscribe(self, camera_id: str) -> int:
+        """Remove a logical camera; releases the capture when nobody is left"""
+        with self._lock:
+            self.subscribers.discard(camera_id)
+            self.detection_requests.pop(camera_id, None)
+            self.detection_request = DetectionRequest.merge(self.detection_requests.values())
+            if not self.subscribers and self.cap is not None:
+                self.cap.release()
+                self.cap = None
+                self.frame = None
+                self.detection_result = None
+                if self.frame_lease is not None:
+                    self.frame_lease.release()
+                    self.frame_lease = None
+                self.logger.info(f"Released shared stream {self.label}")
+            return len(self.subscribers)
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.cap is not None and self.cap.isOpened()
+
+    def get_frame(self, last_seq: int) -> Tuple[bool, Optional[Any], Optional[Any], int, Optional[Any]]:
+        """
+        Return (ok, frame, detection_result, seq, lease) for a frame newer than last_seq.
+        Reads and detects at most once per frame regardless of subscriber count.
+        Frames are shared: subscribers must treat them as read-only, and release
+        the lease (when not None) once they are done with the frame.
+        """
+        with self._produce_lock:
+            with self._lock:
+                if self.seq > last_seq and self.frame is not None:
+                    self.stats['frames_reused'] += 1
+                    lease = self.frame_lease.retain() if self.frame_lease is not None else None
+                    return True, self.frame, self.detection_result, self.seq, lease
+                cap = self.cap
+
+            if cap is None:
+                return False, None, None, last_seq, None
+
+            lease = None
+            timings = {}
+            if hasattr(cap, 'ring'):
+                start = time.perf_counter()
+                previous_seq = cap.last_seq
+                ret, frame = cap.read()
+                timings['grab'] = (time.perf_counter() - start) * 1000
+                source_frames = cap.last_seq - previous_seq if previous_seq >= 0 else 1
+                # Ring-buffer captures return views that are recycled on the next read
+                if ret and len(self.subscribers) > 1:
+                    lease = self.frame_pool.copy(frame)
+                    frame = lease.array
+                    if not cap.frame_valid():  # overwritten while copying
+                        lease.release()
+                        lease, ret = None, False
+            else:
+                ret, lease = self.frame_pool.read(cap, self.frame_shape, timings)
+                frame = lease.array if ret else None
+                source_frames = 1
+            if not ret:
+                self.stats['read_failures'] += 1
+                return False, None, None, last_seq, None
+            self.frame_shape = frame.shape
+            captured_at = getattr(cap, 'last_timestamp', None) or time.time()
+
+            inference_start = time.perf_counter()
+            prepared = self.preprocessor.prepare(frame)
+            frame = prepared.full
+            take_thread_timings()
+            if self.detection_scheduler is not None:
+                detection_result, detected = self.detection_scheduler.run(prepared, self._detect)
+            else:
+                detection_result, detected = self._detect(prepared), True
+            inference_ms = (time.perf_counter() - inference_start) * 1000
+
+            wait_ms, compute_ms = take_thread_timings()
+            for stage, value in timings.items():
+                self.metrics.observe(stage, value, stream=self.label)
+            self.metrics.observe('preprocess', prepared.preprocess_ms, stream=self.label)
+            if detected:
+                self.metrics.observe('inference_wait', wait_ms, stream=self.label)
+                self.metrics.observe('inference', compute_ms, stream=self.label)
+            self.metrics.observe('detect', inference_ms, stream=self.label)
+
+            with self._lock:
+                self.seq += 1
+                self.frame = frame
+                self.captured_at = captured_at
+                self.source_frames += source_frames
+                self.detection_result = detection_result
+                self.last_inference_ms = inference_ms
+                self.stats['frames_read'] += 1
+                if detected:
+                    self.stats['inference_passes'] += 1
+                previous_lease, self.frame_lease = self.frame_lease, lease
+                caller_lease = lease.retain() if lease is not None else None
+                seq = self.seq
+            if previous_lease is not None:
+                previous_lease.release()
+            return True, frame, detection_result, seq, caller_lease
+
+    def _detect(self, frame):
+        return self.detector.detect(frame, self.detection_request)
+
+    def inference_share_ms(self) -> float:
+        """Last inference time split evenly across subscribers (for per-camera cost)"""
+        with self._lock:
+            return self.last_inference_ms / max(1, len(self.subscribers))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'key': self.label,
+                'subscribers': sorted(self.subscribers),
+                'frame_pool': self.frame_pool.get_stats(),
+                **self.stats
+            }
+
+
+class SharedStreamRegistry:
+    """Hands out one SharedStream per normalized URL (and inference profile)"""
+
+    def __init__(self, shared_model, metrics: Optional[MetricsRegistry] = None):
+        self.shared_model = shared_model
+        self.metrics = metrics
+        self.streams = {}  # {normalized_url[#profile]: SharedStream}
+        self._lock = threading.Lock()
+
+    def get_stream(self, stream_url: str, capture_factory: Callable[[], Any], model=None,
+                   profile=None) -> SharedStream:
+        """Cameras only share a detection pass if they use the same inference profile"""
+        key = normalize_stream_url(stream_url)
+        if profile is not None and profile.name != 'default':
+            key = f"{key}#{profile.key}"
+        with self._lock:
+            if key not in self.streams:
+                self.streams[key] = SharedStream(key, stream_url, model or self.shared_model, capture_factory,
+                                                 profile, self.metrics)
+            return self.streams[key]
+
+    def release(self, shared_stream: SharedStream, camera_id: str):
+        """Unsubscribe a camera and forget the stream once unused"""
+        with self._lock:
+            remaining = shared_stream.unsubscribe(camera_id)
+            if remaining == 0 and self.streams.get(shared_stream.key) is shared_stream:
+                del self.streams[shared_stream.key]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            streams = list(self.streams.values())
+        return {stream.label: stream.get_stats() for stream in streams}
@@ -11,12 +11,18 @@ This module handles:
 3. Log rotation and file management
 4. Component-specific loggers (camera, detection, events, etc.)
 5. Performance and security audit logging
+6. Per-call-site rate limiting/sampling and asynchronous (queued) log I/O
 """
 
 import logging
 import logging.handlers
+import copy
 import sys
 import os
+import queue
+import atexit
+import threading
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
 import json
@@ -60,6 +66,8 @@ class DatacenterLogFormatter(logging.Formatter):
             context_parts.append(f"DC:{record.datacenter_id}")
         if hasattr(record, 'camera_id') and record.camera_id != 'unknown':
             context_parts.append(f"CAM:{record.camera_id}")
+        if getattr(record, 'use_case', None):
+            context_parts.append(f"UC:{record.use_case}")
         if hasattr(record, 'event_type') and record.event_type != 'general':
             context_parts.append(f"EVENT:{record.event_type}")
         
@@ -104,6 +112,8 @@ class DatacenterJsonFormatter(logging.Formatter):
             log_data['datacenter_id'] = record.datacenter_id
         if hasattr(record, 'camera_id'):
             log_data['camera_id'] = record.camera_id
+        if hasattr(record, 'use_case'):
+            log_data['use_case'] = record.use_case
         if hasattr(record, 'event_type'):
             log_data['event_type'] = record.event_type
         if hasattr(record, 'severity'):
@@ -126,11 +136,182 @@ class DatacenterJsonFormatter(logging.Formatter):
         
         return json.dumps(log_data, default=str)
 
+# Hot-path log limits (per call site and camera): LOG_RATE_LIMIT messages/second
+# with bursts of LOG_RATE_BURST, 1-in-LOG_SAMPLE_EVERY sampling of INFO/DEBUG.
+# ERROR and above always pass. LOG_RATE_LIMIT=0 disables rate limiting.
+LOG_RATE_LIMIT = float(os.getenv('LOG_RATE_LIMIT', '1.0'))
+LOG_RATE_BURST = int(os.getenv('LOG_RATE_BURST', '5'))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '1'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+ASYNC_LOGGING = os.getenv('ASYNC_LOGGING', 'true').lower() == 'true'
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-call-site token bucket plus sampling. The next message let through from
+    a site reports how many were suppressed since the previous one. A site is
+    also keyed by the record's camera_id (or, without one, its logger name, which
+    is per camera for camera streams), so one camera cannot silence another.
+    """
+    
+    def __init__(self, rate: float = LOG_RATE_LIMIT, burst: int = LOG_RATE_BURST,
+                 sample_every: int = LOG_SAMPLE_EVERY, exempt_level: int = logging.ERROR):
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.sample_every = max(1, sample_every)
+        self.exempt_level = exempt_level
+        self.sites = {}  # {(pathname, lineno, camera_id): [tokens, last_time, suppressed_since_emit, seen]}
+        self.suppressed = {}  # {'logger:line': total suppressed}
+        self.suppressed_total = 0
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        # A record can reach several handlers sharing this filter - decide once
+        decision = getattr(record, '_rate_limit_decision', None)
+        if decision is not None:
+            return decision
+        
+        if record.levelno >= self.exempt_level or self.rate <= 0:
+            record._rate_limit_decision = True
+            return True
+        
+        # Sites are per camera too, so one noisy camera does not silence the others
+        key = (record.pathname, record.lineno, getattr(record, 'camera_id', None) or record.name)
+        now = record.created
+        with self._lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [float(self.burst), now, 0, 0]
+            site[3] += 1
+            site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            sampled_out = record.levelno < logging.WARNING and (site[3] - 1) % self.sample_every
+            if sampled_out or site[0] < 1:
+                site[2] += 1
+                self.suppressed_total += 1
+                label = f"{record.name}:{record.lineno}"
+                self.suppressed[label] = self.suppressed.get(label, 0) + 1
+                record._rate_limit_decision = False
+                return False
+            site[0] -= 1
+            suppressed, site[2] = site[2], 0
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+            record.args = None
+        record._rate_limit_decision = True
+        return True
+    
+    def get_stats(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            noisiest = sorted(self.suppressed.items(), key=lambda item: item[1], reverse=True)[:top]
+            return {'suppressed_total': self.suppressed_total, 'noisiest_sites': dict(noisiest)}
+
+class _RoutedQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records tagged with their destination; drops instead of blocking when full"""
+    
+    def __init__(self, dispatcher: 'AsyncLogDispatcher', route: str):
+        super().__init__(dispatcher.queue)
+        self.dispatcher = dispatcher
+        self.route = route
+    
+    def prepare(self, record):
+        """
+        Only merge the message arguments here; the stock prepare() runs format()
+        on the caller's thread. Timestamps, context, colors and tracebacks are
+        formatted by the route's handlers on the listener thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record._log_route = self.route
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dispatcher.dropped += 1
+
+class _RouteHandler(logging.Handler):
+    """Runs on the listener thread: hands each record to its route's real handlers"""
+    
+    def __init__(self, dispatcher: 'AsyncLogDispatcher'):
+        super().__init__()
+        self.dispatcher = dispatcher
+    
+    def handle(self, record):
+        for handler in self.dispatcher.routes.get(getattr(record, '_log_route', None), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+class AsyncLogDispatcher:
+    """One queue and one listener thread doing the console/file I/O for every registered route"""
+    
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.routes = {}  # {route: [handler, ...]}
+        self.dropped = 0
+        self.listener = None
+        self._lock = threading.Lock()
+    
+    def handler(self, route: str, handlers) -> logging.Handler:
+        """QueueHandler that delivers to the given handlers on the listener thread"""
+        with self._lock:
+            for old in self.routes.get(route, ()):
+                if old not in handlers:
+                    old.close()
+            self.routes[route] = list(handlers)
+            if self.listener is None:
+                self.listener = logging.handlers.QueueListener(self.queue, _RouteHandler(self))
+                self.listener.start()
+        return _RoutedQueueHandler(self, route)
+    
+    def stop(self):
+        """Flush queued records and stop the listener"""
+        with self._lock:
+            listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {'queued': self.queue.qsize(), 'dropped': self.dropped, 'routes': len(self.routes)}
+
+rate_limit_filter = RateLimitFilter()
+log_dispatcher = AsyncLogDispatcher()
+atexit.register(log_dispatcher.stop)
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Suppressed (rate-limited/sampled) and dropped (queue full) message counts"""
+    return {**rate_limit_filter.get_stats(), **log_dispatcher.get_stats()}
+
+def configure_async_logging(level: int = logging.INFO, format: Optional[str] = None):
+    """basicConfig replacement: rate-limited root logger writing to stdout from the listener thread"""
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(format or '%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    console_handler.setLevel(level)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers = []
+    if ASYNC_LOGGING:
+        handler = log_dispatcher.handler('root', [console_handler])
+    else:
+        handler = console_handler
+    handler.addFilter(rate_limit_filter)
+    root.addHandler(handler)
+    return root
+
 def setup_datacenter_logger(name: str, log_file: Optional[str] = None, 
                            level: int = logging.INFO, 
                            datacenter_id: Optional[str] = None,
                            camera_id: Optional[str] = None,
-                           json_logging: bool = False) -> logging.Logger:
+                           json_logging: bool = False,
+                           async_logging: bool = ASYNC_LOGGING) -> logging.Logger:
     """
     Set up a logger for datacenter monitoring components
     
@@ -141,6 +322,7 @@ def setup_datacenter_logger(name: str, log_file: Optional[str] = None,
         datacenter_id: Optional datacenter ID for context
         camera_id: Optional camera ID for context  
         json_logging: Whether to use JSON formatting for structured logs
+        async_logging: Write from the shared listener thread instead of the caller's
         
     Returns:
         Configured logger instance
@@ -156,6 +338,7 @@ def setup_datacenter_logger(name: str, log_file: Optional[str] = None,
     
     # Clear any existing handlers to avoid duplicates
     logger.handlers = []
+    handlers = []
     
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
@@ -167,7 +350,7 @@ def setup_datacenter_logger(name: str, log_file: Optional[str] = None,
         console_formatter = DatacenterConsoleFormatter()
     
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler if log file specified
     if log_file:
@@ -185,7 +368,14 @@ def setup_datacenter_logger(name: str, log_file: Optional[str] = None,
             file_formatter = DatacenterLogFormatter()
         
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Caller threads only filter and enqueue; formatting and I/O happen on the listener thread
+    if async_logging:
+        handlers = [log_dispatcher.handler(name, handlers)]
+    for handler in handlers:
+        handler.addFilter(rate_limit_filter)
+        logger.addHandler(handler)
     
     # Add context to logger for datacenter monitoring
     if datacenter_id:
@@ -351,6 +541,44 @@ def setup_logger(name: str, log_file: Optional[str] = None,
     """
     return setup_datacenter_logger(name, log_file, level)
 
+# Process-wide sink shared by all camera model instances
+CAMERA_MODEL_LOGGER = 'camera_models'
+CAMERA_MODEL_LOG_FILE = os.getenv('CAMERA_MODEL_LOG_FILE', 'camera_models.log')
+_camera_model_sink = None
+_camera_model_sink_lock = threading.Lock()
+
+def camera_model_log_file() -> str:
+    """
+    Log file of this process's camera models. Child processes (shard workers,
+    replay pool) get their own file named after the process, since rotating
+    one file from several processes loses and interleaves records.
+    """
+    process_name = multiprocessing.current_process().name
+    if process_name == 'MainProcess':
+        return CAMERA_MODEL_LOG_FILE
+    stem, extension = os.path.splitext(CAMERA_MODEL_LOG_FILE)
+    return f"{stem}.{process_name}{extension}"
+
+def get_camera_model_logger(camera_id: str, use_case: Optional[str] = None,
+                            datacenter_id: Optional[str] = None) -> logging.LoggerAdapter:
+    """
+    Logger for one camera model instance. All instances in a process share one
+    logger, one console handler and one rotating file; camera and use case travel
+    as record fields, so file handles stay constant however many cameras are loaded.
+    """
+    global _camera_model_sink
+    if _camera_model_sink is None:
+        with _camera_model_sink_lock:
+            if _camera_model_sink is None:
+                _camera_model_sink = setup_datacenter_logger(CAMERA_MODEL_LOGGER, camera_model_log_file())
+    
+    context = {'camera_id': camera_id}
+    if use_case:
+        context['use_case'] = use_case
+    if datacenter_id:
+        context['datacenter_id'] = datacenter_id
+    return DatacenterLoggerAdapter(_camera_model_sink, context)
+
 # Pre-configured loggers for common components
 def get_camera_logger(camera_id: str, datacenter_id: Optional[str] = None) -> logging.Logger:
     """Get logger for camera component"""
@@ -385,7 +613,12 @@ performance_logger = DatacenterPerformanceLogger()
 __all__ = [
     'setup_datacenter_logger',
     'setup_logger',  # Backward compatibility
+    'configure_async_logging',
+    'get_logging_stats',
+    'RateLimitFilter',
+    'AsyncLogDispatcher',
     'get_camera_logger',
+    'get_camera_model_logger',
     'get_detection_logger', 
     'get_database_logger',
     'get_api_logger',
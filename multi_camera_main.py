@@ -10,6 +10,8 @@ from datetime import datetime
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from logger import configure_async_logging
+
 def print_banner():
     """Print application banner"""
     print("="*80)
@@ -20,7 +22,7 @@ def print_banner():
     print(f" 🎯 Control: Runtime enable/disable of specific models per camera")
     print("="*80)
 
-def run_flexible_system():
+def run_flexible_system(processes=None):
     """Run the flexible multi-camera system"""
     try:
         # Import flexible components
@@ -48,8 +50,13 @@ def run_flexible_system():
                                           for uc in config.get('enabled_use_cases', [])])
                 print(f"      Active: {enabled_models}")
             
-            # Create and start processor
-            processor = FlexibleMultiCameraProcessor(MultiCameraConfig)
+            # Create and start processor (sharded across worker processes if requested)
+            num_processes = processes or MultiCameraConfig.PROCESS_WORKERS
+            if num_processes > 1 and len(camera_configs) > 1:
+                from core.process_supervisor import ShardedProcessorSupervisor
+                processor = ShardedProcessorSupervisor(MultiCameraConfig, num_processes)
+            else:
+                processor = FlexibleMultiCameraProcessor(MultiCameraConfig)
             processor.load_camera_configurations(camera_configs)
             
             print("\n🔄 Starting processing (Ctrl+C to stop)...")
@@ -67,33 +74,286 @@ def run_flexible_system():
         print(f"❌ System error: {e}")
         logging.getLogger(__name__).error(f"System error: {e}", exc_info=True)
 
+def run_coordinator_node(node_id=None, lease_store_url=None):
+    """Run this node in coordinator mode - cameras are claimed through DB leases"""
+    import time
+    try:
+        from interface.flexible_camera_management import FlexibleCameraConfigurationManager
+        from core.flexible_multi_camera_processor import FlexibleMultiCameraProcessor
+        from core.camera_lease_coordinator import CameraLeaseCoordinator, create_lease_store
+        from core.database_handler import DatabaseHandler
+        from config.multi_camera_config import MultiCameraConfig
+        
+        # All configured cameras are candidates; this node only runs the ones it holds leases for
+        camera_configs = FlexibleCameraConfigurationManager().configurations
+        if not camera_configs:
+            print("❌ No camera configurations provided")
+            return
+        
+        lease_store_url = lease_store_url or MultiCameraConfig.LEASE_STORE_URL
+        lease_db = DatabaseHandler({
+            'host': MultiCameraConfig.MYSQL_HOST,
+            'user': MultiCameraConfig.MYSQL_USER,
+            'password': MultiCameraConfig.MYSQL_PASSWORD,
+            'database': MultiCameraConfig.MYSQL_DATABASE,
+            'port': MultiCameraConfig.MYSQL_PORT
+        }) if lease_store_url == 'mysql' else None
+        store = create_lease_store(lease_store_url, lease_db)
+        
+        processor = FlexibleMultiCameraProcessor(MultiCameraConfig)
+        processor.load_camera_configurations([])
+        processor.start_workers()
+        
+        coordinator = CameraLeaseCoordinator(
+            store, processor, camera_configs,
+            node_id=node_id or MultiCameraConfig.NODE_ID or None,
+            lease_ttl=MultiCameraConfig.LEASE_TTL,
+            heartbeat_interval=MultiCameraConfig.LEASE_HEARTBEAT_INTERVAL,
+            rebalance_slack=MultiCameraConfig.LEASE_REBALANCE_SLACK,
+            default_camera_cost=MultiCameraConfig.DEFAULT_CAMERA_COST
+        )
+        coordinator.start()
+        
+        print(f"\n🔄 Node {coordinator.node_id} coordinating {len(camera_configs)} cameras via {lease_store_url} (Ctrl+C to stop)...")
+        try:
+            while True:
+                time.sleep(10)
+                stats = coordinator.get_stats()
+                print(f"📡 Node {stats['node_id']}: {len(stats['owned_cameras'])} cameras "
+                      f"({', '.join(stats['owned_cameras'])}) | live nodes: {stats['live_nodes']} | "
+                      f"fair share: {stats['last_fair_share']:.0f} ms/s")
+        except KeyboardInterrupt:
+            print("\n⏹️  Node stopping, releasing camera leases...")
+        
+        coordinator.stop()
+        processor.stop()
+    
+    except Exception as e:
+        print(f"❌ System error: {e}")
+        logging.getLogger(__name__).error(f"Coordinator error: {e}", exc_info=True)
+
+def run_system_diagnostics(backends=None, runs=30):
+    """Check model loading and compare inference backends on this machine"""
+    from config.multi_camera_config import MultiCameraConfig
+    from core.inference_backends import INFERENCE_BACKENDS, benchmark_backends
+    
+    print("\n🔧 Running System Diagnostics...")
+    print("="*60)
+    
+    weights = MultiCameraConfig.DETECTION_MODEL_PATH
+    if not os.path.exists(weights):
+        print(f"   ❌ YOLO model not found: {weights}")
+        return
+    
+    backends = backends or list(INFERENCE_BACKENDS)
+    imgsz = MultiCameraConfig.INFERENCE_PROFILES.get('default', {}).get('imgsz') or 640
+    print(f"1. Benchmarking {weights} at imgsz={imgsz} on: {', '.join(backends)}"
+          f"{' (+ int8)' if MultiCameraConfig.INFERENCE_INT8 else ''}")
+    
+    results = benchmark_backends(
+        weights, backends, imgsz=imgsz, int8=MultiCameraConfig.INFERENCE_INT8, runs=runs,
+        cache_dir=MultiCameraConfig.EXPORTED_MODEL_DIR, calibration_dir=MultiCameraConfig.FRAMES_OUTPUT_DIR
+    )
+    
+    baseline = results.get('pytorch', {}).get('avg_ms')
+    for label, result in results.items():
+        if 'error' in result:
+            print(f"   ❌ {label:<14} {result['error']}")
+            continue
+        speedup = f"  x{baseline / result['avg_ms']:.2f} vs pytorch" if baseline else ''
+        print(f"   ✅ {label:<14} avg {result['avg_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"{result['fps']:6.1f} FPS  (load {result['load_seconds']:.1f}s){speedup}")
+    
+    print(f"\n   Active backend: {MultiCameraConfig.INFERENCE_BACKEND} (set INFERENCE_BACKEND to change)")
+    print("\n✅ System diagnostics completed")
+
+def run_benchmark_command(args):
+    """Measure end-to-end throughput with synthetic cameras and in-memory sinks"""
+    from config.multi_camera_config import MultiCameraConfig
+    from core.benchmark import run_benchmark
+    
+    report_path = args.report or os.path.join(
+        'outputs', 'benchmarks', f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    print(f"\n⏱️  Benchmark: {args.cameras} {args.source} cameras, {args.detector or 'stub'} detector, "
+          f"{args.warmup:.0f}s warmup + {args.duration:.0f}s measured")
+    
+    def progress(elapsed, stats):
+        print(f"   {elapsed:5.0f}s  frames {stats['frames_processed']}  events {stats['total_events']}")
+    
+    report = run_benchmark(
+        MultiCameraConfig, cameras=args.cameras, duration=args.duration, warmup=args.warmup,
+        source=args.source, video=args.video, resolution=args.resolution, fps=args.fps,
+        detector=args.detector or 'stub', recording=args.detections, stub_latency_ms=args.stub_latency_ms,
+        use_cases=args.use_cases, share_streams=args.share_streams, sink=args.sink or 'memory',
+        report_path=report_path,
+        progress=progress
+    )
+    
+    totals = report['totals']
+    print(f"\n📊 {totals['fps']:.1f} frames/s total | per camera avg {totals['fps_per_camera_avg']:.1f}, "
+          f"min {totals['fps_per_camera_min']:.1f} | events {totals['events']}")
+    for stage in ('detect', 'inference', 'use_case', 'frame', 'capture_to_persisted'):
+        latency = report['latency_ms'].get(stage)
+        if latency and latency['count']:
+            print(f"   {stage:<22} p50 {latency['p50_ms']:7.1f} ms  p95 {latency['p95_ms']:7.1f} ms  "
+                  f"p99 {latency['p99_ms']:7.1f} ms")
+    resources = report['resources']
+    if resources:
+        rss = f"{resources['rss_mb_max']:.0f} MB" if resources.get('rss_mb_max') else 'n/a'
+        print(f"   CPU avg {resources['cpu_percent_avg']:.0f}% (max {resources['cpu_percent_max']:.0f}%, "
+              f"{resources['cpu_count']} cores) | RSS max {rss}")
+    print(f"\n✅ Report written to {report_path}")
+
+def run_replay_command(args):
+    """Re-run the pipeline over recorded footage (file or directory), optionally on a process pool"""
+    import json
+    from core.replay_backfill import run_backfill
+    
+    if not args.input:
+        print("❌ replay needs --input (a video file or a directory of recordings)")
+        return
+    
+    # Zones and rules of a configured camera, else the benchmark template
+    camera_config = None
+    if args.camera_id:
+        from interface.flexible_camera_management import FlexibleCameraConfigurationManager
+        configured = {c['camera_id']: c for c in FlexibleCameraConfigurationManager().configurations}
+        camera_config = configured.get(args.camera_id)
+        if camera_config is None:
+            print(f"❌ Camera {args.camera_id} is not configured")
+            return
+        if args.use_cases:
+            camera_config = dict(camera_config, enabled_use_cases=list(args.use_cases))
+    else:
+        from core.benchmark import benchmark_camera_configs
+        camera_config = dict(benchmark_camera_configs(['replay://'], args.use_cases)[0],
+                             camera_id='replay', name='replay')
+    
+    processes = args.processes or 1
+    speed = f"{args.speed:g}x real time" if args.speed else "full speed"
+    print(f"\n⏩ Replaying {args.input} as camera {camera_config['camera_id']} at {speed} "
+          f"on {processes} process(es), events -> {args.sink or 'local'}")
+    
+    def progress(result, done, total):
+        if 'error' in result:
+            print(f"   ❌ [{done}/{total}] {result['path']}: {result['error']}")
+        else:
+            print(f"   ✅ [{done}/{total}] {result['path']}: {result['frames']} frames, "
+                  f"{result['events']} events, {result['fps']:.1f} frames/s")
+    
+    report = run_backfill(camera_config, args.input, processes=processes, speed=args.speed,
+                          sink=args.sink or 'local', detector=args.detector or 'yolo',
+                          stub_latency_ms=args.stub_latency_ms, progress=progress)
+    
+    print(f"\n📊 {report['frames']} frames in {report['seconds']:.1f}s ({report['fps']:.1f} frames/s) | "
+          f"events {report['events']} {report['events_by_use_case']}")
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True, default=str)
+        print(f"✅ Report written to {args.report}")
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Flexible Multi-Camera Monitoring System')
     
     parser.add_argument('command', nargs='?', default='run',
-                       choices=['run', 'config', 'help'],
+                       choices=['run', 'config', 'diagnostics', 'benchmark', 'replay', 'help'],
                        help='Command to execute')
+    parser.add_argument('--processes', type=int, default=None,
+                       help='Number of worker processes to shard cameras across')
+    parser.add_argument('--coordinator', action='store_true',
+                       help='Claim cameras through DB leases (multi-node mode)')
+    parser.add_argument('--node-id', default=None,
+                       help='Node identifier in coordinator mode (default: hostname-pid)')
+    parser.add_argument('--lease-store', default=None,
+                       help="Lease store: 'mysql' or 'sqlite:///path/leases.db'")
+    parser.add_argument('--sink', default=None, choices=['remote', 'local', 'sqlite', 'memory', 'null'],
+                       help="Where events go: 'remote' (MySQL + GCS), 'local' (SQLite + files), 'sqlite', 'memory', 'null'")
+    parser.add_argument('--backends', nargs='+', default=None,
+                       choices=['pytorch', 'onnx', 'openvino'],
+                       help='Inference backends to compare in diagnostics')
+    parser.add_argument('--cameras', type=int, default=4,
+                       help='Benchmark: number of synthetic cameras')
+    parser.add_argument('--duration', type=float, default=60.0,
+                       help='Benchmark: measured seconds (after warmup)')
+    parser.add_argument('--warmup', type=float, default=10.0,
+                       help='Benchmark: seconds to run before measuring')
+    parser.add_argument('--source', default='synthetic', choices=['synthetic', 'file'],
+                       help='Benchmark: generated frames or a looped video file')
+    parser.add_argument('--video', default=None,
+                       help='Benchmark: video file for --source file')
+    parser.add_argument('--resolution', default='1280x720',
+                       help='Benchmark: synthetic frame size (WIDTHxHEIGHT)')
+    parser.add_argument('--fps', type=float, default=None,
+                       help='Benchmark: source frame rate (0 = as fast as possible)')
+    parser.add_argument('--detector', default=None, choices=['stub', 'yolo'],
+                       help='Benchmark/replay: stub detections or the configured YOLO model (default: stub / yolo)')
+    parser.add_argument('--detections', default=None,
+                       help='Benchmark: JSON-lines or detection recording (directory) for the stub detector')
+    parser.add_argument('--record-detections', default=None,
+                       help='Record per-camera detections under this directory (replay with replay --input DIR/<camera>)')
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0,
+                       help='Benchmark: simulated inference time of the stub detector')
+    parser.add_argument('--use-cases', nargs='+', default=None,
+                       help='Benchmark: use cases enabled on every camera (default: all)')
+    parser.add_argument('--share-streams', action='store_true',
+                       help='Benchmark: all cameras read the same stream')
+    parser.add_argument('--report', default=None,
+                       help='Benchmark/replay: JSON report path (benchmark default: outputs/benchmarks/...)')
+    parser.add_argument('--input', default=None,
+                       help='Replay: video file, directory of recordings, or a detection recording')
+    parser.add_argument('--camera-id', default=None,
+                       help="Replay: configured camera whose zones/rules to apply (default: benchmark template)")
+    parser.add_argument('--speed', type=float, default=0.0,
+                       help='Replay: 0 = as fast as possible, N = N x real time')
     
     args = parser.parse_args()
     
-    # Setup logging
-    logging.basicConfig(level=logging.INFO)
+    # Setup logging (rate-limited, written from a background thread)
+    configure_async_logging(logging.INFO)
+    
+    # Event sink / detection recording overrides - also inherited by worker processes through the environment
+    if args.sink:
+        os.environ['EVENT_SINK'] = args.sink
+        from config.multi_camera_config import MultiCameraConfig
+        MultiCameraConfig.EVENT_SINK = args.sink
+    if args.record_detections:
+        os.environ['RECORD_DETECTIONS_DIR'] = args.record_detections
+        from config.multi_camera_config import MultiCameraConfig
+        MultiCameraConfig.RECORD_DETECTIONS_DIR = args.record_detections
     
     try:
         print_banner()
         
         if args.command == 'run':
-            run_flexible_system()
+            if args.coordinator:
+                run_coordinator_node(args.node_id, args.lease_store)
+            else:
+                run_flexible_system(args.processes)
         elif args.command == 'config':
             from interface.flexible_camera_management import FlexibleCameraConfigurationManager
             manager = FlexibleCameraConfigurationManager()
             manager.run_interactive_menu()
+        elif args.command == 'diagnostics':
+            run_system_diagnostics(args.backends)
+        elif args.command == 'benchmark':
+            run_benchmark_command(args)
+        elif args.command == 'replay':
+            run_replay_command(args)
         elif args.command == 'help':
             print("\n🎯 Flexible Multi-Camera System Commands:")
             print("  python flexible_multi_camera_main.py run     - Start the system")
             print("  python flexible_multi_camera_main.py config  - Configure cameras only")
+            print("  python flexible_multi_camera_main.py diagnostics - Benchmark inference backends")
+            print("  python flexible_multi_camera_main.py benchmark --cameras 16 - End-to-end throughput with synthetic cameras")
+            print("  python flexible_multi_camera_main.py replay --input recordings/ --processes 8 - Backfill recorded footage")
+            print("  python flexible_multi_camera_main.py run --record-detections outputs/detections - Record detections")
+            print("  python flexible_multi_camera_main.py replay --input outputs/detections/cam1 - Re-run use cases on recorded detections")
             print("  python flexible_multi_camera_main.py help    - Show this help")
+            print("  python flexible_multi_camera_main.py run --processes 4 - Shard cameras across 4 processes")
+            print("  python flexible_multi_camera_main.py run --coordinator   - Join a multi-node deployment")
+            print("  python flexible_multi_camera_main.py run --sink local    - Store events in SQLite + local files (no network)")
             
             print("\n💡 Features:")
             print("  • Multiple use cases per camera")